@@ -0,0 +1,173 @@
+"""
+Maintenance commands. Run from `backend/`:
+
+    python -m app.cli indexes            # build declared indexes
+    python -m app.cli indexes --check    # fail if any route query does a COLLSCAN
+    python -m app.cli rebuild-progress   # recompute per-user progress counters
+    python -m app.cli rebuild-stats      # recompute admin dashboard stats
+    python -m app.cli seed               # seed demo data (idempotent)
+    python -m app.cli seed --generate --submissions 1000000   # bulk fixture dataset
+    python -m app.cli backfill-recurrence   # store RRULEs for activities' recurrence_text
+    python -m app.cli sync-calendars     # push changed activity occurrences to calendars
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from app.database import create_async_client, get_db
+from app.indexes import check_query_plans, ensure_indexes
+from app.seed_data import generate_fixtures, seed_if_needed
+from app.services.calendar_service import get_calendar_provider
+from app.services.calendar_sync import sync_calendars
+from app.services.duplicate_service import backfill_fingerprints
+from app.services.progress_service import rebuild_progress_counters
+from app.services.recurrence_service import backfill_activity_rules
+from app.services.stats_service import rebuild_admin_stats
+
+
+async def _indexes(db, args) -> int:
+    report = await ensure_indexes(db)
+    print(json.dumps(report, indent=2, default=str))
+    if report["errors"]:
+        return 1
+    if not args.check:
+        return 0
+
+    plans = await check_query_plans(db)
+    failing = [plan for plan in plans if plan["collscan"]]
+    for plan in plans:
+        marker = "COLLSCAN" if plan["collscan"] else "ok"
+        print(f"{marker:>8}  {plan['name']}: {' > '.join(plan['stages'])}")
+    return 1 if failing else 0
+
+
+async def _rebuild_progress(db, args) -> int:
+    report = await rebuild_progress_counters(db, dry_run=args.dry_run)
+    print(json.dumps(report, indent=2, default=str))
+    return 0
+
+
+async def _rebuild_stats(db, args) -> int:
+    report = await rebuild_admin_stats(db, dry_run=args.dry_run)
+    print(json.dumps(report, indent=2, default=str))
+    return 0
+
+
+async def _seed(db, args) -> int:
+    started = time.perf_counter()
+    if args.generate:
+        report = await generate_fixtures(
+            db, args.users, args.activities, args.submissions, batch_size=args.batch_size
+        )
+        report.pop("pending_ids")
+    else:
+        report = await seed_if_needed(db)
+    print(json.dumps({**report, "seconds": round(time.perf_counter() - started, 2)}, indent=2))
+    return 0
+
+
+async def _backfill_recurrence(db, args) -> int:
+    report = await backfill_activity_rules(
+        db, dry_run=args.dry_run, use_llm=not args.no_llm, recompute=args.all
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+async def _sync_calendars(db, args) -> int:
+    report = await sync_calendars(
+        db, get_calendar_provider(), user_ids=args.user or None, dry_run=args.dry_run
+    )
+    print(json.dumps(report, indent=2))
+    return 1 if report["errors"] else 0
+
+
+async def _backfill_duplicates(db, args) -> int:
+    report = await backfill_fingerprints(db, dry_run=args.dry_run)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+COMMANDS = {
+    "indexes": _indexes,
+    "rebuild-progress": _rebuild_progress,
+    "rebuild-stats": _rebuild_stats,
+    "seed": _seed,
+    "backfill-recurrence": _backfill_recurrence,
+    "sync-calendars": _sync_calendars,
+    "backfill-duplicates": _backfill_duplicates,
+}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    indexes = subparsers.add_parser("indexes", help="Build declared indexes")
+    indexes.add_argument(
+        "--check",
+        action="store_true",
+        help="Explain every route query shape and fail on COLLSCAN",
+    )
+
+    rebuild_progress = subparsers.add_parser(
+        "rebuild-progress", help="Recompute per-user progress counters and report drift"
+    )
+    rebuild_progress.add_argument(
+        "--dry-run", action="store_true", help="Report drift without writing"
+    )
+
+    rebuild_stats = subparsers.add_parser(
+        "rebuild-stats", help="Recompute admin dashboard stats and report drift"
+    )
+    rebuild_stats.add_argument(
+        "--dry-run", action="store_true", help="Report drift without writing"
+    )
+
+    seed = subparsers.add_parser("seed", help="Seed demo data or generate a fixture dataset")
+    seed.add_argument("--generate", action="store_true", help="Bulk-insert synthetic fixtures")
+    seed.add_argument("--users", type=int, default=1000)
+    seed.add_argument("--activities", type=int, default=200)
+    seed.add_argument("--submissions", type=int, default=100_000)
+    seed.add_argument("--batch-size", type=int, default=10_000)
+
+    backfill = subparsers.add_parser(
+        "backfill-recurrence", help="Parse recurrence_text into recurrence_rule"
+    )
+    backfill.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    backfill.add_argument("--no-llm", action="store_true", help="Skip the MiniMax fallback")
+    backfill.add_argument("--all", action="store_true", help="Also re-parse stored rules")
+
+    sync = subparsers.add_parser(
+        "sync-calendars", help="Push activity occurrences to the calendar provider"
+    )
+    sync.add_argument("--user", action="append", help="Only this user id (repeatable)")
+    sync.add_argument("--dry-run", action="store_true", help="Only report what would change")
+
+    duplicates = subparsers.add_parser(
+        "backfill-duplicates", help="Fingerprint older submissions and flag near-duplicates"
+    )
+    duplicates.add_argument(
+        "--dry-run", action="store_true", help="Only report what would change"
+    )
+    return parser
+
+
+async def _run(args) -> int:
+    client = create_async_client()
+    try:
+        return await COMMANDS[args.command](get_db(client), args)
+    finally:
+        await client.close()
+
+
+def main() -> None:
+    args = _build_parser().parse_args()
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,22 +6,82 @@ class Settings(BaseSettings):
     environment: str = "development"
     api_prefix: str = "/api"
     auto_seed_data: bool = True
+    ensure_indexes_on_startup: bool = True
     cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
     session_expiry_hours: int = 24
+    session_token_mode: str = "database"
+    session_signing_key: str = ""
+    session_revocation_sync_seconds: float = 5.0
+    password_hash_algorithm: str = "sha256"
+    password_hash_iterations: int = 200_000
+    process_pool_workers: int = 0
+    session_cache_enabled: bool = True
+    session_cache_max_entries: int = 10_000
+    # Bounds how long other workers serve a changed user; invalidate_user is per process.
+    session_cache_ttl_seconds: int = 60
+    admin_stats_cache_ttl_seconds: int = 5
+    pagination_default_limit: int = 50
+    pagination_max_limit: int = 200
+    export_batch_size: int = 1000
+    metrics_enabled: bool = True
+    metrics_token: str = ""
+    json_response_backend: str = "default"
 
     mongodb_url: str = "mongodb://localhost:27017"
     mongodb_db_name: str = "ownmerits"
+    mongodb_max_pool_size: int = 100
 
     minimax_api_key: str = ""
     minimax_base_url: str = "https://api.minimax.io"
     minimax_model: str = "abab6.5-chat"
+    minimax_timeout_seconds: float = 10.0
+    minimax_queue_timeout_seconds: float = 30.0
+    minimax_connect_timeout_seconds: float = 2.0
+    minimax_max_concurrency: int = 8
+    minimax_breaker_failure_threshold: int = 5
+    minimax_breaker_reset_seconds: float = 30.0
+    reminder_cache_size: int = 10000
+    reminder_cache_ttl_seconds: int = 3600
+    recurrence_cache_size: int = 4096
+    recurrence_llm_max_concurrency: int = 4
+
+    reminder_dispatcher_enabled: bool = True
+    reminder_workers: int = 8
+    reminder_batch_size: int = 50
+    reminder_lease_seconds: int = 60
+    reminder_poll_seconds: float = 5.0
+    reminder_max_attempts: int = 5
+    reminder_retry_backoff_seconds: float = 30.0
 
     evoucher_api_key: str = ""
     evoucher_base_url: str = "https://api.example-voucher.com"
+    evoucher_timeout_seconds: float = 5.0
+    evoucher_max_retries: int = 3
+    evoucher_retry_backoff_seconds: float = 0.2
+    evoucher_max_connections: int = 20
 
+    calendar_provider: str = "fake"
+    calendar_sync_window_days: int = 28
+    calendar_sync_event_minutes: int = 30
+    calendar_sync_batch_size: int = 100
+    calendar_sync_user_batch_size: int = 500
+    calendar_sync_concurrency: int = 16
     google_calendar_client_id: str = ""
     google_calendar_client_secret: str = ""
 
+    duplicate_detection_enabled: bool = True
+    duplicate_min_words: int = 8
+    duplicate_min_similarity: float = 0.7
+    duplicate_max_matches: int = 5
+    duplicate_sync_seconds: float = 30.0
+    duplicate_window_days: int = 90
+
+    upload_storage: str = "disk"
+    upload_dir: str = "uploads"
+    upload_max_bytes: int = 10 * 1024 * 1024
+    upload_chunk_bytes: int = 255 * 1024
+    thumbnail_max_edge: int = 320
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
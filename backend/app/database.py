@@ -1,12 +1,23 @@
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
 
 from app.config import settings
+from app.metrics import MongoCommandMetrics
 
 
 def create_client() -> MongoClient:
-    return MongoClient(settings.mongodb_url)
+    return MongoClient(settings.mongodb_url, maxPoolSize=settings.mongodb_max_pool_size)
 
 
-def get_db(client: MongoClient) -> Database:
+def create_async_client() -> AsyncMongoClient:
+    event_listeners = [MongoCommandMetrics()] if settings.metrics_enabled else []
+    return AsyncMongoClient(
+        settings.mongodb_url,
+        maxPoolSize=settings.mongodb_max_pool_size,
+        event_listeners=event_listeners,
+    )
+
+
+def get_db(client: MongoClient | AsyncMongoClient) -> Database | AsyncDatabase:
     return client[settings.mongodb_db_name]
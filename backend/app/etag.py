@@ -0,0 +1,35 @@
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app.security import get_current_user
+from app.services.version_service import get_versions
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {value.strip() for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+) -> None:
+    """Strong ETag for a per-user read, derived from data versions instead of the body.
+
+    A matching If-None-Match is answered with 304 before the handler queries anything.
+    Admins read across users, which no single version covers, so they always get a body.
+    """
+    if current_user["role"] == "admin":
+        return
+
+    versions = await get_versions(request.app.state.db, current_user["id"])
+    key = "|".join([request.url.path, str(request.url.query), current_user["id"], *versions])
+    etag = '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
@@ -0,0 +1,90 @@
+from fastapi import HTTPException, Query, status
+
+# Stored fields per collection that may be returned by list endpoints and exports.
+# Anything not listed here (password_hash, Mongo _id, ...) is never projected.
+SUBMISSION_FIELDS = (
+    "id",
+    "activity_id",
+    "user_id",
+    "status",
+    "proof_text",
+    "proof_image_url",
+    "proof_image_thumbnail_url",
+    "created_at",
+    "reviewed_at",
+    "review_feedback",
+    "possible_duplicate",
+    "duplicate_of",
+)
+# proof_text (up to 3000 chars) and review_feedback are only needed by detail/review views.
+SUBMISSION_LIST_FIELDS = (
+    "id",
+    "activity_id",
+    "user_id",
+    "status",
+    "proof_image_url",
+    "proof_image_thumbnail_url",
+    "created_at",
+    "reviewed_at",
+    "possible_duplicate",
+    "duplicate_of",
+)
+
+ACTIVITY_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "activity_type",
+    "assigned_to_user_id",
+    "recurrence_text",
+    "recurrence_rule",
+    "created_at",
+)
+
+REWARD_FIELDS = (
+    "reward_id",
+    "user_id",
+    "submission_id",
+    "voucher_code",
+    "provider_voucher_id",
+    "status",
+    "value",
+    "currency",
+    "retailer",
+    "assigned_at",
+    "expires_at",
+)
+
+USER_FIELDS = ("id", "name", "email", "role", "group", "created_at")
+
+
+class FieldSelector:
+    """Dependency turning ``?fields=a,b`` into a Mongo inclusion projection.
+
+    Without ``fields`` the endpoint's default fields are returned; ``fields=*`` selects
+    every allowed field.
+    """
+
+    def __init__(self, allowed: tuple[str, ...], default: tuple[str, ...] | None = None):
+        self.allowed = allowed
+        self.default = default or allowed
+
+    def __call__(
+        self,
+        fields: str | None = Query(
+            default=None,
+            description="Comma-separated fields to return, or * for all fields",
+        ),
+    ) -> dict:
+        selected = self.default
+        if fields is not None and fields.strip() == "*":
+            selected = self.allowed
+        elif fields is not None:
+            selected = tuple(name.strip() for name in fields.split(",") if name.strip())
+            unknown = sorted(set(selected) - set(self.allowed))
+            if unknown or not selected:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields",
+                )
+        return {"_id": 0, **{name: 1 for name in selected}}
@@ -0,0 +1,196 @@
+import logging
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+NEWEST_FIRST = [("created_at", DESCENDING), ("id", DESCENDING)]
+REWARDS_NEWEST_FIRST = [("assigned_at", DESCENDING), ("reward_id", DESCENDING)]
+
+# Every index a route relies on, grouped by collection. Names are left to the
+# server default so indexes created by older deployments are recognised as-is.
+INDEXES: dict[str, list[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel(NEWEST_FIRST),
+    ],
+    "sessions": [
+        IndexModel([("token", ASCENDING)], unique=True),
+        # TTL: expired session rows are removed by the server.
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "revoked_tokens": [
+        IndexModel([("jti", ASCENDING)], unique=True),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+        IndexModel([("revoked_at", ASCENDING)]),
+    ],
+    "activities": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel(NEWEST_FIRST),
+        IndexModel([("assigned_to_user_id", ASCENDING), *NEWEST_FIRST]),
+        IndexModel([("activity_type", ASCENDING), *NEWEST_FIRST]),
+        # A collection has at most one text index; /admin/search ranks with its weights.
+        IndexModel(
+            [("title", TEXT), ("description", TEXT)], weights={"title": 3, "description": 1}
+        ),
+    ],
+    "submissions": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel(NEWEST_FIRST),
+        IndexModel([("user_id", ASCENDING), *NEWEST_FIRST]),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("status", ASCENDING), *NEWEST_FIRST]),
+        IndexModel([("activity_id", ASCENDING), *NEWEST_FIRST]),
+        IndexModel([("possible_duplicate", ASCENDING), *NEWEST_FIRST]),
+        IndexModel(
+            [("proof_text", TEXT), ("review_feedback", TEXT)],
+            weights={"proof_text": 2, "review_feedback": 1},
+        ),
+    ],
+    "rewards": [
+        IndexModel([("reward_id", ASCENDING)], unique=True),
+        # One reward per submission, even when two approvals race.
+        IndexModel([("submission_id", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING)]),
+        IndexModel(REWARDS_NEWEST_FIRST),
+        IndexModel([("user_id", ASCENDING), *REWARDS_NEWEST_FIRST]),
+    ],
+    "user_progress": [
+        IndexModel([("user_id", ASCENDING)], unique=True),
+    ],
+    "reminders": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("next_run_at", ASCENDING)]),
+    ],
+    "calendar_events": [
+        IndexModel([("user_id", ASCENDING), ("key", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("start_iso", ASCENDING)]),
+        IndexModel([("start_iso", ASCENDING), ("user_id", ASCENDING)]),
+    ],
+    "notifications": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "uploads": [IndexModel([("sha256", ASCENDING)], unique=True)],
+}
+
+
+def _shape(name: str, collection: str, filters: dict, sort: list | None = None) -> dict:
+    return {"name": name, "collection": collection, "filter": filters, "sort": sort}
+
+
+def _query_shapes() -> list[dict]:
+    # One entry per query a route issues; values are placeholders, only the shape matters.
+    now = datetime.now(timezone.utc)
+    after_cursor = {
+        "$or": [
+            {"created_at": {"$lt": "2026-01-01T00:00:00+00:00"}},
+            {"created_at": "2026-01-01T00:00:00+00:00", "id": {"$lt": "x"}},
+        ]
+    }
+    user_activities = {"$or": [{"assigned_to_user_id": "x"}, {"activity_type": "voluntary"}]}
+    return [
+        _shape("auth.session", "sessions", {"token": "x", "expires_at": {"$gt": now}}),
+        _shape(
+            "auth.revocation_sync",
+            "revoked_tokens",
+            {"expires_at": {"$gt": now}, "revoked_at": {"$gte": now}},
+        ),
+        _shape("auth.user_by_id", "users", {"id": "x"}),
+        _shape("auth.user_by_email", "users", {"email": "x"}),
+        _shape("admin.list_users", "users", {}, NEWEST_FIRST),
+        _shape("activities.by_id", "activities", {"id": "x"}),
+        _shape("activities.list_admin", "activities", {}, NEWEST_FIRST),
+        _shape("activities.list_user", "activities", user_activities, NEWEST_FIRST),
+        _shape("submissions.by_id", "submissions", {"id": "x"}),
+        _shape("submissions.list_admin", "submissions", {}, NEWEST_FIRST),
+        _shape("submissions.list_admin_next_page", "submissions", after_cursor, NEWEST_FIRST),
+        _shape("submissions.list_user", "submissions", {"user_id": "x"}, NEWEST_FIRST),
+        _shape(
+            "submissions.list_user_next_page",
+            "submissions",
+            {"$and": [{"user_id": "x"}, after_cursor]},
+            NEWEST_FIRST,
+        ),
+        _shape("submissions.list_status", "submissions", {"status": "pending"}, NEWEST_FIRST),
+        _shape("submissions.list_activity", "submissions", {"activity_id": "x"}, NEWEST_FIRST),
+        _shape(
+            "submissions.list_duplicates",
+            "submissions",
+            {"possible_duplicate": True},
+            NEWEST_FIRST,
+        ),
+        _shape(
+            "submissions.duplicate_index_sync",
+            "submissions",
+            {"proof_minhash": {"$ne": None}, "created_at": {"$gte": now.isoformat()}},
+            [("created_at", ASCENDING)],
+        ),
+        _shape("search.submissions", "submissions", {"$text": {"$search": "x"}}),
+        _shape("search.activities", "activities", {"$text": {"$search": "x"}}),
+        _shape("progress.counters", "user_progress", {"user_id": "x"}),
+        _shape("progress.recount", "submissions", {"user_id": "x"}),
+        _shape("uploads.by_sha256", "uploads", {"sha256": "x"}),
+        _shape("rewards.by_submission", "rewards", {"submission_id": "x"}),
+        _shape("rewards.count_assigned", "rewards", {"status": "assigned"}),
+        _shape("rewards.list_admin", "rewards", {}, REWARDS_NEWEST_FIRST),
+        _shape("rewards.list_user", "rewards", {"user_id": "x"}, REWARDS_NEWEST_FIRST),
+        _shape("reminders.due", "reminders", {"next_run_at": {"$lte": now.isoformat()}}),
+        _shape("activities.by_users", "activities", {"assigned_to_user_id": {"$in": ["x"]}}),
+        _shape(
+            "calendar_events.synced",
+            "calendar_events",
+            {"user_id": {"$in": ["x"]}, "start_iso": {"$gte": now.isoformat()}},
+        ),
+    ]
+
+
+async def ensure_indexes(db: AsyncDatabase) -> dict:
+    """
+    Create every declared index. Existing indexes are left untouched, so this
+    is safe to run on every startup.
+    """
+    report: dict = {"created": {}, "errors": {}}
+    for collection, models in INDEXES.items():
+        try:
+            report["created"][collection] = await db[collection].create_indexes(models)
+        except OperationFailure as exc:
+            logger.warning("Could not build indexes for %s: %s", collection, exc)
+            report["errors"][collection] = str(exc)
+    return report
+
+
+def _plan_stages(plan) -> list[str]:
+    stages: list[str] = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+async def check_query_plans(db: AsyncDatabase) -> list[dict]:
+    results = []
+    for shape in _query_shapes():
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape["sort"]:
+            cursor = cursor.sort(shape["sort"])
+        explained = await cursor.explain()
+        stages = _plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {}))
+        results.append(
+            {
+                "name": shape["name"],
+                "collection": shape["collection"],
+                "stages": stages,
+                "collscan": "COLLSCAN" in stages,
+            }
+        )
+    return results
@@ -4,31 +4,63 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.database import create_client, get_db
+from app.database import create_async_client, get_db
+from app.indexes import ensure_indexes
+from app.metrics import MetricsMiddleware
+from app.process_pool import shutdown_process_pool
+from app.responses import default_response_class
 from app.routers.activities import router as activities_router
 from app.routers.admin import router as admin_router
 from app.routers.ai import router as ai_router
 from app.routers.auth import router as auth_router
 from app.routers.calendar import router as calendar_router
+from app.routers.exports import router as exports_router
 from app.routers.health import router as health_router
+from app.routers.metrics import router as metrics_router
 from app.routers.progress import router as progress_router
 from app.routers.rewards import router as rewards_router
 from app.routers.submissions import router as submissions_router
+from app.routers.uploads import router as uploads_router
+from app.security import check_session_settings
 from app.seed_data import seed_if_needed
+from app.services.duplicate_service import duplicates
+from app.services.minimax_client import close_minimax_client
+from app.services.reminder_dispatcher import dispatcher
+from app.services.voucher_service import close_voucher_client
+from app.tokens import revocations
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    client = create_client()
+    check_session_settings()
+    client = create_async_client()
     app.state.client = client
     app.state.db = get_db(client)
+    if settings.ensure_indexes_on_startup:
+        await ensure_indexes(app.state.db)
     if settings.auto_seed_data:
-        seed_if_needed(app.state.db)
+        await seed_if_needed(app.state.db)
+    if settings.session_signing_key or settings.session_cache_enabled:
+        await revocations.start(app.state.db, settings.session_revocation_sync_seconds)
+    if settings.reminder_dispatcher_enabled:
+        await dispatcher.start(app.state.db)
+    if settings.duplicate_detection_enabled:
+        await duplicates.start(app.state.db, settings.duplicate_sync_seconds)
     yield
-    client.close()
+    await duplicates.stop()
+    await dispatcher.stop()
+    await revocations.stop()
+    shutdown_process_pool()
+    await close_voucher_client()
+    await close_minimax_client()
+    await client.close()
 
 
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app = FastAPI(
+    title=settings.app_name,
+    lifespan=lifespan,
+    default_response_class=default_response_class(settings.json_response_backend),
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -37,13 +69,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, exclude_paths=("/metrics", "/health"))
 
 app.include_router(health_router)
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
 app.include_router(auth_router, prefix=settings.api_prefix)
 app.include_router(activities_router, prefix=settings.api_prefix)
 app.include_router(submissions_router, prefix=settings.api_prefix)
 app.include_router(admin_router, prefix=settings.api_prefix)
+app.include_router(exports_router, prefix=settings.api_prefix)
 app.include_router(ai_router, prefix=settings.api_prefix)
 app.include_router(progress_router, prefix=settings.api_prefix)
 app.include_router(rewards_router, prefix=settings.api_prefix)
 app.include_router(calendar_router, prefix=settings.api_prefix)
+app.include_router(uploads_router, prefix=settings.api_prefix)
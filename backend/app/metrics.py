@@ -0,0 +1,232 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [non-cumulative bucket counts..., overflow count], sum.
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = ([0] * (len(self.buckets) + 1), [0.0])
+                self._values[labels] = entry
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(
+                (labels, (list(counts), total[0]))
+                for labels, (counts, total) in self._values.items()
+            )
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="{}"'.format(_format_value(float(bound)))
+                label_text = _format_labels(self.label_names, labels, le)
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+http_requests_total = Counter(
+    "ownmerits_http_requests_total",
+    "HTTP requests by route template and status code.",
+    ("method", "route", "status"),
+)
+http_request_duration = Histogram(
+    "ownmerits_http_request_duration_seconds",
+    "HTTP request latency by route template, until the last body chunk is sent.",
+    ("method", "route"),
+)
+http_request_mongo_commands = Histogram(
+    "ownmerits_http_request_mongo_commands",
+    "MongoDB commands issued per HTTP request.",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+mongo_commands_total = Counter(
+    "ownmerits_mongo_commands_total",
+    "MongoDB commands by command name, originating route and outcome.",
+    ("command", "route", "outcome"),
+)
+mongo_command_duration = Histogram(
+    "ownmerits_mongo_command_duration_seconds",
+    "MongoDB command latency by command name and originating route.",
+    ("command", "route"),
+    buckets=MONGO_LATENCY_BUCKETS,
+)
+
+REGISTRY = [
+    http_requests_total,
+    http_request_duration,
+    http_request_mongo_commands,
+    mongo_commands_total,
+    mongo_command_duration,
+]
+
+UNMATCHED_ROUTE = "<unmatched>"
+BACKGROUND_ROUTE = "<background>"
+
+
+def route_label(scope: dict) -> str:
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    # FastAPI keeps an included router's routes unprefixed and records the include prefix
+    # (e.g. /api) beside them; a mount appends its path to root_path.
+    included = (scope.get("fastapi") or {}).get("included_router")
+    include_prefix = getattr(getattr(included, "include_context", None), "prefix", "")
+    root_path = scope.get("root_path", "")
+    mount_prefix = root_path[len(scope.get("app_root_path", root_path)) :]
+    return mount_prefix + include_prefix + getattr(route, "path_format", route.path)
+
+
+@dataclass
+class RequestMetrics:
+    # The router stores the matched route in this (shared) scope before the handler runs,
+    # so commands issued by the handler are labelled with the route template.
+    scope: dict
+    mongo_commands: int = 0
+
+
+_current_request: ContextVar[RequestMetrics | None] = ContextVar(
+    "ownmerits_current_request", default=None
+)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Attributes MongoDB command counts and durations to the in-flight HTTP request."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._record(event.command_name, event.duration_micros, "success")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._record(event.command_name, event.duration_micros, "failure")
+
+    def _record(self, command_name: str, duration_micros: int, outcome: str) -> None:
+        current = _current_request.get()
+        if current is None:
+            route = BACKGROUND_ROUTE
+        else:
+            current.mongo_commands += 1
+            route = route_label(current.scope)
+        mongo_commands_total.inc(command_name, route, outcome)
+        mongo_command_duration.observe(duration_micros / 1_000_000, command_name, route)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed responses are timed until their last chunk."""
+
+    def __init__(self, app, exclude_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        current = RequestMetrics(scope)
+        token = _current_request.set(current)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_request.reset(token)
+            elapsed = time.perf_counter() - started
+            route = route_label(scope)
+            method = scope["method"]
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration.observe(elapsed, method, route)
+            http_request_mongo_commands.observe(current.mongo_commands, method, route)
+
+
+def render_metrics(extra: list[str] | None = None) -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(extra or [])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,79 @@
+import base64
+import json
+
+from fastapi import HTTPException, Query, status
+
+from app.config import settings
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("utf-8").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("utf-8")))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+    return values
+
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int = Query(
+            default=settings.pagination_default_limit,
+            ge=1,
+            le=settings.pagination_max_limit,
+        ),
+        cursor: str | None = Query(default=None),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+async def paginate(
+    collection,
+    filters: dict,
+    projection: dict,
+    page: PageParams,
+    sort_key: str = "created_at",
+    tie_key: str = "id",
+) -> dict:
+    # Keyset pagination over (sort_key desc, tie_key desc): every page is an index
+    # range scan starting after the last row of the previous page, never a skip.
+    if any(value for key, value in projection.items() if key != "_id"):
+        # The cursor is built from the last row, so the keyset fields are always projected.
+        projection = {**projection, sort_key: 1, tie_key: 1}
+
+    query = filters
+    if page.cursor:
+        last_sort, last_tie = decode_cursor(page.cursor)
+        after = {
+            "$or": [
+                {sort_key: {"$lt": last_sort}},
+                {sort_key: last_sort, tie_key: {"$lt": last_tie}},
+            ]
+        }
+        query = {"$and": [filters, after]} if filters else after
+
+    items = (
+        await collection.find(query, projection)
+        .sort([(sort_key, -1), (tie_key, -1)])
+        .limit(page.limit + 1)
+        .to_list()
+    )
+
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[: page.limit]
+        last = items[-1]
+        next_cursor = encode_cursor([last.get(sort_key), last.get(tie_key)])
+    return {"items": items, "next_cursor": next_cursor}
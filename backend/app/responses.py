@@ -0,0 +1,45 @@
+from typing import Any
+
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: only needed for JSON_RESPONSE_BACKEND=orjson
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional: only needed for JSON_RESPONSE_BACKEND=msgspec
+    msgspec = None
+
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgspecResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return _msgspec_encoder.encode(content)
+
+
+_msgspec_encoder = msgspec.json.Encoder() if msgspec is not None else None
+
+JSON_RESPONSE_CLASSES = {"orjson": (OrjsonResponse, orjson), "msgspec": (MsgspecResponse, msgspec)}
+
+
+def default_response_class(backend: str):
+    """Response class for `FastAPI(default_response_class=...)`.
+
+    "default" keeps FastAPI's own serialization; "orjson" and "msgspec" render the
+    handler's return value with that library and need it to be installed.
+    """
+    if backend == "default":
+        return Default(JSONResponse)
+    if backend not in JSON_RESPONSE_CLASSES:
+        raise ValueError(f"Unknown JSON response backend: {backend}")
+    response_class, module = JSON_RESPONSE_CLASSES[backend]
+    if module is None:
+        raise RuntimeError(f"JSON_RESPONSE_BACKEND={backend} requires `pip install {backend}`")
+    return response_class
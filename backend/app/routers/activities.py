@@ -3,15 +3,23 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Depends, Request
 
+from app.etag import conditional_get
+from app.fields import ACTIVITY_FIELDS, FieldSelector
+from app.pagination import PageParams, paginate
 from app.schemas import ActivityCreate
 from app.security import get_current_user
+from app.services.recurrence_service import recurrence_rule_for
+from app.services.stats_service import stats_writes
+from app.services.version_service import bump_versions
 
 router = APIRouter(prefix="/activities", tags=["activities"])
 
 
-@router.get("")
-def list_activities(
+@router.get("", dependencies=[Depends(conditional_get)])
+async def list_activities(
     request: Request,
+    page: PageParams = Depends(),
+    projection: dict = Depends(FieldSelector(ACTIVITY_FIELDS)),
     current_user: dict = Depends(get_current_user),
 ) -> dict:
     db = request.app.state.db
@@ -23,12 +31,11 @@ def list_activities(
                 {"activity_type": "voluntary"},
             ]
         }
-    items = list(db.activities.find(filters, {"_id": 0}).sort("created_at", -1))
-    return {"items": items}
+    return await paginate(db.activities, filters, projection, page)
 
 
 @router.post("")
-def create_activity(
+async def create_activity(
     payload: ActivityCreate,
     request: Request,
     current_user: dict = Depends(get_current_user),
@@ -45,8 +52,14 @@ def create_activity(
         "activity_type": payload.activity_type,
         "assigned_to_user_id": assigned_user_id,
         "recurrence_text": payload.recurrence_text,
+        "recurrence_rule": recurrence_rule_for(payload.recurrence_text),
         "created_at": now_iso,
     }
-    db.activities.insert_one(item)
+    async with stats_writes(db) as stats:
+        await db.activities.insert_one(item)
+        stats["activities_count"] = 1
+    await bump_versions(
+        db, [assigned_user_id], global_scope=payload.activity_type == "voluntary"
+    )
     item.pop("_id", None)
     return item
@@ -2,32 +2,98 @@ from datetime import datetime, timezone
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-
-from app.schemas import ActivityCreate, ActivityUpdate, SubmissionReview, UserCreate
-from app.security import hash_password, require_admin
-from app.services.voucher_service import assign_voucher
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.config import settings
+from app.fields import (
+    ACTIVITY_FIELDS,
+    REWARD_FIELDS,
+    SUBMISSION_FIELDS,
+    SUBMISSION_LIST_FIELDS,
+    USER_FIELDS,
+    FieldSelector,
+)
+from app.pagination import PageParams, paginate
+from app.schemas import (
+    ActivityCreate,
+    ActivityUpdate,
+    SearchType,
+    SubmissionBulkReview,
+    SubmissionReview,
+    SubmissionStatus,
+    UserCreate,
+)
+from app.security import hash_password_async, require_admin, session_cache
+from app.services.duplicate_service import duplicates
+from app.services.minimax_service import reminder_cache
+from app.services.progress_service import progress_writes, record_status_change
+from app.services.recurrence_service import recurrence_rule_for
+from app.services.reminder_dispatcher import dispatcher
+from app.services.search_service import search
+from app.services.stats_service import (
+    add_stats_deltas,
+    get_dashboard_stats,
+    stats_writes,
+    status_change_deltas,
+)
+from app.services.version_service import bump_versions
+from app.services.voucher_service import (
+    VoucherProviderError,
+    assign_voucher,
+    assign_vouchers,
+)
+
+DUPLICATE_KEY = 11000
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
 
 
+async def _insert_rewards(db, rewards: list[dict]) -> int:
+    """Insert rewards, skipping submissions that already have one; returns how many landed."""
+    try:
+        return len((await db.rewards.insert_many(rewards, ordered=False)).inserted_ids)
+    except BulkWriteError as exc:
+        if any(error["code"] != DUPLICATE_KEY for error in exc.details["writeErrors"]):
+            raise
+        return exc.details["nInserted"]
+
+
 @router.get("/dashboard")
-def admin_dashboard(request: Request) -> dict:
-    db = request.app.state.db
+async def admin_dashboard(request: Request) -> dict:
+    return await get_dashboard_stats(request.app.state.db)
+
+
+@router.get("/cache-stats")
+async def admin_cache_stats() -> dict:
     return {
-        "activities_count": db.activities.count_documents({}),
-        "submissions_pending": db.submissions.count_documents({"status": "pending"}),
-        "submissions_approved": db.submissions.count_documents({"status": "approved"}),
-        "submissions_rejected": db.submissions.count_documents({"status": "rejected"}),
-        "rewards_assigned": db.rewards.count_documents({"status": "assigned"}),
+        "session_cache": {
+            "enabled": settings.session_cache_enabled,
+            **session_cache.stats(),
+        },
+        "reminder_cache": reminder_cache.stats(),
     }
 
 
+@router.get("/reminders/dispatcher")
+async def admin_reminder_dispatcher_stats() -> dict:
+    return dispatcher.stats()
+
+
+@router.get("/duplicates/index")
+async def admin_duplicate_index_stats() -> dict:
+    return duplicates.stats()
+
+
 @router.get("/submissions")
-def admin_list_submissions(
+async def admin_list_submissions(
     request: Request,
     status: str | None = Query(default=None),
     user_id: str | None = Query(default=None),
     activity_id: str | None = Query(default=None),
+    possible_duplicate: bool | None = Query(default=None),
+    page: PageParams = Depends(),
+    projection: dict = Depends(FieldSelector(SUBMISSION_FIELDS, SUBMISSION_LIST_FIELDS)),
 ) -> dict:
     db = request.app.state.db
     filters: dict = {}
@@ -37,55 +103,75 @@ def admin_list_submissions(
         filters["user_id"] = user_id
     if activity_id:
         filters["activity_id"] = activity_id
+    if possible_duplicate is not None:
+        # Submissions from before detection have no flag; they count as not flagged.
+        filters["possible_duplicate"] = True if possible_duplicate else {"$ne": True}
+
+    return await paginate(db.submissions, filters, projection, page)
 
-    items = list(db.submissions.find(filters, {"_id": 0}).sort("created_at", -1))
-    return {"items": items}
+
+@router.get("/search")
+async def admin_search(
+    request: Request,
+    q: str = Query(min_length=1, max_length=200),
+    types: list[SearchType] | None = Query(default=None, alias="type"),
+    status: SubmissionStatus | None = Query(default=None),
+    user_id: str | None = Query(default=None),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    page: PageParams = Depends(),
+) -> dict:
+    return await search(
+        request.app.state.db,
+        q,
+        page,
+        types=tuple(types) if types else ("submission", "activity"),
+        status=status,
+        user_id=user_id,
+        created_from=created_from,
+        created_to=created_to,
+    )
 
 
 @router.get("/rewards")
-def admin_list_rewards(request: Request) -> dict:
+async def admin_list_rewards(
+    request: Request,
+    page: PageParams = Depends(),
+    projection: dict = Depends(FieldSelector(REWARD_FIELDS)),
+) -> dict:
     db = request.app.state.db
-    items = list(db.rewards.find({}, {"_id": 0}).sort("assigned_at", -1))
-    return {"items": items}
+    return await paginate(
+        db.rewards, {}, projection, page, sort_key="assigned_at", tie_key="reward_id"
+    )
 
 
 @router.get("/users")
-def admin_list_users(request: Request) -> dict:
+async def admin_list_users(
+    request: Request,
+    page: PageParams = Depends(),
+    projection: dict = Depends(FieldSelector(USER_FIELDS)),
+) -> dict:
     db = request.app.state.db
-    users = list(
-        db.users.find(
-            {},
-            {
-                "_id": 0,
-                "id": 1,
-                "name": 1,
-                "email": 1,
-                "role": 1,
-                "group": 1,
-                "created_at": 1,
-            },
-        ).sort("created_at", -1)
-    )
-    return {"items": users}
+    return await paginate(db.users, {}, projection, page)
 
 
 @router.post("/users")
-def admin_create_user(payload: UserCreate, request: Request) -> dict:
+async def admin_create_user(payload: UserCreate, request: Request) -> dict:
     db = request.app.state.db
     normalized_email = payload.email.strip().lower()
-    if db.users.find_one({"email": normalized_email}):
+    if await db.users.find_one({"email": normalized_email}):
         raise HTTPException(status_code=409, detail="Email already exists")
 
     item = {
         "id": str(uuid4()),
         "name": payload.name.strip(),
         "email": normalized_email,
-        "password_hash": hash_password(payload.password),
+        "password_hash": await hash_password_async(payload.password),
         "role": payload.role,
         "group": payload.group,
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
-    db.users.insert_one(item)
+    await db.users.insert_one(item)
     return {
         "id": item["id"],
         "name": item["name"],
@@ -97,14 +183,17 @@ def admin_create_user(payload: UserCreate, request: Request) -> dict:
 
 
 @router.get("/activities")
-def admin_list_activities(request: Request) -> dict:
+async def admin_list_activities(
+    request: Request,
+    page: PageParams = Depends(),
+    projection: dict = Depends(FieldSelector(ACTIVITY_FIELDS)),
+) -> dict:
     db = request.app.state.db
-    items = list(db.activities.find({}, {"_id": 0}).sort("created_at", -1))
-    return {"items": items}
+    return await paginate(db.activities, {}, projection, page)
 
 
 @router.post("/activities")
-def admin_create_activity(payload: ActivityCreate, request: Request) -> dict:
+async def admin_create_activity(payload: ActivityCreate, request: Request) -> dict:
     db = request.app.state.db
     now_iso = datetime.now(timezone.utc).isoformat()
     item = {
@@ -114,91 +203,242 @@ def admin_create_activity(payload: ActivityCreate, request: Request) -> dict:
         "activity_type": payload.activity_type,
         "assigned_to_user_id": payload.assigned_to_user_id or None,
         "recurrence_text": payload.recurrence_text,
+        "recurrence_rule": recurrence_rule_for(payload.recurrence_text),
         "created_at": now_iso,
     }
-    db.activities.insert_one(item)
+    async with stats_writes(db) as stats:
+        await db.activities.insert_one(item)
+        stats["activities_count"] = 1
+    await bump_versions(
+        db, [item["assigned_to_user_id"]], global_scope=item["activity_type"] == "voluntary"
+    )
     item.pop("_id", None)
     return item
 
 
 @router.patch("/activities/{activity_id}")
-def admin_update_activity(
+async def admin_update_activity(
     activity_id: str, payload: ActivityUpdate, request: Request
 ) -> dict:
     db = request.app.state.db
-    existing = db.activities.find_one({"id": activity_id}, {"_id": 0})
+    existing = await db.activities.find_one({"id": activity_id}, {"_id": 0})
     if not existing:
         raise HTTPException(status_code=404, detail="Activity not found")
 
     changes = payload.model_dump(exclude_none=True)
     if not changes:
         return existing
+    if "recurrence_text" in changes:
+        changes["recurrence_rule"] = recurrence_rule_for(changes["recurrence_text"])
 
-    db.activities.update_one({"id": activity_id}, {"$set": changes})
-    updated = db.activities.find_one({"id": activity_id}, {"_id": 0})
+    await db.activities.update_one({"id": activity_id}, {"$set": changes})
+    # Reassignment or a type change can move the activity between users' lists.
+    await bump_versions(db, global_scope=True)
+    updated = await db.activities.find_one({"id": activity_id}, {"_id": 0})
     return updated
 
 
 @router.delete("/activities/{activity_id}")
-def admin_delete_activity(activity_id: str, request: Request) -> dict:
+async def admin_delete_activity(activity_id: str, request: Request) -> dict:
     db = request.app.state.db
-    deleted = db.activities.delete_one({"id": activity_id})
+    async with stats_writes(db) as stats:
+        deleted = await db.activities.delete_one({"id": activity_id})
+        stats["activities_count"] = -deleted.deleted_count
     if deleted.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Activity not found")
+    await bump_versions(db, global_scope=True)
     return {"activity_id": activity_id, "deleted": True}
 
 
-@router.patch("/submissions/{submission_id}/approve")
-def approve_submission(
-    submission_id: str, payload: SubmissionReview, request: Request
-) -> dict:
+@router.post("/submissions/bulk-review")
+async def bulk_review_submissions(payload: SubmissionBulkReview, request: Request) -> dict:
     db = request.app.state.db
-    submission = db.submissions.find_one({"id": submission_id}, {"_id": 0})
-    if not submission:
-        raise HTTPException(status_code=404, detail="Submission not found")
-
     reviewed_at = datetime.now(timezone.utc).isoformat()
-    db.submissions.update_one(
-        {"id": submission_id},
-        {
-            "$set": {
-                "status": "approved",
-                "reviewed_at": reviewed_at,
-                "review_feedback": payload.feedback,
+    decisions = {item.submission_id: item for item in payload.items}
+    target_status = {
+        submission_id: "approved" if item.decision == "approve" else "rejected"
+        for submission_id, item in decisions.items()
+    }
+
+    current = await db.submissions.find(
+        {"id": {"$in": list(decisions)}}, {"_id": 0, "id": 1, "user_id": 1, "status": 1}
+    ).to_list()
+    current_by_id = {doc["id"]: doc for doc in current}
+
+    writes = []
+    applied_ids = set()
+    for submission_id, submission in current_by_id.items():
+        # Matching on the status we read keeps the counter deltas below exact even if
+        # another reviewer changes the submission in between.
+        writes.append(
+            UpdateOne(
+                {"id": submission_id, "status": submission["status"]},
+                {
+                    "$set": {
+                        "status": target_status[submission_id],
+                        "reviewed_at": reviewed_at,
+                        "review_feedback": decisions[submission_id].feedback,
+                    }
+                },
+            )
+        )
+        applied_ids.add(submission_id)
+
+    changes = []
+    users = {submission["user_id"] for submission in current_by_id.values()}
+    async with progress_writes(db, users) as progress, stats_writes(db) as stats:
+        if writes:
+            outcome = await db.submissions.bulk_write(writes, ordered=False)
+            if outcome.matched_count != len(writes):
+                landed = await db.submissions.find(
+                    {"id": {"$in": list(applied_ids)}, "reviewed_at": reviewed_at},
+                    {"_id": 0, "id": 1},
+                ).to_list()
+                applied_ids = {doc["id"] for doc in landed}
+
+        for submission_id in applied_ids:
+            submission = current_by_id[submission_id]
+            change = (submission["user_id"], submission["status"], target_status[submission_id])
+            record_status_change(progress, *change)
+            add_stats_deltas(stats, status_change_deltas(*change[1:]))
+            changes.append(change)
+
+    approved_ids = [
+        submission_id
+        for submission_id in applied_ids
+        if target_status[submission_id] == "approved"
+    ]
+    rewards_by_submission = {}
+    # The statuses and their counters above are already written, whatever happens while
+    # issuing vouchers.
+    try:
+        if approved_ids:
+            existing_rewards = await db.rewards.find(
+                {"submission_id": {"$in": approved_ids}}, {"_id": 0}
+            ).to_list()
+            rewards_by_submission = {
+                reward["submission_id"]: reward for reward in existing_rewards
             }
-        },
-    )
+            issued = await assign_vouchers(
+                [
+                    (current_by_id[submission_id]["user_id"], submission_id)
+                    for submission_id in approved_ids
+                    if submission_id not in rewards_by_submission
+                ]
+            )
+            new_rewards = [reward for reward in issued if reward is not None]
+            if new_rewards:
+                async with stats_writes(db) as stats:
+                    stats["rewards_assigned"] = await _insert_rewards(db, new_rewards)
+                for reward in new_rewards:
+                    reward.pop("_id", None)
+                # A concurrent approval may have stored the reward first; report that one.
+                new_ids = [reward["submission_id"] for reward in new_rewards]
+                stored = await db.rewards.find(
+                    {"submission_id": {"$in": new_ids}}, {"_id": 0}
+                ).to_list()
+                rewards_by_submission.update(
+                    (reward["submission_id"], reward) for reward in stored
+                )
+    finally:
+        await bump_versions(db, {user_id for user_id, _, _ in changes})
+
+    results = []
+    summary = {"approved": 0, "rejected": 0, "not_found": 0, "conflict": 0, "reward_failed": 0}
+    for submission_id in decisions:
+        if submission_id not in current_by_id:
+            outcome_status = "not_found"
+        elif submission_id not in applied_ids:
+            outcome_status = "conflict"
+        else:
+            outcome_status = target_status[submission_id]
+        summary[outcome_status] += 1
+        if outcome_status == "approved" and submission_id not in rewards_by_submission:
+            # Provider failure; approving the submission again retries the voucher.
+            summary["reward_failed"] += 1
+        results.append(
+            {
+                "submission_id": submission_id,
+                "status": outcome_status,
+                "reward": rewards_by_submission.get(submission_id),
+            }
+        )
+    return {"results": results, "summary": summary}
+
 
-    reward = db.rewards.find_one({"submission_id": submission_id}, {"_id": 0})
-    if not reward:
-        reward = assign_voucher(
-            user_id=submission["user_id"],
-            submission_id=submission_id,
+async def _review(
+    db, submission_id: str, status: str, reviewed_at: str, feedback: str | None
+) -> dict:
+    """Set the review status and update the owner's counters and the dashboard stats;
+    returns the submission's `user_id` and its `status` before the review."""
+    # The owner never changes, so it is read first to fence their counters.
+    owner = await db.submissions.find_one({"id": submission_id}, {"_id": 0, "user_id": 1})
+    if not owner:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    async with progress_writes(db, [owner["user_id"]]) as progress, stats_writes(db) as stats:
+        submission = await db.submissions.find_one_and_update(
+            {"id": submission_id},
+            {
+                "$set": {
+                    "status": status,
+                    "reviewed_at": reviewed_at,
+                    "review_feedback": feedback,
+                }
+            },
+            projection={"_id": 0, "user_id": 1, "status": 1},
+            return_document=ReturnDocument.BEFORE,
         )
-        db.rewards.insert_one(reward)
+        if submission:
+            record_status_change(progress, submission["user_id"], submission["status"], status)
+            add_stats_deltas(stats, status_change_deltas(submission["status"], status))
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return submission
+
+
+@router.patch("/submissions/{submission_id}/approve")
+async def approve_submission(
+    submission_id: str, payload: SubmissionReview, request: Request
+) -> dict:
+    db = request.app.state.db
+    reviewed_at = datetime.now(timezone.utc).isoformat()
+    submission = await _review(db, submission_id, "approved", reviewed_at, payload.feedback)
+
+    # The approval and its counters stand whatever happens to the voucher.
+    try:
+        reward = await db.rewards.find_one({"submission_id": submission_id}, {"_id": 0})
+        if not reward:
+            try:
+                reward = await assign_voucher(
+                    user_id=submission["user_id"],
+                    submission_id=submission_id,
+                )
+            except VoucherProviderError as exc:
+                # Approving again retries with the same idempotency key.
+                raise HTTPException(status_code=502, detail=str(exc)) from exc
+            async with stats_writes(db) as stats:
+                try:
+                    await db.rewards.insert_one(reward)
+                    reward.pop("_id", None)
+                    stats["rewards_assigned"] = 1
+                except DuplicateKeyError:
+                    # A concurrent approval stored its reward first.
+                    reward = await db.rewards.find_one(
+                        {"submission_id": submission_id}, {"_id": 0}
+                    )
+    finally:
+        await bump_versions(db, [submission["user_id"]])
 
     return {"submission_id": submission_id, "status": "approved", "reward": reward}
 
 
 @router.patch("/submissions/{submission_id}/reject")
-def reject_submission(
+async def reject_submission(
     submission_id: str, payload: SubmissionReview, request: Request
 ) -> dict:
     db = request.app.state.db
-    matched = db.submissions.count_documents({"id": submission_id})
-    if not matched:
-        raise HTTPException(status_code=404, detail="Submission not found")
-
     reviewed_at = datetime.now(timezone.utc).isoformat()
-    db.submissions.update_one(
-        {"id": submission_id},
-        {
-            "$set": {
-                "status": "rejected",
-                "reviewed_at": reviewed_at,
-                "review_feedback": payload.feedback,
-            }
-        },
-    )
+    submission = await _review(db, submission_id, "rejected", reviewed_at, payload.feedback)
+    await bump_versions(db, [submission["user_id"]])
 
     return {"submission_id": submission_id, "status": "rejected"}
@@ -1,17 +1,43 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.schemas import RecurrenceParseRequest, ReminderRequest
-from app.services.minimax_service import generate_reminder, parse_recurrence_text
+from app.schemas import (
+    RecurrenceBatchParseRequest,
+    RecurrenceParseRequest,
+    ReminderBatchRequest,
+    ReminderRequest,
+)
+from app.security import get_current_user, require_admin
+from app.services.minimax_service import generate_reminder, generate_reminder_batch
+from app.services.recurrence_service import parse_recurrence_batch
 
+# Every route here can reach paid MiniMax calls. Single reminders and parses need a
+# signed-in user; the batch routes fan out to hundreds of calls, so they are admin-only.
 router = APIRouter(prefix="/ai", tags=["ai"])
 
 
-@router.post("/reminders/generate")
-def create_reminder(payload: ReminderRequest) -> dict:
-    response = generate_reminder(payload)
+@router.post("/reminders/generate", dependencies=[Depends(get_current_user)])
+async def create_reminder(payload: ReminderRequest) -> dict:
+    response = await generate_reminder(payload)
     return response.model_dump()
 
 
-@router.post("/recurrence/parse")
-def parse_recurrence(payload: RecurrenceParseRequest) -> dict:
-    return parse_recurrence_text(payload.text)
+@router.post("/reminders/generate-batch", dependencies=[Depends(require_admin)])
+async def create_reminders(payload: ReminderBatchRequest) -> dict:
+    generated = await generate_reminder_batch(payload.items)
+    return {
+        "results": [response.model_dump() for response in generated["results"]],
+        "summary": generated["summary"],
+    }
+
+
+@router.post("/recurrence/parse", dependencies=[Depends(get_current_user)])
+async def parse_recurrence(payload: RecurrenceParseRequest) -> dict:
+    parsed = await parse_recurrence_batch([payload.text], payload.start, payload.occurrences)
+    return parsed["results"][0]
+
+
+@router.post("/recurrence/parse-batch", dependencies=[Depends(require_admin)])
+async def parse_recurrence_many(payload: RecurrenceBatchParseRequest) -> dict:
+    return await parse_recurrence_batch(
+        payload.texts, payload.start, payload.occurrences, use_llm=payload.use_llm
+    )
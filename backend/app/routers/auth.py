@@ -4,7 +4,15 @@ from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 from app.schemas import LoginRequest, LoginResponse, UserCreate, UserPublic
-from app.security import create_session, get_current_user, hash_password, verify_password
+from app.security import (
+    create_session,
+    get_current_user,
+    hash_password_async,
+    invalidate_user,
+    password_needs_rehash,
+    revoke_session,
+    verify_password_async,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -21,10 +29,10 @@ def _to_public_user(user: dict) -> UserPublic:
 
 
 @router.post("/register")
-def register(payload: UserCreate, request: Request) -> dict:
+async def register(payload: UserCreate, request: Request) -> dict:
     db = request.app.state.db
     normalized_email = payload.email.strip().lower()
-    if db.users.find_one({"email": normalized_email}):
+    if await db.users.find_one({"email": normalized_email}):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already exists",
@@ -34,33 +42,41 @@ def register(payload: UserCreate, request: Request) -> dict:
         "id": str(uuid4()),
         "name": payload.name.strip(),
         "email": normalized_email,
-        "password_hash": hash_password(payload.password),
+        "password_hash": await hash_password_async(payload.password),
         "role": payload.role,
         "group": payload.group,
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
-    db.users.insert_one(user)
+    await db.users.insert_one(user)
     return {"user": _to_public_user(user).model_dump()}
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, request: Request) -> LoginResponse:
+async def login(payload: LoginRequest, request: Request) -> LoginResponse:
     db = request.app.state.db
     normalized_email = payload.email.strip().lower()
-    user = db.users.find_one({"email": normalized_email}, {"_id": 0})
+    user = await db.users.find_one({"email": normalized_email}, {"_id": 0})
     if not user or not user.get("password_hash"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    if not verify_password(payload.password, user["password_hash"]):
+    if not await verify_password_async(payload.password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    token, expires_at = create_session(db, user)
+    if password_needs_rehash(user["password_hash"]):
+        new_hash = await hash_password_async(payload.password)
+        await db.users.update_one(
+            {"id": user["id"], "password_hash": user["password_hash"]},
+            {"$set": {"password_hash": new_hash}},
+        )
+        invalidate_user(user["id"])
+
+    token, expires_at = await create_session(db, user)
     return LoginResponse(
         access_token=token,
         expires_at=expires_at.isoformat(),
@@ -69,13 +85,23 @@ def login(payload: LoginRequest, request: Request) -> LoginResponse:
 
 
 @router.get("/me")
-def me(current_user: dict = Depends(get_current_user)) -> dict:
+async def me(request: Request, current_user: dict = Depends(get_current_user)) -> dict:
+    if "email" not in current_user:
+        # Signed session tokens carry only id and role.
+        current_user = await request.app.state.db.users.find_one(
+            {"id": current_user["id"]}, {"_id": 0}
+        )
+        if current_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found for this session",
+            )
     return {"user": _to_public_user(current_user).model_dump()}
 
 
 @router.post("/logout")
-def logout(request: Request, current_user: dict = Depends(get_current_user)) -> dict:
+async def logout(request: Request, current_user: dict = Depends(get_current_user)) -> dict:
     authorization = request.headers.get("authorization")
     token = authorization.split(" ", 1)[1].strip()
-    request.app.state.db.sessions.delete_one({"token": token, "user_id": current_user["id"]})
+    await revoke_session(request.app.state.db, token, current_user["id"])
     return {"success": True}
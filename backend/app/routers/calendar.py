@@ -1,13 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request
 
 from app.schemas import CalendarEventCreate
-from app.services.calendar_service import create_calendar_event
+from app.security import get_current_user
+from app.services.calendar_service import create_calendar_event, get_calendar_provider
+from app.services.calendar_sync import sync_calendars
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
 
 @router.post("/events")
-def create_event(payload: CalendarEventCreate) -> dict:
+async def create_event(payload: CalendarEventCreate) -> dict:
     event = create_calendar_event(
         user_id=payload.user_id,
         title=payload.title,
@@ -15,3 +17,12 @@ def create_event(payload: CalendarEventCreate) -> dict:
         end_iso=payload.end_iso.isoformat(),
     )
     return event
+
+
+@router.post("/sync")
+async def sync_my_calendar(
+    request: Request, dry_run: bool = False, current_user: dict = Depends(get_current_user)
+) -> dict:
+    return await sync_calendars(
+        request.app.state.db, get_calendar_provider(), [current_user["id"]], dry_run=dry_run
+    )
@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.fields import REWARD_FIELDS, SUBMISSION_FIELDS, USER_FIELDS
+from app.security import require_admin
+
+router = APIRouter(prefix="/admin/export", tags=["admin"], dependencies=[Depends(require_admin)])
+
+# Column order for CSV; also the projection, so secrets such as password_hash never leave Mongo.
+EXPORT_FIELDS = {
+    "submissions": list(SUBMISSION_FIELDS),
+    "rewards": list(REWARD_FIELDS),
+    "users": list(USER_FIELDS),
+}
+FILTERABLE_FIELDS = {
+    "submissions": {"status", "user_id", "activity_id", "possible_duplicate"},
+    "rewards": {"status", "user_id"},
+    "users": set(),
+}
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+ExportCollection = Literal["submissions", "rewards", "users"]
+ExportFormat = Literal["ndjson", "csv"]
+
+
+def _csv_line(values: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(["" if value is None else value for value in values])
+    return buffer.getvalue()
+
+
+async def _stream_rows(cursor, fields: list[str], export_format: str) -> AsyncIterator[bytes]:
+    # Rows are coalesced into ~64 KiB chunks; memory stays bounded by one cursor batch.
+    chunk: list[str] = []
+    size = 0
+    if export_format == "csv":
+        chunk.append(_csv_line(fields))
+    try:
+        async for doc in cursor:
+            if export_format == "csv":
+                line = _csv_line([doc.get(field) for field in fields])
+            else:
+                line = json.dumps(doc, default=str, ensure_ascii=False) + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= EXPORT_CHUNK_BYTES:
+                yield "".join(chunk).encode("utf-8")
+                chunk, size = [], 0
+        if chunk:
+            yield "".join(chunk).encode("utf-8")
+    finally:
+        await cursor.close()
+
+
+@router.get("/{collection}")
+async def export_collection(
+    collection: ExportCollection,
+    request: Request,
+    export_format: ExportFormat = Query(default="ndjson", alias="format"),
+    status: str | None = Query(default=None),
+    user_id: str | None = Query(default=None),
+    activity_id: str | None = Query(default=None),
+    possible_duplicate: bool | None = Query(default=None),
+) -> StreamingResponse:
+    requested = {"status": status, "user_id": user_id, "activity_id": activity_id}
+    filters: dict = {key: value for key, value in requested.items() if value}
+    if possible_duplicate is not None:
+        # Same meaning as on /admin/submissions: unflagged includes never-checked rows.
+        filters["possible_duplicate"] = True if possible_duplicate else {"$ne": True}
+    unsupported = set(filters) - FILTERABLE_FIELDS[collection]
+    if unsupported:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot filter {collection} by: {', '.join(sorted(unsupported))}",
+        )
+
+    fields = EXPORT_FIELDS[collection]
+    projection = {"_id": 0, **{field: 1 for field in fields}}
+    cursor = (
+        request.app.state.db[collection]
+        .find(filters, projection)
+        .batch_size(settings.export_batch_size)
+    )
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_rows(cursor, fields, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{collection}.{export_format}"'},
+    )
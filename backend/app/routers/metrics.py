@@ -0,0 +1,67 @@
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.metrics import render_metrics
+from app.security import get_current_user, require_admin, session_cache
+from app.services.duplicate_service import duplicates
+from app.services.minimax_client import minimax_client_stats
+from app.services.minimax_service import reminder_cache
+from app.services.reminder_dispatcher import dispatcher
+from app.services.stats_service import stats_cache
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def require_metrics_access(
+    request: Request,
+    authorization: str | None = Header(default=None),
+) -> None:
+    # Scrapers send METRICS_TOKEN; without one configured, only admins can read metrics.
+    if settings.metrics_token:
+        expected = f"Bearer {settings.metrics_token}".encode()
+        if not secrets.compare_digest((authorization or "").encode(), expected):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+            )
+        return
+    await require_admin(await get_current_user(request, authorization))
+
+
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_metrics_access)])
+
+
+def _cache_lines(name: str, stats: dict) -> list[str]:
+    lines = []
+    for key, kind in (("hits", "counter"), ("misses", "counter"), ("size", "gauge")):
+        metric = f"ownmerits_{name}_{key}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric} {stats[key]}")
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    extra = _cache_lines("session_cache", session_cache.stats())
+    extra += _cache_lines("admin_stats_cache", stats_cache.stats())
+    extra += _cache_lines("reminder_cache", reminder_cache.stats())
+    reminder_stats = dispatcher.stats()
+    for key in ("queued", "in_flight", "heap_size"):
+        metric = f"ownmerits_reminder_dispatcher_{key}"
+        extra += [f"# TYPE {metric} gauge", f"{metric} {reminder_stats[key]}"]
+    extra += [
+        "# TYPE ownmerits_duplicate_index_submissions gauge",
+        f"ownmerits_duplicate_index_submissions {len(duplicates)}",
+    ]
+    minimax_stats = minimax_client_stats()
+    if minimax_stats is not None:
+        circuit = ("closed", "half_open", "open").index(minimax_stats["circuit"])
+        extra += [
+            "# HELP ownmerits_minimax_circuit_state 0 closed, 1 half-open, 2 open.",
+            "# TYPE ownmerits_minimax_circuit_state gauge",
+            f"ownmerits_minimax_circuit_state {circuit}",
+        ]
+    return PlainTextResponse(render_metrics(extra), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,36 +1,36 @@
 from fastapi import APIRouter, Depends, Request
 
+from app.etag import conditional_get
 from app.schemas import ProgressResponse
 from app.security import get_current_user
+from app.services.progress_service import get_progress_counts
 
 router = APIRouter(prefix="/progress", tags=["progress"])
 
 
-@router.get("/me")
-def get_my_progress(
+@router.get("/me", dependencies=[Depends(conditional_get)])
+async def get_my_progress(
     request: Request,
     current_user: dict = Depends(get_current_user),
 ) -> dict:
-    return _build_progress_for_user(current_user["id"], request)
+    return await _build_progress_for_user(current_user["id"], request)
 
 
 @router.get("/{user_id}")
-def get_user_progress(
+async def get_user_progress(
     user_id: str,
     request: Request,
     current_user: dict = Depends(get_current_user),
 ) -> dict:
     if current_user["role"] != "admin":
         user_id = current_user["id"]
-    return _build_progress_for_user(user_id, request)
+    return await _build_progress_for_user(user_id, request)
 
 
-def _build_progress_for_user(user_id: str, request: Request) -> dict:
-    db = request.app.state.db
-    total = db.submissions.count_documents({"user_id": user_id})
-    approved = db.submissions.count_documents({"user_id": user_id, "status": "approved"})
-    pending = db.submissions.count_documents({"user_id": user_id, "status": "pending"})
-    rejected = db.submissions.count_documents({"user_id": user_id, "status": "rejected"})
+async def _build_progress_for_user(user_id: str, request: Request) -> dict:
+    counts = await get_progress_counts(request.app.state.db, user_id)
+    total = counts["total"]
+    approved = counts["approved"]
 
     ratio = 0.0
     if total > 0:
@@ -40,8 +40,8 @@ def _build_progress_for_user(user_id: str, request: Request) -> dict:
         user_id=user_id,
         total_submissions=total,
         approved_submissions=approved,
-        pending_submissions=pending,
-        rejected_submissions=rejected,
+        pending_submissions=counts["pending"],
+        rejected_submissions=counts["rejected"],
         approval_ratio=ratio,
     )
     return response.model_dump()
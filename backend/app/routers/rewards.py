@@ -1,17 +1,26 @@
 from fastapi import APIRouter, Depends, Request
 
+from app.etag import conditional_get
+from app.fields import REWARD_FIELDS, FieldSelector
+from app.pagination import PageParams, paginate
 from app.security import get_current_user
 
 router = APIRouter(prefix="/rewards", tags=["rewards"])
 
 
-@router.get("/me")
-def list_my_rewards(
+@router.get("/me", dependencies=[Depends(conditional_get)])
+async def list_my_rewards(
     request: Request,
+    page: PageParams = Depends(),
+    projection: dict = Depends(FieldSelector(REWARD_FIELDS)),
     current_user: dict = Depends(get_current_user),
 ) -> dict:
     db = request.app.state.db
-    items = list(
-        db.rewards.find({"user_id": current_user["id"]}, {"_id": 0}).sort("assigned_at", -1)
+    return await paginate(
+        db.rewards,
+        {"user_id": current_user["id"]},
+        projection,
+        page,
+        sort_key="assigned_at",
+        tie_key="reward_id",
     )
-    return {"items": items}
@@ -1,16 +1,25 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
+from app.config import settings
+from app.etag import conditional_get
+from app.fields import SUBMISSION_FIELDS, SUBMISSION_LIST_FIELDS, FieldSelector
+from app.pagination import PageParams, paginate
 from app.schemas import SubmissionCreate
 from app.security import get_current_user
+from app.services.duplicate_service import check_duplicates, index_submission
+from app.services.progress_service import progress_writes, record_submission_created
+from app.services.stats_service import stats_writes
+from app.services.upload_service import get_upload, share_upload, thumbnail_url, upload_url
+from app.services.version_service import bump_versions
 
 router = APIRouter(prefix="/submissions", tags=["submissions"])
 
 
 @router.post("")
-def create_submission(
+async def create_submission(
     payload: SubmissionCreate,
     request: Request,
     current_user: dict = Depends(get_current_user),
@@ -20,28 +29,50 @@ def create_submission(
     owner_user_id = payload.user_id or current_user["id"]
     if current_user["role"] != "admin":
         owner_user_id = current_user["id"]
+    proof_image_url, proof_image_thumbnail_url = payload.proof_image_url, None
+    if payload.proof_image_id:
+        upload = await get_upload(db, payload.proof_image_id, current_user)
+        if upload is None:
+            raise HTTPException(status_code=400, detail="Unknown proof_image_id")
+        if owner_user_id != current_user["id"]:
+            await share_upload(db, upload["sha256"], owner_user_id)
+        proof_image_url = upload_url(upload["sha256"])
+        if upload.get("thumbnail_location"):
+            proof_image_thumbnail_url = thumbnail_url(upload["sha256"])
+    submission_id = str(uuid4())
     item = {
-        "id": str(uuid4()),
+        "id": submission_id,
         "activity_id": payload.activity_id,
         "user_id": owner_user_id,
         "proof_text": payload.proof_text,
-        "proof_image_url": payload.proof_image_url,
+        "proof_image_url": proof_image_url,
+        "proof_image_thumbnail_url": proof_image_thumbnail_url,
         "status": "pending",
         "created_at": now_iso,
         "reviewed_at": None,
         "review_feedback": None,
     }
-    db.submissions.insert_one(item)
+    if settings.duplicate_detection_enabled:
+        item.update(check_duplicates(payload.proof_text))
+    async with progress_writes(db, [owner_user_id]) as progress, stats_writes(db) as stats:
+        await db.submissions.insert_one(item)
+        record_submission_created(progress, owner_user_id)
+        stats["submissions_pending"] = 1
+    index_submission(item)
+    await bump_versions(db, [owner_user_id])
     item.pop("_id", None)
+    item.pop("proof_minhash", None)
     return item
 
 
-@router.get("")
-def list_submissions(
+@router.get("", dependencies=[Depends(conditional_get)])
+async def list_submissions(
     request: Request,
     status: str | None = Query(default=None),
     user_id: str | None = Query(default=None),
     activity_id: str | None = Query(default=None),
+    page: PageParams = Depends(),
+    projection: dict = Depends(FieldSelector(SUBMISSION_FIELDS, SUBMISSION_LIST_FIELDS)),
     current_user: dict = Depends(get_current_user),
 ) -> dict:
     db = request.app.state.db
@@ -54,5 +85,4 @@ def list_submissions(
         filters["activity_id"] = activity_id
     if current_user["role"] != "admin":
         filters["user_id"] = current_user["id"]
-    items = list(db.submissions.find(filters, {"_id": 0}).sort("created_at", -1))
-    return {"items": items}
+    return await paginate(db.submissions, filters, projection, page)
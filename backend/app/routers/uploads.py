@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app.security import get_current_user
+from app.services.upload_service import UploadError, get_upload, store_upload, upload_response
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+@router.post("")
+async def upload_proof_image(
+    request: Request, current_user: dict = Depends(get_current_user)
+) -> dict:
+    # Reads the multipart body itself so the file is streamed, not spooled by a form parser.
+    try:
+        return await store_upload(request.app.state.db, request, current_user["id"])
+    except UploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+
+
+async def _serve(request: Request, sha256: str, thumbnail: bool, user: dict) -> Response:
+    db = request.app.state.db
+    # Ownership is checked before the ETag, so a 304 does not confirm someone else's file.
+    upload = await get_upload(db, sha256, user)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    etag = f'"{sha256}{"-thumb" if thumbnail else ""}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response = await upload_response(db, upload, thumbnail)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return response
+
+
+@router.get("/{sha256}")
+async def get_proof_image(
+    request: Request, sha256: str, current_user: dict = Depends(get_current_user)
+) -> Response:
+    return await _serve(request, sha256, thumbnail=False, user=current_user)
+
+
+@router.get("/{sha256}/thumbnail")
+async def get_proof_image_thumbnail(
+    request: Request, sha256: str, current_user: dict = Depends(get_current_user)
+) -> Response:
+    return await _serve(request, sha256, thumbnail=True, user=current_user)
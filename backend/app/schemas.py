@@ -7,6 +7,8 @@ from pydantic import BaseModel, Field
 SubmissionStatus = Literal["pending", "approved", "rejected"]
 ActivityType = Literal["assigned", "voluntary"]
 UserRole = Literal["user", "admin"]
+ReviewDecision = Literal["approve", "reject"]
+SearchType = Literal["submission", "activity"]
 
 
 class ActivityCreate(BaseModel):
@@ -59,12 +61,24 @@ class SubmissionCreate(BaseModel):
     user_id: str | None = None
     proof_text: str = Field(default="", max_length=3000)
     proof_image_url: str | None = None
+    # sha256 returned by POST /uploads; takes precedence over proof_image_url.
+    proof_image_id: str | None = Field(default=None, pattern="^[0-9a-f]{64}$")
 
 
 class SubmissionReview(BaseModel):
     feedback: str | None = None
 
 
+class SubmissionBulkReviewItem(BaseModel):
+    submission_id: str
+    decision: ReviewDecision
+    feedback: str | None = None
+
+
+class SubmissionBulkReview(BaseModel):
+    items: list[SubmissionBulkReviewItem] = Field(min_length=1, max_length=500)
+
+
 class ReminderRequest(BaseModel):
     user_id: str
     activity_title: str
@@ -77,8 +91,21 @@ class ReminderResponse(BaseModel):
     model_used: str
 
 
+class ReminderBatchRequest(BaseModel):
+    items: list[ReminderRequest] = Field(min_length=1, max_length=500)
+
+
 class RecurrenceParseRequest(BaseModel):
     text: str
+    start: datetime | None = None
+    occurrences: int = Field(default=3, ge=0, le=50)
+
+
+class RecurrenceBatchParseRequest(BaseModel):
+    texts: list[str] = Field(min_length=1, max_length=500)
+    start: datetime | None = None
+    occurrences: int = Field(default=0, ge=0, le=10)
+    use_llm: bool = True
 
 
 class CalendarEventCreate(BaseModel):
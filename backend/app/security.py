@@ -5,7 +5,15 @@ from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, Header, HTTPException, Request, status
 
+from app.cache import TTLCache
 from app.config import settings
+from app.process_pool import run_in_process
+from app.tokens import is_signed_token, revocations, sign_token, verify_token
+
+session_cache = TTLCache(
+    max_entries=settings.session_cache_max_entries,
+    ttl_seconds=settings.session_cache_ttl_seconds,
+)
 
 
 def _b64(data: bytes) -> str:
@@ -16,29 +24,88 @@ def _from_b64(data: str) -> bytes:
     return base64.urlsafe_b64decode(data.encode("utf-8"))
 
 
+# Hashes are stored as "pbkdf2_<algorithm>$<iterations>$<salt>$<digest>". Hashes written
+# before the parameters were recorded are "<salt>$<digest>" with the values below.
+LEGACY_HASH_ALGORITHM = "sha256"
+LEGACY_HASH_ITERATIONS = 200_000
+
+
 def hash_password(password: str) -> str:
+    algorithm = settings.password_hash_algorithm
+    iterations = settings.password_hash_iterations
     salt = secrets.token_bytes(16)
-    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 200_000)
-    return f"{_b64(salt)}${_b64(digest)}"
+    digest = hashlib.pbkdf2_hmac(algorithm, password.encode("utf-8"), salt, iterations)
+    return f"pbkdf2_{algorithm}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def _parse_password_hash(password_hash: str) -> tuple[str, int, bytes, bytes]:
+    parts = password_hash.split("$")
+    if len(parts) == 2:
+        algorithm, iterations = LEGACY_HASH_ALGORITHM, LEGACY_HASH_ITERATIONS
+        salt_b64, digest_b64 = parts
+    else:
+        scheme, iterations_text, salt_b64, digest_b64 = parts
+        if not scheme.startswith("pbkdf2_"):
+            raise ValueError(f"Unsupported password hash scheme: {scheme}")
+        algorithm, iterations = scheme.removeprefix("pbkdf2_"), int(iterations_text)
+    return algorithm, iterations, _from_b64(salt_b64), _from_b64(digest_b64)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
     try:
-        salt_b64, digest_b64 = password_hash.split("$")
-        salt = _from_b64(salt_b64)
-        expected = _from_b64(digest_b64)
+        algorithm, iterations, salt, expected = _parse_password_hash(password_hash)
+        actual = hashlib.pbkdf2_hmac(algorithm, password.encode("utf-8"), salt, iterations)
     except (ValueError, TypeError):
         return False
-
-    actual = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 200_000)
     return secrets.compare_digest(actual, expected)
 
 
-def create_session(db, user: dict) -> tuple[str, datetime]:
-    token = secrets.token_urlsafe(32)
+def password_needs_rehash(password_hash: str) -> bool:
+    if password_hash.count("$") == 1:
+        # Legacy format: rewrite it so the parameters are recorded in the hash.
+        return True
+    try:
+        algorithm, iterations, _, _ = _parse_password_hash(password_hash)
+    except (ValueError, TypeError):
+        return False
+    return (algorithm, iterations) != (
+        settings.password_hash_algorithm,
+        settings.password_hash_iterations,
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    return await run_in_process(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await run_in_process(verify_password, password, password_hash)
+
+
+SESSION_TOKEN_MODES = ("database", "signed")
+
+
+def check_session_settings() -> None:
+    if settings.session_token_mode not in SESSION_TOKEN_MODES:
+        raise ValueError(f"Unknown SESSION_TOKEN_MODE: {settings.session_token_mode}")
+    if settings.session_token_mode == "signed" and not settings.session_signing_key:
+        raise RuntimeError("SESSION_SIGNING_KEY must be set when SESSION_TOKEN_MODE=signed")
+
+
+async def create_session(db, user: dict) -> tuple[str, datetime]:
     now = datetime.now(timezone.utc)
     expires_at = now + timedelta(hours=settings.session_expiry_hours)
-    db.sessions.insert_one(
+    if settings.session_token_mode == "signed":
+        claims = {
+            "sub": user["id"],
+            "role": user["role"],
+            "exp": int(expires_at.timestamp()),
+            "jti": secrets.token_urlsafe(12),
+        }
+        return sign_token(claims, settings.session_signing_key), expires_at
+
+    token = secrets.token_urlsafe(32)
+    await db.sessions.insert_one(
         {
             "token": token,
             "user_id": user["id"],
@@ -50,6 +117,60 @@ def create_session(db, user: dict) -> tuple[str, datetime]:
     return token, expires_at
 
 
+def _as_utc(value: datetime) -> datetime:
+    # PyMongo hands back naive datetimes unless the client is tz-aware.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def invalidate_session(token: str) -> None:
+    session_cache.pop(token)
+
+
+def _session_revocation_id(token: str) -> str:
+    # Database tokens are revoked under a hash, so `revoked_tokens` never holds a live secret.
+    return "session:" + hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def invalidate_user(user_id: str) -> None:
+    # This process only: other workers keep the user until SESSION_CACHE_TTL_SECONDS.
+    session_cache.discard_where(lambda _token, user: user.get("id") == user_id)
+
+
+async def revoke_session(db, token: str, user_id: str) -> None:
+    if is_signed_token(token):
+        claims = verify_token(token, settings.session_signing_key)
+        if claims is not None and claims.get("jti"):
+            await revocations.revoke(db, claims["jti"], claims["exp"])
+        return
+    session = await db.sessions.find_one_and_delete({"token": token, "user_id": user_id})
+    invalidate_session(token)
+    if session is not None and settings.session_cache_enabled:
+        # Other workers may still hold the token in their session cache; the revocation
+        # set reaches them within SESSION_REVOCATION_SYNC_SECONDS.
+        expires_at = _as_utc(session["expires_at"]).timestamp()
+        await revocations.revoke(db, _session_revocation_id(token), expires_at)
+
+
+def _user_from_signed_token(token: str) -> dict:
+    # Signed tokens are accepted whenever a key is configured, so switching
+    # SESSION_TOKEN_MODE either way does not log anybody out.
+    claims = None
+    if settings.session_signing_key:
+        claims = verify_token(token, settings.session_signing_key)
+    # A token without a jti could never be revoked, so it is not accepted either.
+    claims = claims or {}
+    jti = claims.get("jti")
+    if not isinstance(jti, str) or jti in revocations or not {"sub", "role"} <= claims.keys():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired or invalid",
+        )
+    # Only what the token carries; handlers needing the profile load it themselves.
+    return {"id": claims["sub"], "role": claims["role"]}
+
+
 def _extract_bearer_token(authorization: str | None) -> str:
     if not authorization:
         raise HTTPException(
@@ -65,31 +186,45 @@ def _extract_bearer_token(authorization: str | None) -> str:
     return parts[1].strip()
 
 
-def get_current_user(
+async def get_current_user(
     request: Request,
     authorization: str | None = Header(default=None),
 ) -> dict:
     db = request.app.state.db
     token = _extract_bearer_token(authorization)
+    if is_signed_token(token):
+        return _user_from_signed_token(token)
+    if settings.session_cache_enabled:
+        cached_user = session_cache.get(token)
+        if cached_user is not None:
+            if _session_revocation_id(token) not in revocations:
+                return dict(cached_user)
+            # Logged out on another worker; the database lookup below rejects it.
+            session_cache.pop(token)
+
     now = datetime.now(timezone.utc)
 
-    session = db.sessions.find_one({"token": token, "expires_at": {"$gt": now}})
+    session = await db.sessions.find_one({"token": token, "expires_at": {"$gt": now}})
     if not session:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Session expired or invalid",
         )
 
-    user = db.users.find_one({"id": session["user_id"]}, {"_id": 0})
+    user = await db.users.find_one({"id": session["user_id"]}, {"_id": 0})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found for this session",
         )
+
+    if settings.session_cache_enabled:
+        expires_at = _as_utc(session["expires_at"]).timestamp()
+        session_cache.set(token, dict(user), expires_at=expires_at)
     return user
 
 
-def require_admin(user: dict = Depends(get_current_user)) -> dict:
+async def require_admin(user: dict = Depends(get_current_user)) -> dict:
     if user.get("role") != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1,10 +1,20 @@
+import asyncio
+import random
 from datetime import datetime, timedelta, timezone
+from typing import Iterable
 
-from pymongo.database import Database
-from app.security import hash_password
+from pymongo import UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 
+from app.security import hash_password_async, invalidate_user
+from app.services.recurrence_service import recurrence_rule_for
+from app.services.version_service import bump_versions
 
-def seed_if_needed(db: Database) -> dict:
+DEMO_PASSWORD = "Password123!"
+
+
+async def seed_if_needed(db: AsyncDatabase) -> dict:
     """
     Seed starter records only for empty collections.
     Safe to run on every startup.
@@ -19,22 +29,11 @@ def seed_if_needed(db: Database) -> dict:
         "sessions": 0,
     }
 
-    # Ensure essential indexes exist for auth/session lookups.
-    try:
-        db.users.create_index("email", unique=True)
-    except Exception:
-        pass
-    try:
-        db.sessions.create_index("token", unique=True)
-    except Exception:
-        pass
-
     demo_users = [
         {
             "id": "user_demo_1",
             "name": "Alex Participant",
             "email": "user@ownmerits.org",
-            "password_hash": hash_password("Password123!"),
             "role": "user",
             "group": "care_leaver",
             "created_at": now.isoformat(),
@@ -43,7 +42,6 @@ def seed_if_needed(db: Database) -> dict:
             "id": "admin_demo_1",
             "name": "Sam Coordinator",
             "email": "admin@ownmerits.org",
-            "password_hash": hash_password("Password123!"),
             "role": "admin",
             "group": "staff",
             "created_at": now.isoformat(),
@@ -52,7 +50,6 @@ def seed_if_needed(db: Database) -> dict:
             "id": "user_demo_voucher",
             "name": "Mia VoucherReady",
             "email": "voucher@ownmerits.org",
-            "password_hash": hash_password("Password123!"),
             "role": "user",
             "group": "care_leaver",
             "created_at": now.isoformat(),
@@ -60,11 +57,34 @@ def seed_if_needed(db: Database) -> dict:
     ]
 
     # Upsert keeps old DBs compatible and guarantees login-capable demo users.
+    # One read finds what exists; passwords are only hashed for users that need one.
+    demo_ids = [demo_user["id"] for demo_user in demo_users]
+    existing_users = {
+        user["id"]: user
+        async for user in db.users.find({"id": {"$in": demo_ids}}, {"_id": 0})
+    }
+    needs_password = [
+        demo_user["id"]
+        for demo_user in demo_users
+        if not existing_users.get(demo_user["id"], {}).get("password_hash")
+    ]
+    password_hashes = dict(
+        zip(
+            needs_password,
+            await asyncio.gather(*(hash_password_async(DEMO_PASSWORD) for _ in needs_password)),
+        )
+    )
+
+    user_writes = []
+    updated_user_ids = []
     for demo_user in demo_users:
-        existing = db.users.find_one({"id": demo_user["id"]}, {"_id": 0})
-        if not existing:
-            db.users.insert_one(demo_user)
-            inserted["users"] += 1
+        if demo_user["id"] in password_hashes:
+            demo_user["password_hash"] = password_hashes[demo_user["id"]]
+        existing = existing_users.get(demo_user["id"])
+        if existing is None:
+            user_writes.append(
+                UpdateOne({"id": demo_user["id"]}, {"$setOnInsert": demo_user}, upsert=True)
+            )
             continue
 
         updates = {}
@@ -72,9 +92,15 @@ def seed_if_needed(db: Database) -> dict:
             if key not in existing or existing.get(key) in ("", None):
                 updates[key] = value
         if updates:
-            db.users.update_one({"id": demo_user["id"]}, {"$set": updates})
+            user_writes.append(UpdateOne({"id": demo_user["id"]}, {"$set": updates}))
+            updated_user_ids.append(demo_user["id"])
+    if user_writes:
+        result = await db.users.bulk_write(user_writes, ordered=False)
+        inserted["users"] += result.upserted_count
+    for user_id in updated_user_ids:
+        invalidate_user(user_id)
 
-    if db.activities.count_documents({}) == 0:
+    if await db.activities.find_one({}, {"_id": 1}) is None:
         activities = [
             {
                 "id": "activity_demo_1",
@@ -83,6 +109,7 @@ def seed_if_needed(db: Database) -> dict:
                 "activity_type": "assigned",
                 "assigned_to_user_id": "user_demo_1",
                 "recurrence_text": "Every Wednesday at 4pm",
+                "recurrence_rule": "FREQ=WEEKLY;BYDAY=WE;BYHOUR=16;BYMINUTE=0",
                 "created_at": now.isoformat(),
             },
             {
@@ -92,6 +119,7 @@ def seed_if_needed(db: Database) -> dict:
                 "activity_type": "assigned",
                 "assigned_to_user_id": "user_demo_1",
                 "recurrence_text": None,
+                "recurrence_rule": None,
                 "created_at": now.isoformat(),
             },
             {
@@ -101,13 +129,14 @@ def seed_if_needed(db: Database) -> dict:
                 "activity_type": "voluntary",
                 "assigned_to_user_id": "user_demo_1",
                 "recurrence_text": "Twice a week",
+                "recurrence_rule": "FREQ=WEEKLY;BYDAY=MO,TH",
                 "created_at": now.isoformat(),
             },
         ]
-        db.activities.insert_many(activities)
+        await db.activities.insert_many(activities)
         inserted["activities"] = len(activities)
 
-    if db.submissions.count_documents({}) == 0:
+    if await db.submissions.find_one({}, {"_id": 1}) is None:
         submissions = [
             {
                 "id": "submission_demo_1",
@@ -132,10 +161,10 @@ def seed_if_needed(db: Database) -> dict:
                 "review_feedback": None,
             },
         ]
-        db.submissions.insert_many(submissions)
+        await db.submissions.insert_many(submissions)
         inserted["submissions"] = len(submissions)
 
-    if db.rewards.count_documents({}) == 0:
+    if await db.rewards.find_one({}, {"_id": 1}) is None:
         rewards = [
             {
                 "reward_id": "reward_demo_1",
@@ -146,10 +175,10 @@ def seed_if_needed(db: Database) -> dict:
                 "assigned_at": (now - timedelta(days=1)).isoformat(),
             }
         ]
-        db.rewards.insert_many(rewards)
+        await db.rewards.insert_many(rewards)
         inserted["rewards"] = len(rewards)
 
-    if db.reminders.count_documents({}) == 0:
+    if await db.reminders.find_one({}, {"_id": 1}) is None:
         reminders = [
             {
                 "id": "reminder_demo_1",
@@ -160,61 +189,234 @@ def seed_if_needed(db: Database) -> dict:
                 "created_at": now.isoformat(),
             }
         ]
-        db.reminders.insert_many(reminders)
+        await db.reminders.insert_many(reminders)
         inserted["reminders"] = len(reminders)
 
     # Ensure voucher-ready demo user has enough approved submissions and a voucher.
     voucher_user_id = "user_demo_voucher"
-    voucher_activity_ids = []
+    voucher_activity_writes = []
+    voucher_submission_writes = []
     for idx in range(1, 11):
-        activity_id = f"activity_voucher_{idx}"
-        voucher_activity_ids.append(activity_id)
-        if not db.activities.find_one({"id": activity_id}, {"_id": 1}):
-            db.activities.insert_one(
-                {
-                    "id": activity_id,
-                    "title": f"Voucher Track Activity {idx}",
-                    "description": "Completed activity for voucher-track demo user.",
-                    "activity_type": "assigned",
-                    "assigned_to_user_id": voucher_user_id,
-                    "recurrence_text": None,
-                    "created_at": (now - timedelta(days=20 - idx)).isoformat(),
-                }
-            )
-            inserted["activities"] += 1
+        activity = {
+            "id": f"activity_voucher_{idx}",
+            "title": f"Voucher Track Activity {idx}",
+            "description": "Completed activity for voucher-track demo user.",
+            "activity_type": "assigned",
+            "assigned_to_user_id": voucher_user_id,
+            "recurrence_text": None,
+            "recurrence_rule": None,
+            "created_at": (now - timedelta(days=20 - idx)).isoformat(),
+        }
+        submission = {
+            "id": f"submission_voucher_{idx}",
+            "activity_id": activity["id"],
+            "user_id": voucher_user_id,
+            "proof_text": f"Completed voucher activity {idx}.",
+            "proof_image_url": "https://placehold.co/600x400/png",
+            "status": "approved",
+            "created_at": (now - timedelta(days=12 - idx)).isoformat(),
+            "reviewed_at": (now - timedelta(days=11 - idx)).isoformat(),
+            "review_feedback": "Approved for voucher demo track.",
+        }
+        voucher_activity_writes.append(
+            UpdateOne({"id": activity["id"]}, {"$setOnInsert": activity}, upsert=True)
+        )
+        voucher_submission_writes.append(
+            UpdateOne({"id": submission["id"]}, {"$setOnInsert": submission}, upsert=True)
+        )
 
-        submission_id = f"submission_voucher_{idx}"
-        if not db.submissions.find_one({"id": submission_id}, {"_id": 1}):
-            db.submissions.insert_one(
-                {
-                    "id": submission_id,
-                    "activity_id": activity_id,
-                    "user_id": voucher_user_id,
-                    "proof_text": f"Completed voucher activity {idx}.",
-                    "proof_image_url": "https://placehold.co/600x400/png",
-                    "status": "approved",
-                    "created_at": (now - timedelta(days=12 - idx)).isoformat(),
-                    "reviewed_at": (now - timedelta(days=11 - idx)).isoformat(),
-                    "review_feedback": "Approved for voucher demo track.",
-                }
+    result = await db.activities.bulk_write(voucher_activity_writes, ordered=False)
+    inserted["activities"] += result.upserted_count
+    result = await db.submissions.bulk_write(voucher_submission_writes, ordered=False)
+    inserted["submissions"] += result.upserted_count
+
+    voucher_reward = {
+        "reward_id": "reward_voucher_demo_1",
+        "submission_id": "submission_voucher_10",
+        "voucher_code": "OM-VOUCHER-DEMO-100PTS",
+        "assigned_at": now.isoformat(),
+        "value": 10,
+        "currency": "GBP",
+        "retailer": "Tesco",
+        "expires_at": (now + timedelta(days=30)).isoformat(),
+    }
+    result = await db.rewards.update_one(
+        {"user_id": voucher_user_id, "status": "assigned"},
+        {"$setOnInsert": voucher_reward},
+        upsert=True,
+    )
+    if result.upserted_id is not None:
+        inserted["rewards"] += 1
+
+    if inserted["submissions"]:
+        # Seeded rows bypass the counter updates in the routers; let them rebuild on read.
+        await db.user_progress.delete_many(
+            {"user_id": {"$in": ["user_demo_1", voucher_user_id]}}
+        )
+    if any(inserted.values()):
+        await db.admin_stats.delete_many({})
+        await bump_versions(db, global_scope=True)
+
+    return inserted
+
+
+FIXTURE_PASSWORD = DEMO_PASSWORD
+FIXTURE_ADMIN_EMAIL = "fixture-admin@ownmerits.org"
+FIXTURE_STATUS_MIX = (("approved", 0.55), ("pending", 0.30), ("rejected", 0.15))
+FIXTURE_INSERTS_IN_FLIGHT = 4
+
+
+def fixture_email(index: int) -> str:
+    return f"fixture-user-{index}@ownmerits.org"
+
+
+class _BatchInserter:
+    """
+    Buffers documents and writes them with unordered insert_many, keeping a few
+    batches in flight so the server is never idle while the next one is built.
+    """
+
+    def __init__(self, collection: AsyncCollection, batch_size: int):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.inserted = 0
+        self._batch: list[dict] = []
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def add(self, doc: dict) -> None:
+        self._batch.append(doc)
+        if len(self._batch) >= self.batch_size:
+            await self._flush(FIXTURE_INSERTS_IN_FLIGHT - 1)
+
+    async def add_all(self, docs: Iterable[dict]) -> int:
+        for doc in docs:
+            await self.add(doc)
+        return await self.finish()
+
+    async def finish(self) -> int:
+        await self._flush(0)
+        return self.inserted
+
+    async def _flush(self, max_in_flight: int) -> None:
+        if self._batch:
+            self._in_flight.add(
+                asyncio.create_task(self.collection.insert_many(self._batch, ordered=False))
+            )
+            self._batch = []
+        while len(self._in_flight) > max_in_flight:
+            done, self._in_flight = await asyncio.wait(
+                self._in_flight, return_when=asyncio.FIRST_COMPLETED
             )
-            inserted["submissions"] += 1
+            self.inserted += sum(len(task.result().inserted_ids) for task in done)
 
-    if not db.rewards.find_one({"user_id": voucher_user_id, "status": "assigned"}, {"_id": 1}):
-        db.rewards.insert_one(
+
+async def generate_fixtures(
+    db: AsyncDatabase,
+    users: int,
+    activities: int,
+    submissions: int,
+    batch_size: int = 10_000,
+    random_seed: int = 42,
+) -> dict:
+    """
+    Bulk-insert a synthetic dataset: N users plus one admin, M activities and K
+    submissions with a realistic status mix, and a reward per approved submission.
+    All fixture users share one password hash, so only one PBKDF2 run is needed.
+    """
+    rng = random.Random(random_seed)
+    now = datetime.now(timezone.utc)
+    password_hash = await hash_password_async(FIXTURE_PASSWORD)
+
+    def user_docs():
+        yield {
+            "id": "fixture_admin",
+            "name": "Fixture Admin",
+            "email": FIXTURE_ADMIN_EMAIL,
+            "password_hash": password_hash,
+            "role": "admin",
+            "group": "staff",
+            "created_at": now.isoformat(),
+        }
+        for idx in range(users):
+            yield {
+                "id": f"fixture_user_{idx}",
+                "name": f"Fixture User {idx}",
+                "email": fixture_email(idx),
+                "password_hash": password_hash,
+                "role": "user",
+                "group": "care_leaver",
+                "created_at": (now - timedelta(minutes=idx)).isoformat(),
+            }
+
+    def activity_docs():
+        for idx in range(activities):
+            voluntary = rng.random() < 0.2
+            assignee = None if voluntary else f"fixture_user_{rng.randrange(users)}"
+            recurrence_text = rng.choice([None, "Every Wednesday at 4pm", "Twice a week"])
+            yield {
+                "id": f"fixture_activity_{idx}",
+                "title": f"Fixture activity {idx}",
+                "description": "Generated fixture activity.",
+                "activity_type": "voluntary" if voluntary else "assigned",
+                "assigned_to_user_id": assignee,
+                "recurrence_text": recurrence_text,
+                "recurrence_rule": recurrence_rule_for(recurrence_text),
+                "created_at": (now - timedelta(minutes=idx)).isoformat(),
+            }
+
+    inserted = {
+        "users": await _BatchInserter(db.users, batch_size).add_all(user_docs()),
+        "activities": await _BatchInserter(db.activities, batch_size).add_all(activity_docs()),
+    }
+
+    statuses = [status for status, _ in FIXTURE_STATUS_MIX]
+    weights = [weight for _, weight in FIXTURE_STATUS_MIX]
+    status_counts = {status: 0 for status in statuses}
+    pending_ids: list[str] = []
+    submission_writer = _BatchInserter(db.submissions, batch_size)
+    reward_writer = _BatchInserter(db.rewards, batch_size)
+    for idx in range(submissions):
+        status = rng.choices(statuses, weights)[0]
+        status_counts[status] += 1
+        submission_id = f"fixture_submission_{idx}"
+        user_id = f"fixture_user_{rng.randrange(users)}"
+        created_at = now - timedelta(seconds=idx * 7)
+        proof_text = f"Fixture proof {idx}. " + "Completed the task. " * rng.randint(1, 40)
+        reviewed_at = None
+        if status == "pending":
+            if len(pending_ids) < 10_000:
+                pending_ids.append(submission_id)
+        else:
+            reviewed_at = (created_at + timedelta(hours=1)).isoformat()
+
+        await submission_writer.add(
             {
-                "reward_id": "reward_voucher_demo_1",
-                "user_id": voucher_user_id,
-                "submission_id": "submission_voucher_10",
-                "voucher_code": "OM-VOUCHER-DEMO-100PTS",
-                "status": "assigned",
-                "assigned_at": now.isoformat(),
-                "value": 10,
-                "currency": "GBP",
-                "retailer": "Tesco",
-                "expires_at": (now + timedelta(days=30)).isoformat(),
+                "id": submission_id,
+                "activity_id": f"fixture_activity_{rng.randrange(activities)}",
+                "user_id": user_id,
+                "proof_text": proof_text,
+                "proof_image_url": None,
+                "status": status,
+                "created_at": created_at.isoformat(),
+                "reviewed_at": reviewed_at,
+                "review_feedback": None if status == "pending" else "Fixture review.",
             }
         )
-        inserted["rewards"] += 1
+        if status == "approved":
+            await reward_writer.add(
+                {
+                    "reward_id": f"fixture_reward_{idx}",
+                    "user_id": user_id,
+                    "submission_id": submission_id,
+                    "voucher_code": f"OM-FIXTURE-{idx}",
+                    "status": "assigned",
+                    "assigned_at": reviewed_at,
+                }
+            )
+    inserted["submissions"] = await submission_writer.finish()
+    inserted["rewards"] = await reward_writer.finish()
 
-    return inserted
+    # Fixtures bypass the counter updates in the routers; let them rebuild on read.
+    await db.admin_stats.delete_many({})
+    await bump_versions(db, global_scope=True)
+    return {"inserted": inserted, "status_counts": status_counts, "pending_ids": pending_ids}
@@ -1,6 +1,95 @@
+import asyncio
 from datetime import datetime, timezone
+from typing import Protocol
 from uuid import uuid4
 
+from app.config import settings
+
+
+class CalendarProviderError(Exception):
+    pass
+
+
+class CalendarProvider(Protocol):
+    """Batch operations on one user's calendar. Each method is a single provider call."""
+
+    name: str
+
+    async def create_events(self, user_id: str, events: list[dict]) -> list[str]:
+        """Create the events and return their provider ids, in order."""
+        ...
+
+    async def update_events(self, user_id: str, events: list[dict]) -> None:
+        """Overwrite events; each carries its `provider_event_id`."""
+        ...
+
+    async def delete_events(self, user_id: str, provider_event_ids: list[str]) -> None: ...
+
+
+class FakeCalendarProvider:
+    """In-memory provider for local development, tests and benchmarks."""
+
+    name = "fake"
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.events: dict[str, dict[str, dict]] = {}
+        self.calls = {"create": 0, "update": 0, "delete": 0}
+        self.operations = {"create": 0, "update": 0, "delete": 0}
+
+    async def _call(self, kind: str, count: int) -> None:
+        self.calls[kind] += 1
+        self.operations[kind] += count
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+    async def create_events(self, user_id: str, events: list[dict]) -> list[str]:
+        await self._call("create", len(events))
+        calendar = self.events.setdefault(user_id, {})
+        ids = []
+        for event in events:
+            event_id = str(uuid4())
+            calendar[event_id] = dict(event)
+            ids.append(event_id)
+        return ids
+
+    async def update_events(self, user_id: str, events: list[dict]) -> None:
+        await self._call("update", len(events))
+        calendar = self.events.setdefault(user_id, {})
+        for event in events:
+            calendar[event["provider_event_id"]] = dict(event)
+
+    async def delete_events(self, user_id: str, provider_event_ids: list[str]) -> None:
+        await self._call("delete", len(provider_event_ids))
+        calendar = self.events.get(user_id, {})
+        for event_id in provider_event_ids:
+            calendar.pop(event_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "calls": dict(self.calls),
+            "operations": dict(self.operations),
+            "events": sum(len(calendar) for calendar in self.events.values()),
+        }
+
+
+CALENDAR_PROVIDERS = {"fake": FakeCalendarProvider}
+
+_provider: CalendarProvider | None = None
+
+
+def get_calendar_provider() -> CalendarProvider:
+    global _provider
+    if _provider is None:
+        provider_class = CALENDAR_PROVIDERS.get(settings.calendar_provider)
+        if provider_class is None:
+            raise RuntimeError(
+                f"CALENDAR_PROVIDER must be one of {sorted(CALENDAR_PROVIDERS)}, "
+                f"not {settings.calendar_provider!r}"
+            )
+        _provider = provider_class()
+    return _provider
+
 
 def create_calendar_event(user_id: str, title: str, start_iso: str, end_iso: str) -> dict:
     # Stub service; replace with Google Calendar integration.
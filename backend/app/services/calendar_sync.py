@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, time, timedelta, timezone
+
+from pymongo import DeleteOne, UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.config import settings
+from app.services.calendar_service import CalendarProvider, CalendarProviderError
+from app.services.recurrence_service import Recurrence, default_start, recurrence_rule_for
+
+logger = logging.getLogger(__name__)
+
+# Guards against a rule that would flood a calendar inside one window.
+MAX_OCCURRENCES_PER_ACTIVITY = 500
+ACTIVITY_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "title": 1,
+    "description": 1,
+    "assigned_to_user_id": 1,
+    "recurrence_text": 1,
+    "recurrence_rule": 1,
+    "created_at": 1,
+}
+
+
+def _parse_iso(value: str) -> datetime:
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _fingerprint(event: dict) -> str:
+    content = [event["title"], event["description"], event["start_iso"], event["end_iso"]]
+    encoded = json.dumps(content, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def _chunks(items: list, size: int):
+    for offset in range(0, len(items), size):
+        yield items[offset : offset + size]
+
+
+def expand_activity(activity: dict, window_start: datetime, window_end: datetime) -> list[dict]:
+    """The activity's occurrences inside the window, as calendar events with fingerprints."""
+    rrule = activity.get("recurrence_rule") or recurrence_rule_for(activity.get("recurrence_text"))
+    if not rrule:
+        return []
+    try:
+        rule = Recurrence.from_rrule(rrule)
+    except ValueError:
+        logger.warning("Activity %s has an unsupported RRULE: %s", activity["id"], rrule)
+        return []
+
+    # DTSTART is fixed at creation so INTERVAL>1 rules keep their phase as the window rolls.
+    created_at = activity.get("created_at")
+    dtstart = default_start(_parse_iso(created_at) if created_at else window_start)
+    duration = timedelta(minutes=settings.calendar_sync_event_minutes)
+    events = []
+    for start in rule.occurrences(
+        dtstart, after=window_start, limit=MAX_OCCURRENCES_PER_ACTIVITY, before=window_end
+    ):
+        event = {
+            "key": f"{activity['id']}:{start.isoformat()}",
+            "activity_id": activity["id"],
+            "title": activity.get("title", ""),
+            "description": activity.get("description") or "",
+            "start_iso": start.isoformat(),
+            "end_iso": (start + duration).isoformat(),
+        }
+        event["fingerprint"] = _fingerprint(event)
+        events.append(event)
+    return events
+
+
+def diff_events(desired: list[dict], synced: list[dict]) -> tuple[list, list, list]:
+    """Split into (creates, updates, deletes) against previously synced events."""
+    synced_by_key = {event["key"]: event for event in synced}
+    creates, updates = [], []
+    for event in desired:
+        current = synced_by_key.pop(event["key"], None)
+        if current is None:
+            creates.append(event)
+        elif current["fingerprint"] != event["fingerprint"]:
+            updates.append({**event, "provider_event_id": current["provider_event_id"]})
+    return creates, updates, list(synced_by_key.values())
+
+
+def _provider_event(event: dict) -> dict:
+    return {key: value for key, value in event.items() if key != "fingerprint"}
+
+
+async def _push_user(
+    provider: CalendarProvider,
+    user_id: str,
+    changes: tuple[list, list, list],
+    synced_at: str,
+    report: dict,
+) -> list:
+    """Send one user's changes to the provider in batches and return the matching
+    calendar_events writes. Stops at the first provider error; what was already sent is
+    still recorded, and the rest is picked up by the next sync."""
+    creates, updates, deletes = changes
+    batch_size = settings.calendar_sync_batch_size
+    writes: list = []
+    try:
+        for chunk in _chunks(deletes, batch_size):
+            report["provider_calls"] += 1
+            await provider.delete_events(user_id, [event["provider_event_id"] for event in chunk])
+            writes += [DeleteOne({"user_id": user_id, "key": event["key"]}) for event in chunk]
+            report["deleted"] += len(chunk)
+        for chunk in _chunks(updates, batch_size):
+            report["provider_calls"] += 1
+            await provider.update_events(user_id, [_provider_event(event) for event in chunk])
+            writes += [
+                UpdateOne(
+                    {"user_id": user_id, "key": event["key"]},
+                    {"$set": {**event, "synced_at": synced_at}},
+                )
+                for event in chunk
+            ]
+            report["updated"] += len(chunk)
+        for chunk in _chunks(creates, batch_size):
+            report["provider_calls"] += 1
+            provider_ids = await provider.create_events(
+                user_id, [_provider_event(event) for event in chunk]
+            )
+            writes += [
+                UpdateOne(
+                    {"user_id": user_id, "key": event["key"]},
+                    {
+                        "$set": {
+                            **event,
+                            "user_id": user_id,
+                            "provider": provider.name,
+                            "provider_event_id": provider_id,
+                            "synced_at": synced_at,
+                        }
+                    },
+                    upsert=True,
+                )
+                for event, provider_id in zip(chunk, provider_ids)
+            ]
+            report["created"] += len(chunk)
+    except CalendarProviderError as exc:
+        logger.warning("Calendar sync for %s stopped: %s", user_id, exc)
+        report["errors"].append({"user_id": user_id, "error": str(exc)})
+    return writes
+
+
+async def _candidate_users(db: AsyncDatabase, window_start_iso: str) -> list[str]:
+    with_activities = await db.activities.distinct(
+        "assigned_to_user_id", {"assigned_to_user_id": {"$ne": None}}
+    )
+    # Users whose activities are gone still need their upcoming events deleted.
+    with_events = await db.calendar_events.distinct(
+        "user_id", {"start_iso": {"$gte": window_start_iso}}
+    )
+    return sorted(set(with_activities) | set(with_events))
+
+
+async def sync_calendars(
+    db: AsyncDatabase,
+    provider: CalendarProvider,
+    user_ids: list[str] | None = None,
+    dry_run: bool = False,
+    now: datetime | None = None,
+) -> dict:
+    """
+    Expand every assigned activity over the rolling window and push only what changed
+    since the last sync. Users whose events all match their stored fingerprints cost two
+    batched reads and no provider calls.
+    """
+    window_start = now or datetime.now(timezone.utc)
+    # The window ends at a UTC midnight, so it only grows once a day: repeated syncs on the
+    # same day find nothing new at its far end.
+    last_day = (window_start + timedelta(days=settings.calendar_sync_window_days)).date()
+    window_end = datetime.combine(last_day, time.min, tzinfo=timezone.utc)
+    window_start_iso = window_start.isoformat()
+    report: dict = {
+        "window_start": window_start_iso,
+        "window_end": window_end.isoformat(),
+        "dry_run": dry_run,
+        "users": 0,
+        "users_changed": 0,
+        "created": 0,
+        "updated": 0,
+        "deleted": 0,
+        "unchanged": 0,
+        "provider_calls": 0,
+        "errors": [],
+    }
+    if user_ids is None:
+        user_ids = await _candidate_users(db, window_start_iso)
+    semaphore = asyncio.Semaphore(settings.calendar_sync_concurrency)
+
+    async def push(user_id: str, changes: tuple) -> list:
+        async with semaphore:
+            return await _push_user(provider, user_id, changes, window_start_iso, report)
+
+    for chunk in _chunks(user_ids, settings.calendar_sync_user_batch_size):
+        activities_by_user: dict[str, list[dict]] = {user_id: [] for user_id in chunk}
+        async for activity in db.activities.find(
+            {"assigned_to_user_id": {"$in": chunk}}, ACTIVITY_PROJECTION
+        ):
+            activities_by_user[activity["assigned_to_user_id"]].append(activity)
+        synced_by_user: dict[str, list[dict]] = {user_id: [] for user_id in chunk}
+        async for event in db.calendar_events.find(
+            {"user_id": {"$in": chunk}, "start_iso": {"$gte": window_start_iso}},
+            {"_id": 0, "user_id": 1, "key": 1, "fingerprint": 1, "provider_event_id": 1},
+        ):
+            synced_by_user[event["user_id"]].append(event)
+
+        changed: dict[str, tuple] = {}
+        for user_id in chunk:
+            desired = [
+                event
+                for activity in activities_by_user[user_id]
+                for event in expand_activity(activity, window_start, window_end)
+            ]
+            creates, updates, deletes = diff_events(desired, synced_by_user[user_id])
+            report["users"] += 1
+            report["unchanged"] += len(desired) - len(creates) - len(updates)
+            if creates or updates or deletes:
+                changed[user_id] = (creates, updates, deletes)
+        report["users_changed"] += len(changed)
+
+        if dry_run:
+            for creates, updates, deletes in changed.values():
+                report["created"] += len(creates)
+                report["updated"] += len(updates)
+                report["deleted"] += len(deletes)
+            continue
+        results = await asyncio.gather(
+            *(push(user_id, changes) for user_id, changes in changed.items())
+        )
+        writes = [write for user_writes in results for write in user_writes]
+        if writes:
+            await db.calendar_events.bulk_write(writes, ordered=False)
+    return report
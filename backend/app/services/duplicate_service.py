@@ -0,0 +1,262 @@
+import asyncio
+import hashlib
+import logging
+import re
+import struct
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import PyMongoError
+
+from app.config import settings
+from app.services.version_service import bump_versions
+
+logger = logging.getLogger(__name__)
+
+NUM_HASHES = 64
+# 16 bands of 4 values: pairs at Jaccard 0.7 share a band with probability ~0.99, pairs at
+# 0.3 with ~0.12, so candidates stay few and are then checked against the full signature.
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+SHINGLE_CHARS = 5
+EMPTY_BIN = 1 << 32
+SYNC_OVERLAP = timedelta(seconds=60)
+_WORD = re.compile(r"[a-z0-9]+")
+_SIGNATURE = struct.Struct(f"<{NUM_HASHES}I")
+
+
+def minhash(text: str) -> bytes | None:
+    """
+    MinHash signature of the text's character 5-grams, or None when the text is too short
+    (`DUPLICATE_MIN_WORDS`) for a match to mean anything. One-permutation hashing: each
+    shingle is hashed once into one of 64 bins; empty bins borrow from the next filled one.
+    """
+    words = _WORD.findall(text.lower())
+    normalised = " ".join(words).encode()
+    if len(words) < settings.duplicate_min_words or len(normalised) < SHINGLE_CHARS:
+        return None
+    bins = [EMPTY_BIN] * NUM_HASHES
+    shingles = {
+        normalised[idx : idx + SHINGLE_CHARS]
+        for idx in range(len(normalised) - SHINGLE_CHARS + 1)
+    }
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        slot, value = value % NUM_HASHES, value >> 32
+        if value < bins[slot]:
+            bins[slot] = value
+    original = list(bins)
+    for slot in range(NUM_HASHES):
+        if original[slot] != EMPTY_BIN:
+            continue
+        distance = 1
+        while original[(slot + distance) % NUM_HASHES] == EMPTY_BIN:
+            distance += 1
+        donor = original[(slot + distance) % NUM_HASHES]
+        bins[slot] = (donor + distance * 0x9E3779B1) & 0xFFFFFFFF
+    return _SIGNATURE.pack(*bins)
+
+
+def similarity(left: bytes, right: bytes) -> float:
+    """Estimated Jaccard similarity: the share of bins holding the same minimum."""
+    equal = sum(a == b for a, b in zip(_SIGNATURE.unpack(left), _SIGNATURE.unpack(right)))
+    return equal / NUM_HASHES
+
+
+def _band_keys(signature: bytes) -> list[int]:
+    width = ROWS * 4
+    return [hash(signature[band * width : (band + 1) * width]) for band in range(BANDS)]
+
+
+class DuplicateIndex:
+    """
+    In-memory LSH index over the `proof_minhash` signatures of submissions created in the
+    last `DUPLICATE_WINDOW_DAYS`. A lookup reads one bucket per band and compares only the
+    signatures found there. Each process loads the window once, then polls for submissions
+    created elsewhere, like the token revocation set, and drops those that age out.
+    """
+
+    def __init__(self):
+        # Most buckets hold a single submission, stored as the bare id to save a list each.
+        self._bands: list[dict[int, str | list[str]]] = [{} for _ in range(BANDS)]
+        self._signatures: dict[str, bytes] = {}
+        # (created_at, id) in the order added, which is creation order give or take a sync.
+        self._added: deque[tuple[str, str]] = deque()
+        self._synced_until: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, submission_id: str, signature: bytes, created_at: str) -> None:
+        if submission_id in self._signatures:
+            return
+        self._signatures[submission_id] = signature
+        self._added.append((created_at, submission_id))
+        for band, key in zip(self._bands, _band_keys(signature)):
+            bucket = band.get(key)
+            if bucket is None:
+                band[key] = submission_id
+            elif isinstance(bucket, str):
+                band[key] = [bucket, submission_id]
+            else:
+                bucket.append(submission_id)
+
+    def _remove(self, submission_id: str) -> None:
+        signature = self._signatures.pop(submission_id)
+        for band, key in zip(self._bands, _band_keys(signature)):
+            bucket = band[key]
+            if isinstance(bucket, str):
+                del band[key]
+                continue
+            bucket.remove(submission_id)
+            if len(bucket) == 1:
+                band[key] = bucket[0]
+
+    def evict(self, before: str) -> int:
+        """Drop submissions created before `before` (an ISO timestamp); returns how many."""
+        evicted = 0
+        while self._added and self._added[0][0] < before:
+            _, submission_id = self._added.popleft()
+            self._remove(submission_id)
+            evicted += 1
+        return evicted
+
+    def matches(self, signature: bytes) -> list[str]:
+        """Ids of indexed submissions at DUPLICATE_MIN_SIMILARITY or above, closest first."""
+        candidates: set[str] = set()
+        for band, key in zip(self._bands, _band_keys(signature)):
+            bucket = band.get(key)
+            if isinstance(bucket, str):
+                candidates.add(bucket)
+            elif bucket:
+                candidates.update(bucket)
+        scored = [
+            (similarity(signature, self._signatures[submission_id]), submission_id)
+            for submission_id in candidates
+        ]
+        ranked = sorted(
+            (item for item in scored if item[0] >= settings.duplicate_min_similarity),
+            reverse=True,
+        )
+        return [submission_id for _, submission_id in ranked[: settings.duplicate_max_matches]]
+
+    async def sync(self, db: AsyncDatabase) -> int:
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(days=settings.duplicate_window_days)
+        if self._synced_until is not None:
+            since = max(since, self._synced_until - SYNC_OVERLAP)
+        query = {"proof_minhash": {"$ne": None}, "created_at": {"$gte": since.isoformat()}}
+        projection = {"_id": 0, "id": 1, "proof_minhash": 1, "created_at": 1}
+        loaded = 0
+        async for row in db.submissions.find(query, projection).sort("created_at", 1):
+            self.add(row["id"], bytes(row["proof_minhash"]), row["created_at"])
+            loaded += 1
+        self.evict((now - timedelta(days=settings.duplicate_window_days)).isoformat())
+        self._synced_until = now
+        return loaded
+
+    async def _sync_forever(self, db: AsyncDatabase, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.sync(db)
+            except PyMongoError:
+                logger.warning("Duplicate index sync failed", exc_info=True)
+            await asyncio.sleep(interval_seconds)
+
+    async def start(self, db: AsyncDatabase, interval_seconds: float) -> None:
+        # The first full load runs in the background; until it finishes matches are partial.
+        self._task = asyncio.create_task(self._sync_forever(db, interval_seconds))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "submissions": len(self._signatures),
+            "window_days": settings.duplicate_window_days,
+            "oldest": self._added[0][0] if self._added else None,
+            "buckets": sum(len(band) for band in self._bands),
+            "largest_bucket": max(
+                (
+                    1 if isinstance(bucket, str) else len(bucket)
+                    for band in self._bands
+                    for bucket in band.values()
+                ),
+                default=0,
+            ),
+            "synced_until": self._synced_until.isoformat() if self._synced_until else None,
+        }
+
+
+duplicates = DuplicateIndex()
+
+
+def check_duplicates(proof_text: str, index: DuplicateIndex = duplicates) -> dict:
+    """
+    Fields to store on a new submission. The index is not changed: once the submission is
+    saved, `index_submission` adds it, so a failed insert leaves no phantom match behind.
+    """
+    signature = minhash(proof_text)
+    if signature is None:
+        return {"proof_minhash": None, "possible_duplicate": False, "duplicate_of": []}
+    duplicate_of = index.matches(signature)
+    return {
+        "proof_minhash": signature,
+        "possible_duplicate": bool(duplicate_of),
+        "duplicate_of": duplicate_of,
+    }
+
+
+def index_submission(submission: dict, index: DuplicateIndex = duplicates) -> None:
+    if submission.get("proof_minhash"):
+        index.add(submission["id"], submission["proof_minhash"], submission["created_at"])
+
+
+async def backfill_fingerprints(
+    db: AsyncDatabase, dry_run: bool = False, batch_size: int = 1000
+) -> dict:
+    """
+    Fingerprint and flag submissions created before duplicate detection, oldest first.
+    Each is compared with the earlier ones inside the window, held in an index of its own
+    that slides along with the rows, so memory stays bounded however old the data is.
+    """
+    index = DuplicateIndex()
+    window = timedelta(days=settings.duplicate_window_days)
+    report = {"submissions": 0, "fingerprinted": 0, "flagged": 0, "dry_run": dry_run}
+    writes: list = []
+    user_ids: set[str] = set()
+
+    async def flush() -> None:
+        if writes and not dry_run:
+            await db.submissions.bulk_write(writes, ordered=False)
+            await bump_versions(db, user_ids)
+        writes.clear()
+        user_ids.clear()
+
+    cursor = db.submissions.find(
+        {"proof_minhash": {"$exists": False}},
+        {"_id": 0, "id": 1, "user_id": 1, "proof_text": 1, "created_at": 1},
+    ).sort([("created_at", 1), ("id", 1)])
+    async for row in cursor:
+        index.evict((datetime.fromisoformat(row["created_at"]) - window).isoformat())
+        fields = check_duplicates(row.get("proof_text") or "", index)
+        index_submission({**row, **fields}, index)
+        report["submissions"] += 1
+        report["fingerprinted"] += fields["proof_minhash"] is not None
+        report["flagged"] += fields["possible_duplicate"]
+        writes.append(UpdateOne({"id": row["id"]}, {"$set": fields}))
+        user_ids.add(row["user_id"])
+        if len(writes) >= batch_size:
+            await flush()
+    await flush()
+    return report
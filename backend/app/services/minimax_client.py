@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+
+import httpx
+
+from app.config import settings
+from app.metrics import Counter, REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETION_PATH = "/v1/text/chatcompletion_v2"
+# 4xx other than these mean a bad request from us, not an unhealthy provider.
+UNHEALTHY_STATUS_CODES = {408, 429}
+
+minimax_calls_total = Counter(
+    "ownmerits_minimax_calls_total",
+    "MiniMax chat completions by outcome (ok, error, short_circuited, queue_timeout, "
+    "coalesced).",
+    ("outcome",),
+)
+REGISTRY.append(minimax_calls_total)
+
+
+class MiniMaxUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_seconds`; then lets a single probe through and closes again if it succeeds."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._probing or self.consecutive_failures >= self.failure_threshold:
+            if self.opened_at is None or self._probing:
+                logger.warning(
+                    "MiniMax circuit opened after %d failures", self.consecutive_failures
+                )
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class MiniMaxClient:
+    """Shared keep-alive client for MiniMax chat completions.
+
+    A call waits at most `queue_timeout_seconds` for one of `max_connections` slots and
+    then has `timeout_seconds` for the request itself; only provider errors and request
+    timeouts count towards the circuit, so a saturated queue never opens it. Identical
+    prompts already in flight are coalesced onto one upstream request, and an open circuit
+    fails calls immediately so callers can fall back without waiting on a sick provider.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        timeout_seconds: float,
+        connect_timeout_seconds: float,
+        max_connections: int,
+        failure_threshold: int,
+        reset_seconds: float,
+        queue_timeout_seconds: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+        self._slots = asyncio.Semaphore(max_connections)
+        self._in_flight: dict[tuple, asyncio.Task] = {}
+
+    async def chat(self, system_prompt: str, text: str, temperature: float = 0.0) -> str:
+        key = (system_prompt, text, temperature)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._complete(system_prompt, text, temperature))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            minimax_calls_total.inc("coalesced")
+        # Shielded so one caller giving up does not cancel the call for the others.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: tuple, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled.
+            task.exception()
+
+    async def _complete(self, system_prompt: str, text: str, temperature: float) -> str:
+        if self.breaker.state == "open":
+            minimax_calls_total.inc("short_circuited")
+            raise MiniMaxUnavailable("MiniMax circuit is open")
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout_seconds)
+        except asyncio.TimeoutError as exc:
+            # Our own backlog, not the provider's health: the breaker is left alone.
+            minimax_calls_total.inc("queue_timeout")
+            raise MiniMaxUnavailable("No MiniMax connection slot became free") from exc
+        try:
+            return await self._call(system_prompt, text, temperature)
+        finally:
+            self._slots.release()
+
+    async def _call(self, system_prompt: str, text: str, temperature: float) -> str:
+        # Asked only once a slot is held, so a half-open probe is always sent at once.
+        if not self.breaker.allow():
+            minimax_calls_total.inc("short_circuited")
+            raise MiniMaxUnavailable("MiniMax circuit is open")
+        try:
+            content = await asyncio.wait_for(
+                self._post(system_prompt, text, temperature), timeout=self.timeout_seconds
+            )
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
+            if status >= 500 or status in UNHEALTHY_STATUS_CODES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            minimax_calls_total.inc("error")
+            raise MiniMaxUnavailable(f"MiniMax returned HTTP {status}") from exc
+        except (asyncio.TimeoutError, httpx.HTTPError, ValueError, KeyError, TypeError) as exc:
+            self.breaker.record_failure()
+            minimax_calls_total.inc("error")
+            raise MiniMaxUnavailable(f"MiniMax call failed: {type(exc).__name__}") from exc
+        self.breaker.record_success()
+        minimax_calls_total.inc("ok")
+        return content
+
+    async def _post(self, system_prompt: str, text: str, temperature: float) -> str:
+        response = await self._client.post(
+            CHAT_COMPLETION_PATH,
+            json={
+                "model": self.model,
+                "temperature": temperature,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text},
+                ],
+            },
+        )
+        response.raise_for_status()
+        choices = response.json()["choices"]
+        if not choices:
+            raise ValueError("MiniMax returned no choices")
+        return str(choices[0]["message"]["content"]).strip()
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "in_flight": len(self._in_flight),
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_client: MiniMaxClient | None = None
+
+
+def get_minimax_client() -> MiniMaxClient:
+    global _client
+    if _client is None:
+        _client = MiniMaxClient(
+            base_url=settings.minimax_base_url,
+            api_key=settings.minimax_api_key,
+            model=settings.minimax_model,
+            timeout_seconds=settings.minimax_timeout_seconds,
+            connect_timeout_seconds=settings.minimax_connect_timeout_seconds,
+            max_connections=settings.minimax_max_concurrency,
+            failure_threshold=settings.minimax_breaker_failure_threshold,
+            reset_seconds=settings.minimax_breaker_reset_seconds,
+            queue_timeout_seconds=settings.minimax_queue_timeout_seconds,
+        )
+    return _client
+
+
+def minimax_client_stats() -> dict | None:
+    return _client.stats() if _client is not None else None
+
+
+async def close_minimax_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,28 +1,138 @@
+import asyncio
+import logging
+import re
+
+from app.cache import TTLCache
 from app.config import settings
 from app.schemas import ReminderRequest, ReminderResponse
+from app.services.minimax_client import MiniMaxUnavailable, get_minimax_client
 
+logger = logging.getLogger(__name__)
+
+FALLBACK_MODEL = "fallback-template"
+
+REMINDER_PROMPT = (
+    "Write one short, encouraging reminder (at most two sentences) about the user's next "
+    "life-improving activity. Be warm and specific, never guilt-trip, and do not invent "
+    "details that are not given."
+)
+
+RECURRENCE_PROMPT = (
+    "Convert the user's description of how often an activity repeats into one RFC 5545 "
+    "RRULE using only FREQ (DAILY, WEEKLY, MONTHLY or YEARLY), INTERVAL, BYDAY, BYMONTHDAY, "
+    "BYHOUR, BYMINUTE, COUNT and UNTIL. Reply with the RRULE only, or NONE if the text does "
+    "not describe a schedule."
+)
+
+
+# Generated messages by (activity_title, due_label, last_completion_days_ago); the
+# message does not depend on who receives it, so a campaign mostly hits this cache.
+reminder_cache = TTLCache(
+    max_entries=settings.reminder_cache_size, ttl_seconds=settings.reminder_cache_ttl_seconds
+)
 
-def generate_reminder(payload: ReminderRequest) -> ReminderResponse:
-    # Hackathon-safe fallback. Replace with real MiniMax API call.
-    if not settings.minimax_api_key:
-        friendly = (
-            f"Quick nudge: {payload.activity_title} is coming up ({payload.due_label}). "
-            "You are building great momentum one step at a time."
-        )
-        return ReminderResponse(message=friendly, model_used="fallback-template")
 
+def reminder_key(payload: ReminderRequest) -> tuple:
+    return (payload.activity_title, payload.due_label, payload.last_completion_days_ago)
+
+
+def fallback_reminder(payload: ReminderRequest) -> ReminderResponse:
     friendly = (
-        f"Hi! Your next step is {payload.activity_title} ({payload.due_label}). "
-        "Small progress counts and we are cheering you on."
+        f"Quick nudge: {payload.activity_title} is coming up ({payload.due_label}). "
+        "You are building great momentum one step at a time."
     )
-    return ReminderResponse(message=friendly, model_used=settings.minimax_model)
+    return ReminderResponse(message=friendly, model_used=FALLBACK_MODEL)
 
 
-def parse_recurrence_text(text: str) -> dict:
-    # Minimal parser placeholder to keep API contract ready.
-    lowered = text.lower()
-    return {
-        "raw_text": text,
-        "frequency": "weekly" if "week" in lowered else "custom",
-        "notes": "Replace with MiniMax structured extraction in next iteration.",
+def _reminder_prompt(payload: ReminderRequest) -> str:
+    days = payload.last_completion_days_ago
+    return (
+        f"Activity: {payload.activity_title}\n"
+        f"Due: {payload.due_label}\n"
+        f"Days since last completed activity: {'unknown' if days is None else days}"
+    )
+
+
+async def _generate_uncached(payloads: list[ReminderRequest]) -> list[ReminderResponse]:
+    if not settings.minimax_api_key:
+        return [fallback_reminder(payload) for payload in payloads]
+
+    client = get_minimax_client()
+    # At most as many calls in flight as the client has slots, so a large batch never
+    # waits out the client's queue timeout and falls back while MiniMax is healthy.
+    semaphore = asyncio.Semaphore(settings.minimax_max_concurrency)
+
+    async def generate(payload: ReminderRequest) -> ReminderResponse:
+        try:
+            async with semaphore:
+                message = await client.chat(
+                    REMINDER_PROMPT, _reminder_prompt(payload), temperature=0.7
+                )
+        except MiniMaxUnavailable as exc:
+            logger.warning("Falling back to the reminder template: %s", exc)
+            return fallback_reminder(payload)
+        if not message:
+            return fallback_reminder(payload)
+        return ReminderResponse(message=message, model_used=settings.minimax_model)
+
+    return list(await asyncio.gather(*(generate(payload) for payload in payloads)))
+
+
+async def generate_reminder_batch(payloads: list[ReminderRequest]) -> dict:
+    """Generate a message per payload, each distinct input once; cached messages are
+    reused and only the rest go to the model."""
+    keys = [reminder_key(payload) for payload in payloads]
+    messages: dict[tuple, ReminderResponse] = {}
+    missing: dict[tuple, ReminderRequest] = {}
+    for key, payload in zip(keys, payloads):
+        if key in messages or key in missing:
+            continue
+        cached = reminder_cache.get(key)
+        if cached is None:
+            missing[key] = payload
+        else:
+            messages[key] = cached
+
+    summary = {
+        "requested": len(payloads),
+        "unique": len(messages) + len(missing),
+        "cache_hits": len(messages),
+        "generated": 0,
+        "fallbacks": 0,
     }
+    for key, response in zip(missing, await _generate_uncached(list(missing.values()))):
+        messages[key] = response
+        if response.model_used == FALLBACK_MODEL:
+            summary["fallbacks"] += 1
+        else:
+            # Fallbacks are not cached, so a MiniMax outage is not pinned for the TTL.
+            reminder_cache.set(key, response)
+            summary["generated"] += 1
+
+    return {"results": [messages[key] for key in keys], "summary": summary}
+
+
+async def generate_reminder(payload: ReminderRequest) -> ReminderResponse:
+    return (await generate_reminder_batch([payload]))["results"][0]
+
+
+async def extract_recurrence_rules(texts: list[str]) -> dict[str, str | None]:
+    """Ask the model for an RRULE per text; None where it gives no usable answer."""
+    if not settings.minimax_api_key or not texts:
+        return {text: None for text in texts}
+
+    client = get_minimax_client()
+    semaphore = asyncio.Semaphore(settings.recurrence_llm_max_concurrency)
+
+    async def extract(text: str) -> str | None:
+        async with semaphore:
+            try:
+                content = await client.chat(RECURRENCE_PROMPT, text, temperature=0)
+            except MiniMaxUnavailable as exc:
+                logger.warning("MiniMax recurrence extraction failed: %s", exc)
+                return None
+        match = re.search(r"FREQ=[A-Z0-9=;,\-]+", content.upper())
+        return match.group(0) if match else None
+
+    rules = await asyncio.gather(*(extract(text) for text in texts))
+    return dict(zip(texts, rules))
@@ -0,0 +1,211 @@
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+
+from app.services.version_service import bump_versions
+
+SUBMISSION_STATUSES = ("pending", "approved", "rejected")
+REBUILD_BATCH_SIZE = 1000
+# Bookkeeping fields on user_progress documents, never returned as counts.
+COUNTER_META_FIELDS = ("writes", "in_flight", "stale")
+# No submission write is in flight; `in_flight` is missing on documents never written.
+NO_WRITES_IN_FLIGHT = {"$not": {"$gt": 0}}
+
+
+def _empty_counts() -> dict:
+    return {"total": 0, **{status: 0 for status in SUBMISSION_STATUSES}}
+
+
+def begin_write() -> dict:
+    # Applied before the submission write. A recount that reads the document while
+    # `in_flight` is up, or that read it before `writes` moved, cannot store its result,
+    # so a count that already includes the write is never stored under its deltas.
+    # Upserted: a document created here holds no counts and is stale until recounted.
+    return {"$inc": {"in_flight": 1, "writes": 1}, "$setOnInsert": {"stale": True}}
+
+
+def end_write(deltas: dict[str, int] | None) -> dict:
+    # None when the write failed part-way and may or may not have landed: the next
+    # read recounts instead of trusting the stored counts.
+    if deltas is None:
+        return {"$inc": {"in_flight": -1}, "$set": {"stale": True}}
+    return {"$inc": {**deltas, "in_flight": -1}, "$setOnInsert": {"stale": True}}
+
+
+@asynccontextmanager
+async def progress_writes(
+    db: AsyncDatabase, user_ids: Iterable[str]
+) -> AsyncIterator[dict[str, dict[str, int]]]:
+    """
+    Fence the users' counters around a write to their submissions.
+
+    Yields a dict the caller fills with counter deltas by user id as its writes land;
+    they are applied on exit. If the block raises, users without deltas are marked
+    stale, since their write may or may not have landed.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        yield {}
+        return
+    await db.user_progress.bulk_write(
+        [UpdateOne({"user_id": user_id}, begin_write(), upsert=True) for user_id in user_ids],
+        ordered=False,
+    )
+    deltas: dict[str, dict[str, int]] = {}
+    failed = True
+    try:
+        yield deltas
+        failed = False
+    finally:
+        await db.user_progress.bulk_write(
+            [
+                UpdateOne(
+                    {"user_id": user_id},
+                    end_write(deltas.get(user_id, None if failed else {})),
+                    upsert=True,
+                )
+                for user_id in user_ids
+            ],
+            ordered=False,
+        )
+
+
+def record_submission_created(
+    deltas: dict[str, dict[str, int]], user_id: str, status: str = "pending"
+) -> None:
+    user_deltas = deltas.setdefault(user_id, {})
+    for field in ("total", status):
+        user_deltas[field] = user_deltas.get(field, 0) + 1
+
+
+def record_status_change(
+    deltas: dict[str, dict[str, int]], user_id: str, old_status: str, new_status: str
+) -> None:
+    user_deltas = deltas.setdefault(user_id, {})
+    if old_status == new_status:
+        return
+    user_deltas[old_status] = user_deltas.get(old_status, 0) - 1
+    user_deltas[new_status] = user_deltas.get(new_status, 0) + 1
+
+
+async def aggregate_progress_counts(db: AsyncDatabase, user_id: str) -> dict:
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]
+    counts = _empty_counts()
+    async for row in await db.submissions.aggregate(pipeline):
+        counts["total"] += row["count"]
+        if row["_id"] in SUBMISSION_STATUSES:
+            counts[row["_id"]] = row["count"]
+    return counts
+
+
+async def get_progress_counts(db: AsyncDatabase, user_id: str) -> dict:
+    stored = await db.user_progress.find_one({"user_id": user_id}, {"_id": 0, "user_id": 0})
+    if stored is not None and not stored.get("stale"):
+        for field in COUNTER_META_FIELDS:
+            stored.pop(field, None)
+        return stored
+
+    # Missing, or stale: recount, and store the result only if no write was in flight
+    # and none began meanwhile (same `writes`); otherwise the next read tries again.
+    writes = stored.get("writes") if stored else None
+    counts = await aggregate_progress_counts(db, user_id)
+    try:
+        await db.user_progress.update_one(
+            {
+                "user_id": user_id,
+                "writes": writes if writes is not None else {"$exists": False},
+                "in_flight": NO_WRITES_IN_FLIGHT,
+            },
+            {"$set": {**counts, "stale": False}},
+            upsert=stored is None,
+        )
+    except DuplicateKeyError:
+        # A write or a concurrent read created the document first.
+        pass
+    return counts
+
+
+async def _flush_rebuild_batch(
+    db: AsyncDatabase, expected: dict[str, dict], dry_run: bool, report: dict
+) -> None:
+    stored_docs = await db.user_progress.find(
+        {"user_id": {"$in": list(expected)}}, {"_id": 0}
+    ).to_list()
+    stored_by_user = {doc.pop("user_id"): doc for doc in stored_docs}
+
+    writes = []
+    for user_id, counts in expected.items():
+        stored = stored_by_user.get(user_id)
+        if (
+            stored is not None
+            and not stored.get("stale")
+            and all(stored.get(k, 0) == v for k, v in counts.items())
+        ):
+            continue
+        report["drift"].append({"user_id": user_id, "stored": stored, "expected": counts})
+        # $set rather than a replace, so the fence of a write in flight survives.
+        writes.append(
+            UpdateOne({"user_id": user_id}, {"$set": {**counts, "stale": False}}, upsert=True)
+        )
+
+    if writes and not dry_run:
+        await db.user_progress.bulk_write(writes, ordered=False)
+
+
+async def rebuild_progress_counters(db: AsyncDatabase, dry_run: bool = False) -> dict:
+    """
+    Recompute every user's counters from the submissions collection and
+    overwrite any stored document that drifted. Returns the drift found.
+    """
+    report: dict = {"users_checked": 0, "drift": [], "dry_run": dry_run}
+    pipeline = [
+        {"$group": {"_id": {"user_id": "$user_id", "status": "$status"}, "count": {"$sum": 1}}},
+        {
+            "$group": {
+                "_id": "$_id.user_id",
+                "statuses": {"$push": {"k": "$_id.status", "v": "$count"}},
+            }
+        },
+    ]
+
+    seen_users: set[str] = set()
+    batch: dict[str, dict] = {}
+    async for row in await db.submissions.aggregate(pipeline, allowDiskUse=True):
+        counts = _empty_counts()
+        for entry in row["statuses"]:
+            counts["total"] += entry["v"]
+            if entry["k"] in SUBMISSION_STATUSES:
+                counts[entry["k"]] = entry["v"]
+        batch[row["_id"]] = counts
+        seen_users.add(row["_id"])
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            await _flush_rebuild_batch(db, batch, dry_run, report)
+            report["users_checked"] += len(batch)
+            batch = {}
+    if batch:
+        await _flush_rebuild_batch(db, batch, dry_run, report)
+        report["users_checked"] += len(batch)
+
+    # Counters left behind for users who no longer have any submissions.
+    orphaned = []
+    orphan_query = {"$or": [{"total": {"$ne": 0}}, {"stale": True}]}
+    async for doc in db.user_progress.find(orphan_query, {"_id": 0}):
+        if doc["user_id"] not in seen_users:
+            orphaned.append(doc["user_id"])
+            report["drift"].append(
+                {"user_id": doc["user_id"], "stored": doc, "expected": _empty_counts()}
+            )
+    if orphaned and not dry_run:
+        await db.user_progress.update_many(
+            {"user_id": {"$in": orphaned}}, {"$set": {**_empty_counts(), "stale": False}}
+        )
+    report["users_checked"] += len(orphaned)
+    if not dry_run:
+        await bump_versions(db, [entry["user_id"] for entry in report["drift"]])
+    return report
@@ -0,0 +1,575 @@
+import calendar
+import logging
+import re
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.cache import TTLCache
+from app.config import settings
+from app.services.minimax_service import extract_recurrence_rules
+from app.services.version_service import bump_versions
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+WEEKDAY_NAMES = {
+    "mon": "MO", "monday": "MO",
+    "tue": "TU", "tues": "TU", "tuesday": "TU",
+    "wed": "WE", "weds": "WE", "wednesday": "WE",
+    "thu": "TH", "thur": "TH", "thurs": "TH", "thursday": "TH",
+    "fri": "FR", "friday": "FR",
+    "sat": "SA", "saturday": "SA",
+    "sun": "SU", "sunday": "SU",
+}  # fmt: skip
+NUMBER_WORDS = {
+    "once": 1, "one": 1, "a": 1, "an": 1,
+    "twice": 2, "two": 2, "other": 2,
+    "thrice": 3, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}  # fmt: skip
+ORDINALS = {
+    "first": 1, "1st": 1, "second": 2, "2nd": 2, "third": 3, "3rd": 3,
+    "fourth": 4, "4th": 4, "last": -1,
+}  # fmt: skip
+WEEKDAY_ALTERNATION = "|".join(sorted(WEEKDAY_NAMES, key=len, reverse=True))
+UNIT_FREQ = {"day": "DAILY", "week": "WEEKLY", "month": "MONTHLY", "year": "YEARLY"}
+# "Twice a week" names no days, so occurrences are spread over the period.
+SPREAD_WEEKDAYS = {
+    2: ("MO", "TH"),
+    3: ("MO", "WE", "FR"),
+    4: ("MO", "TU", "TH", "FR"),
+    5: ("MO", "TU", "WE", "TH", "FR"),
+    6: ("MO", "TU", "WE", "TH", "FR", "SA"),
+}
+SPREAD_HOURS = {2: (9, 18), 3: (9, 13, 18), 4: (9, 12, 15, 18)}
+SPREAD_MONTH_DAYS = {2: (1, 15), 3: (1, 11, 21), 4: (1, 8, 15, 22)}
+PART_OF_DAY_HOURS = {"morning": 9, "afternoon": 14, "evening": 18, "night": 20}
+# Words that may be left over once every recognised phrase has been consumed.
+FILLER_WORDS = {
+    "every", "each", "on", "at", "and", "the", "a", "an", "per", "of", "in", "s",
+    "repeat", "repeats", "repeating", "recurring", "starting", "from", "day", "days",
+    "week", "weeks", "month", "months", "time", "times", "please", "do", "it",
+}  # fmt: skip
+MAX_EXPANSION_PERIODS = 5000
+
+llm_rule_cache = TTLCache(max_entries=settings.recurrence_cache_size, ttl_seconds=24 * 3600)
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """The RFC 5545 RRULE subset produced by the parser, plus occurrence expansion."""
+
+    freq: str
+    interval: int = 1
+    by_day: tuple[str, ...] = ()
+    by_month_day: tuple[int, ...] = ()
+    by_hour: tuple[int, ...] = ()
+    by_minute: tuple[int, ...] = ()
+    count: int | None = None
+    until: date | None = None
+    # True when the text did not pin the days/times and a spread was picked for it.
+    assumed: bool = False
+
+    def to_rrule(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(self.by_day))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ",".join(str(day) for day in self.by_month_day))
+        if self.by_hour:
+            parts.append("BYHOUR=" + ",".join(str(hour) for hour in self.by_hour))
+        if self.by_minute:
+            parts.append("BYMINUTE=" + ",".join(str(minute) for minute in self.by_minute))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%d')}T235959Z")
+        return ";".join(parts)
+
+    @classmethod
+    def from_rrule(cls, rrule: str) -> "Recurrence":
+        """Parse an RRULE limited to the parts this module emits; raises ValueError."""
+        fields = {}
+        for part in rrule.strip().removeprefix("RRULE:").split(";"):
+            key, sep, value = part.partition("=")
+            if not sep or not value:
+                raise ValueError(f"Malformed RRULE part: {part!r}")
+            fields[key.upper()] = value.upper()
+
+        freq = fields.pop("FREQ", None)
+        if freq not in UNIT_FREQ.values():
+            raise ValueError(f"Unsupported FREQ: {freq}")
+        by_day = tuple(fields.pop("BYDAY").split(",")) if "BYDAY" in fields else ()
+        for entry in by_day:
+            if not re.fullmatch(r"(-1|[1-4])?(MO|TU|WE|TH|FR|SA|SU)", entry):
+                raise ValueError(f"Unsupported BYDAY: {entry}")
+
+        def ints(key: str, low: int, high: int) -> tuple[int, ...]:
+            if key not in fields:
+                return ()
+            values = tuple(int(value) for value in fields.pop(key).split(","))
+            if any(not low <= value <= high for value in values):
+                raise ValueError(f"{key} out of range")
+            return values
+
+        until = None
+        if "UNTIL" in fields:
+            until = datetime.strptime(fields.pop("UNTIL")[:8], "%Y%m%d").date()
+        rule = cls(
+            freq=freq,
+            interval=int(fields.pop("INTERVAL", "1")),
+            by_day=by_day,
+            by_month_day=ints("BYMONTHDAY", 1, 31),
+            by_hour=ints("BYHOUR", 0, 23),
+            by_minute=ints("BYMINUTE", 0, 59),
+            count=int(fields.pop("COUNT")) if "COUNT" in fields else None,
+            until=until,
+        )
+        if fields:
+            raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(fields))}")
+        if rule.interval < 1 or (rule.count is not None and rule.count < 1):
+            raise ValueError("INTERVAL and COUNT must be positive")
+        return rule
+
+    def _days_in_period(self, period_start: date, anchor: date) -> list[date]:
+        if self.freq == "DAILY":
+            days = [period_start]
+        elif self.freq == "WEEKLY":
+            wanted = self.by_day or (WEEKDAYS[anchor.weekday()],)
+            days = [period_start + timedelta(days=WEEKDAYS.index(code)) for code in wanted]
+        elif self.freq == "MONTHLY":
+            days = self._month_days(period_start.year, period_start.month, anchor)
+        else:
+            days = [_safe_date(period_start.year, anchor.month, anchor.day)]
+        if self.freq == "DAILY" and self.by_day:
+            days = [day for day in days if WEEKDAYS[day.weekday()] in self.by_day]
+        return sorted(day for day in days if day is not None)
+
+    def _month_days(self, year: int, month: int, anchor: date) -> list[date | None]:
+        last_day = calendar.monthrange(year, month)[1]
+        if self.by_month_day:
+            return [_safe_date(year, month, day) for day in self.by_month_day]
+        if not self.by_day:
+            return [_safe_date(year, month, anchor.day)]
+        days: list[date | None] = []
+        for entry in self.by_day:
+            code = entry[-2:]
+            ordinal = int(entry[:-2]) if entry[:-2] else None
+            matches = [
+                date(year, month, day)
+                for day in range(1, last_day + 1)
+                if WEEKDAYS[date(year, month, day).weekday()] == code
+            ]
+            if ordinal is None:
+                days.extend(matches)
+            elif ordinal == -1:
+                days.append(matches[-1])
+            elif ordinal <= len(matches):
+                days.append(matches[ordinal - 1])
+        return days
+
+    def _period_start(self, anchor: date, index: int) -> date:
+        step = index * self.interval
+        if self.freq == "DAILY":
+            return anchor + timedelta(days=step)
+        if self.freq == "WEEKLY":
+            return anchor - timedelta(days=anchor.weekday()) + timedelta(weeks=step)
+        if self.freq == "MONTHLY":
+            month_index = anchor.month - 1 + step
+            return date(anchor.year + month_index // 12, month_index % 12 + 1, 1)
+        return date(anchor.year + step, 1, 1)
+
+    def occurrences(
+        self,
+        start: datetime,
+        after: datetime | None = None,
+        limit: int = 3,
+        before: datetime | None = None,
+    ) -> list[datetime]:
+        """Up to `limit` occurrences of the rule with DTSTART `start`, later than `after`
+        and no later than `before`."""
+        hours = self.by_hour or (start.hour,)
+        minutes = self.by_minute or ((0,) if self.by_hour else (start.minute,))
+        times = sorted(time(hour, minute) for hour in hours for minute in minutes)
+        until = (
+            datetime.combine(self.until, time(23, 59, 59), tzinfo=start.tzinfo)
+            if self.until
+            else None
+        )
+
+        found: list[datetime] = []
+        seen = 0
+        for index in range(MAX_EXPANSION_PERIODS):
+            period_start = self._period_start(start.date(), index)
+            for day in self._days_in_period(period_start, start.date()):
+                for at in times:
+                    candidate = datetime.combine(day, at, tzinfo=start.tzinfo)
+                    if candidate < start:
+                        continue
+                    if until is not None and candidate > until:
+                        return found
+                    if before is not None and candidate > before:
+                        return found
+                    seen += 1
+                    if self.count is not None and seen > self.count:
+                        return found
+                    if after is None or candidate > after:
+                        found.append(candidate)
+                        if len(found) >= limit:
+                            return found
+        return found
+
+
+def _safe_date(year: int, month: int, day: int) -> date | None:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def normalize_recurrence_text(text: str) -> str:
+    lowered = text.lower().replace("&", " and ").replace("-", " ")
+    lowered = re.sub(r"[^a-z0-9: ]+", " ", lowered)
+    return re.sub(r"\s+", " ", lowered).strip()
+
+
+def _number(word: str) -> int | None:
+    if word.isdigit():
+        return int(word)
+    return NUMBER_WORDS.get(word)
+
+
+class _Text:
+    """Normalized text whose recognised phrases are blanked out as they are consumed."""
+
+    def __init__(self, text: str):
+        self.text = f" {text} "
+
+    def take(self, pattern: str) -> re.Match | None:
+        match = re.search(pattern, self.text)
+        if match:
+            self.text = self.text[: match.start()] + " " + self.text[match.end() :]
+        return match
+
+    def take_all(self, pattern: str) -> list[re.Match]:
+        matches = list(re.finditer(pattern, self.text))
+        if matches:
+            self.text = re.sub(pattern, " ", self.text)
+        return matches
+
+    def leftover(self) -> set[str]:
+        return set(self.text.split()) - FILLER_WORDS
+
+
+def _take_times(text: _Text) -> tuple[tuple[int, ...], tuple[int, ...]] | None:
+    clock = r"\b(\d{1,2})(?::(\d{2}))?\s*(am|pm)\b|\b(\d{1,2}):(\d{2})\b"
+    times = set()
+    for match in text.take_all(clock):
+        if match.group(1):
+            hour, minute = int(match.group(1)), int(match.group(2) or 0)
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if match.group(3) == "pm" else 0)
+        else:
+            hour, minute = int(match.group(4)), int(match.group(5))
+        if hour > 23 or minute > 59:
+            return None
+        times.add((hour, minute))
+    for match in text.take_all(r"\b(noon|midday|midnight)\b"):
+        times.add((0 if match.group(1) == "midnight" else 12, 0))
+    part = text.take(r"\b(?:in the |every |each )?(morning|afternoon|evening|night)s?\b")
+    if part and not times:
+        # "Every evening at 7pm": an explicit clock time wins over the part of day.
+        times.add((PART_OF_DAY_HOURS[part.group(1)], 0))
+    if not times:
+        return (), ()
+    hours = tuple(sorted({hour for hour, _ in times}))
+    minutes = tuple(sorted({minute for _, minute in times}))
+    if len(hours) * len(minutes) != len(times):
+        # BYHOUR x BYMINUTE is a cross product; "9am and 5:30pm" cannot be expressed.
+        return None
+    return hours, minutes
+
+
+@lru_cache(maxsize=settings.recurrence_cache_size)
+def parse_normalized(text: str) -> Recurrence | None:
+    """Parse normalized recurrence text; None if any part of it is not understood."""
+    if not text:
+        return None
+    remaining = _Text(text)
+    rule: Recurrence | None = None
+
+    parsed_times = _take_times(remaining)
+    if parsed_times is None:
+        return None
+    by_hour, by_minute = parsed_times
+
+    count = until = None
+    if match := remaining.take(r"\buntil (\d{4}) (\d{1,2}) (\d{1,2})\b"):
+        until = _safe_date(*(int(group) for group in match.groups()))
+        if until is None:
+            return None
+    span = remaining.take(r"\bfor (\w+) (day|week|month|time|occurrence|session)s?\b")
+
+    if match := remaining.take(
+        r"\b(?:(once|twice|thrice)|(\w+) times?) (?:a|per|each|every) (day|week|month)\b"
+    ):
+        times_per = _number(match.group(1) or match.group(2))
+        unit = match.group(3)
+        if times_per is None or times_per < 1:
+            return None
+        if unit == "day" and times_per > 1:
+            if by_hour or times_per not in SPREAD_HOURS:
+                return None
+            rule = Recurrence(
+                "DAILY", by_hour=SPREAD_HOURS[times_per], by_minute=(0,), assumed=True
+            )
+        elif unit == "week" and times_per == 7:
+            rule = Recurrence("DAILY")
+        elif unit == "week" and times_per > 1:
+            if times_per not in SPREAD_WEEKDAYS:
+                return None
+            rule = Recurrence("WEEKLY", by_day=SPREAD_WEEKDAYS[times_per], assumed=True)
+        elif unit == "month" and times_per > 1:
+            if times_per not in SPREAD_MONTH_DAYS:
+                return None
+            rule = Recurrence(
+                "MONTHLY", by_month_day=SPREAD_MONTH_DAYS[times_per], assumed=True
+            )
+        else:
+            rule = Recurrence(UNIT_FREQ[unit])
+
+    if rule is None and (
+        match := remaining.take(
+            rf"\b(first|second|third|fourth|last|1st|2nd|3rd|4th) ({WEEKDAY_ALTERNATION})s?"
+            r"(?: of)?(?: the| each| every)? month\b"
+        )
+    ):
+        ordinal = ORDINALS[match.group(1)]
+        rule = Recurrence("MONTHLY", by_day=(f"{ordinal}{WEEKDAY_NAMES[match.group(2)]}",))
+
+    if rule is None and (
+        match := remaining.take(
+            r"\b(?:monthly )?(?:on )?(?:the )?(\d{1,2})(?:st|nd|rd|th)\b"
+            r"(?: of)?(?: the| each| every)?(?: month)?\b"
+        )
+    ):
+        day = int(match.group(1))
+        if not 1 <= day <= 31:
+            return None
+        rule = Recurrence("MONTHLY", by_month_day=(day,))
+        remaining.take(r"\bmonthly\b")
+
+    interval = 1
+    if match := remaining.take(r"\bevery (\w+) (day|week|month|year)s?\b"):
+        interval = _number(match.group(1)) or 0
+        if interval < 1 or rule is not None:
+            return None
+        rule = Recurrence(UNIT_FREQ[match.group(2)], interval=interval)
+    elif remaining.take(r"\b(?:fortnightly|biweekly|every other week)\b"):
+        interval = 2
+    elif remaining.take(r"\bevery other\b"):
+        interval = 2
+
+    if remaining.take(r"\b(?:every |on )?week ?days\b"):
+        days: tuple[str, ...] = ("MO", "TU", "WE", "TH", "FR")
+    elif remaining.take(r"\b(?:every |on )?(?:the )?week ?ends?\b"):
+        days = ("SA", "SU")
+    else:
+        names = remaining.take_all(rf"\b({WEEKDAY_ALTERNATION})s?\b")
+        named = {WEEKDAY_NAMES[match.group(1)] for match in names}
+        days = tuple(code for code in WEEKDAYS if code in named)
+
+    if days:
+        remaining.take(r"\b(?:weekly|every week|each week)\b")
+        if rule is not None and rule.freq != "WEEKLY":
+            return None
+        interval = max(interval, rule.interval if rule else 1)
+        rule = Recurrence("WEEKLY", interval=interval, by_day=days)
+    elif rule is None:
+        if remaining.take(r"\b(?:daily|every day|each day|everyday|nightly)\b"):
+            rule = Recurrence("DAILY", interval=interval)
+        elif remaining.take(r"\b(?:weekly|every week|each week)\b") or interval == 2:
+            rule = Recurrence("WEEKLY", interval=interval)
+        elif remaining.take(r"\b(?:monthly|every month|each month)\b"):
+            rule = Recurrence("MONTHLY", interval=interval)
+        elif remaining.take(r"\b(?:yearly|annually|every year|each year)\b"):
+            rule = Recurrence("YEARLY", interval=interval)
+        elif by_hour and re.search(r"\b(?:every|each)\b", text):
+            # "Every morning", "every evening at 7pm": daily at that time.
+            rule = Recurrence("DAILY")
+
+    if rule is None or remaining.leftover():
+        return None
+
+    if span is not None:
+        amount = _number(span.group(1))
+        if amount is None or amount < 1:
+            return None
+        unit = span.group(2)
+        if unit in ("time", "occurrence", "session"):
+            count = amount
+        elif UNIT_FREQ[unit] == rule.freq:
+            count = amount * _occurrences_per_period(rule, by_hour, by_minute)
+        else:
+            return None
+
+    if by_hour:
+        rule = replace(rule, by_hour=by_hour, by_minute=by_minute)
+    return replace(rule, count=count, until=until)
+
+
+def _occurrences_per_period(rule: Recurrence, by_hour: tuple, by_minute: tuple) -> int:
+    per_day = max(1, len(by_hour or rule.by_hour)) * max(1, len(by_minute or rule.by_minute))
+    if rule.freq == "WEEKLY":
+        return per_day * max(1, len(rule.by_day))
+    if rule.freq == "MONTHLY":
+        return per_day * max(1, len(rule.by_month_day) or len(rule.by_day))
+    return per_day
+
+
+def default_start(now: datetime | None = None) -> datetime:
+    # Rules without a time of day fall on 09:00 UTC; activities carry no timezone.
+    now = now or datetime.now(timezone.utc)
+    start = now.replace(hour=9, minute=0, second=0, microsecond=0)
+    return start if start >= now else start + timedelta(days=1)
+
+
+def describe(
+    raw_text: str,
+    rule: Recurrence | None,
+    source: str,
+    start: datetime | None = None,
+    occurrences: int = 3,
+) -> dict:
+    result = {
+        "raw_text": raw_text,
+        "normalized_text": normalize_recurrence_text(raw_text),
+        "source": source,
+        "rrule": None,
+        "frequency": "custom",
+        "assumed": False,
+        "next_occurrences": [],
+    }
+    if rule is None:
+        return result
+    result.update(
+        rrule=rule.to_rrule(),
+        frequency=rule.freq.lower(),
+        assumed=rule.assumed,
+    )
+    if occurrences:
+        anchor = start or default_start()
+        if anchor.tzinfo is None:
+            anchor = anchor.replace(tzinfo=timezone.utc)
+        result["next_occurrences"] = [
+            moment.isoformat() for moment in rule.occurrences(anchor, limit=occurrences)
+        ]
+    return result
+
+
+async def _llm_rules(normalized_texts: list[str]) -> dict[str, Recurrence | None]:
+    rules: dict[str, Recurrence | None] = {}
+    missing = []
+    for text in normalized_texts:
+        cached = llm_rule_cache.get(text)
+        if cached is None:
+            missing.append(text)
+        else:
+            rules[text] = Recurrence.from_rrule(cached) if cached else None
+    for text, rrule in (await extract_recurrence_rules(missing)).items():
+        rule = None
+        if rrule:
+            try:
+                rule = Recurrence.from_rrule(rrule)
+            except ValueError:
+                logger.info("Discarding unsupported RRULE from the model: %s", rrule)
+        if settings.minimax_api_key:
+            # "" records a phrase the model could not handle, so it is not asked again.
+            llm_rule_cache.set(text, rule.to_rrule() if rule else "")
+        rules[text] = rule
+    return rules
+
+
+async def parse_recurrence_batch(
+    texts: list[str],
+    start: datetime | None = None,
+    occurrences: int = 0,
+    use_llm: bool = True,
+) -> dict:
+    """Parse many texts, each distinct phrase once; the model only sees what the parser
+    could not understand."""
+    normalized = [normalize_recurrence_text(text) for text in texts]
+    rules = {text: parse_normalized(text) for text in set(normalized)}
+    sources = {text: "parser" for text, rule in rules.items() if rule is not None}
+    unknown = sorted(text for text, rule in rules.items() if rule is None and text)
+    if use_llm and unknown:
+        for text, rule in (await _llm_rules(unknown)).items():
+            if rule is not None:
+                rules[text] = rule
+                sources[text] = "llm"
+
+    results = [
+        describe(raw, rules[text], sources.get(text, "unparsed"), start, occurrences)
+        for raw, text in zip(texts, normalized)
+    ]
+    summary = {"total": len(texts), "unique": len(rules), "parser": 0, "llm": 0, "unparsed": 0}
+    for result in results:
+        summary[result["source"]] += 1
+    return {"results": results, "summary": summary}
+
+
+def recurrence_rule_for(text: str | None) -> str | None:
+    """RRULE stored alongside an activity's recurrence_text; parser only, no LLM."""
+    if not text:
+        return None
+    rule = parse_normalized(normalize_recurrence_text(text))
+    return rule.to_rrule() if rule else None
+
+
+async def backfill_activity_rules(
+    db: AsyncDatabase,
+    dry_run: bool = False,
+    use_llm: bool = True,
+    recompute: bool = False,
+    batch_size: int = 1000,
+) -> dict:
+    """Store recurrence_rule on activities that have recurrence_text but no rule yet."""
+    query: dict = {"recurrence_text": {"$nin": [None, ""]}}
+    if not recompute:
+        query["recurrence_rule"] = {"$exists": False}
+    report = {"activities": 0, "parser": 0, "llm": 0, "unparsed": 0, "dry_run": dry_run}
+
+    async def flush(batch: list[dict]) -> None:
+        parsed = await parse_recurrence_batch(
+            [doc["recurrence_text"] for doc in batch], use_llm=use_llm
+        )
+        for key in ("parser", "llm", "unparsed"):
+            report[key] += parsed["summary"][key]
+        report["activities"] += len(batch)
+        if not dry_run:
+            await db.activities.bulk_write(
+                [
+                    UpdateOne({"id": doc["id"]}, {"$set": {"recurrence_rule": result["rrule"]}})
+                    for doc, result in zip(batch, parsed["results"])
+                ],
+                ordered=False,
+            )
+
+    batch: list[dict] = []
+    async for doc in db.activities.find(query, {"_id": 0, "id": 1, "recurrence_text": 1}):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+    if report["activities"] and not dry_run:
+        await bump_versions(db, global_scope=True)
+    return report
@@ -0,0 +1,286 @@
+import asyncio
+import heapq
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from pymongo import ASCENDING
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import PyMongoError
+
+from app.config import settings
+from app.metrics import Counter, Histogram, REGISTRY
+from app.schemas import ReminderRequest
+from app.services.minimax_service import generate_reminder
+from app.services.recurrence_service import Recurrence
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+reminder_dispatch_total = Counter(
+    "ownmerits_reminder_dispatch_total",
+    "Reminders processed by the dispatcher, by outcome.",
+    ("outcome",),
+)
+reminder_dispatch_lag = Histogram(
+    "ownmerits_reminder_dispatch_lag_seconds",
+    "Delay between a reminder's next_run_at and the start of its dispatch.",
+    buckets=LAG_BUCKETS,
+)
+reminder_dispatch_duration = Histogram(
+    "ownmerits_reminder_dispatch_duration_seconds",
+    "Time to generate and record one reminder.",
+)
+REGISTRY.extend([reminder_dispatch_total, reminder_dispatch_lag, reminder_dispatch_duration])
+
+
+def _iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat()
+
+
+def _parse_iso(value: str) -> datetime:
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+class ReminderDispatcher:
+    """Claims due reminders under a lease and dispatches them on a bounded worker pool.
+
+    Any number of processes may run one: a reminder is only processed by the worker
+    holding its lease, and a lease left behind by a crashed worker expires and is
+    claimed again. Delivery is therefore at-least-once; notifications are keyed by
+    reminder and due time so a repeated dispatch does not duplicate them.
+    """
+
+    def __init__(self):
+        self.worker_id = f"{os.getpid()}-{uuid4().hex[:8]}"
+        # (next_run_at, reminder id) of upcoming reminders; only decides when to wake up.
+        self._heap: list[tuple[str, str]] = []
+        self._queue: asyncio.Queue | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._in_flight = 0
+        self._started_at: float | None = None
+        self._lag_seconds: list[float] = []
+
+    def notify(self, next_run_at: str) -> None:
+        """Tell the scheduler about a reminder created or moved by this process."""
+        heapq.heappush(self._heap, (next_run_at, ""))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _refill_heap(self, db: AsyncDatabase, now: datetime) -> None:
+        horizon = _iso(now + timedelta(seconds=settings.reminder_poll_seconds))
+        upcoming = (
+            await db.reminders.find(
+                {"next_run_at": {"$lte": horizon}, "status": {"$nin": ["done", "failed"]}},
+                {"_id": 0, "id": 1, "next_run_at": 1},
+            )
+            .sort("next_run_at", ASCENDING)
+            .limit(settings.reminder_batch_size * 4)
+            .to_list()
+        )
+        self._heap = [(doc["next_run_at"], doc["id"]) for doc in upcoming]
+        heapq.heapify(self._heap)
+
+    async def _claim(self, db: AsyncDatabase, now: datetime) -> dict | None:
+        now_iso = _iso(now)
+        return await db.reminders.find_one_and_update(
+            {
+                "next_run_at": {"$lte": now_iso},
+                "status": {"$nin": ["done", "failed"]},
+                "$or": [
+                    {"lease_expires_at": None},
+                    {"lease_expires_at": {"$lt": now_iso}},
+                ],
+            },
+            {
+                "$set": {
+                    "lease_owner": self.worker_id,
+                    "lease_expires_at": _iso(
+                        now + timedelta(seconds=settings.reminder_lease_seconds)
+                    ),
+                }
+            },
+            projection={"_id": 0},
+            sort=[("next_run_at", ASCENDING)],
+        )
+
+    async def _claim_batch(self, db: AsyncDatabase) -> int:
+        claimed = 0
+        while claimed < settings.reminder_batch_size:
+            # Do not lease more than the workers can start before the lease runs out.
+            if self._queue.full():
+                break
+            reminder = await self._claim(db, datetime.now(timezone.utc))
+            if reminder is None:
+                break
+            await self._queue.put(reminder)
+            claimed += 1
+        return claimed
+
+    async def _schedule_loop(self, db: AsyncDatabase) -> None:
+        next_refill = 0.0
+        while True:
+            try:
+                now = datetime.now(timezone.utc)
+                if time.monotonic() >= next_refill:
+                    await self._refill_heap(db, now)
+                    next_refill = time.monotonic() + settings.reminder_poll_seconds
+
+                now_iso = _iso(now)
+                if self._heap and self._heap[0][0] <= now_iso:
+                    while self._heap and self._heap[0][0] <= now_iso:
+                        heapq.heappop(self._heap)
+                    if await self._claim_batch(db) and self._queue.full():
+                        # More may be due: let the workers drain this batch, then claim again.
+                        heapq.heappush(self._heap, (now_iso, ""))
+                        await self._queue.join()
+                        continue
+            except PyMongoError:
+                logger.warning("Reminder scheduling pass failed", exc_info=True)
+
+            sleep_for = max(0.0, next_refill - time.monotonic())
+            if self._heap:
+                due_at = _parse_iso(self._heap[0][0])
+                due_in = (due_at - datetime.now(timezone.utc)).total_seconds()
+                sleep_for = min(sleep_for, max(0.0, due_in))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work_loop(self, db: AsyncDatabase) -> None:
+        while True:
+            reminder = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._dispatch(db, reminder)
+            except Exception:
+                logger.exception("Reminder %s dispatch crashed", reminder.get("id"))
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    def _next_run(self, reminder: dict, activity: dict | None, now: datetime) -> str | None:
+        rrule = reminder.get("recurrence_rule") or (activity or {}).get("recurrence_rule")
+        if not rrule:
+            return None
+        try:
+            rule = Recurrence.from_rrule(rrule)
+        except ValueError:
+            logger.warning("Reminder %s has an unsupported RRULE: %s", reminder["id"], rrule)
+            return None
+        # Expanding from the previous due time keeps INTERVAL>1 rules in phase.
+        upcoming = rule.occurrences(_parse_iso(reminder["next_run_at"]), after=now, limit=1)
+        return _iso(upcoming[0]) if upcoming else None
+
+    async def _dispatch(self, db: AsyncDatabase, reminder: dict) -> None:
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        lag = max(0.0, (now - _parse_iso(reminder["next_run_at"])).total_seconds())
+        reminder_dispatch_lag.observe(lag)
+        self._lag_seconds = (self._lag_seconds + [lag])[-1000:]
+        leased = {"id": reminder["id"], "lease_owner": self.worker_id}
+
+        activity = await db.activities.find_one(
+            {"id": reminder.get("activity_id")}, {"_id": 0, "title": 1, "recurrence_rule": 1}
+        )
+        try:
+            response = await generate_reminder(
+                ReminderRequest(
+                    user_id=reminder["user_id"],
+                    activity_title=(activity or {}).get("title", "your next activity"),
+                    due_label=_parse_iso(reminder["next_run_at"]).strftime("%a %d %b, %H:%M"),
+                )
+            )
+        except Exception:
+            attempts = reminder.get("attempts", 0) + 1
+            outcome = "failed" if attempts >= settings.reminder_max_attempts else "retry"
+            logger.warning("Reminder %s generation failed (%s)", reminder["id"], outcome)
+            retry_at = now + timedelta(seconds=settings.reminder_retry_backoff_seconds * attempts)
+            update = {"attempts": attempts, "lease_owner": None, "lease_expires_at": None}
+            if outcome == "failed":
+                update["status"] = "failed"
+            else:
+                update["next_run_at"] = _iso(retry_at)
+            await db.reminders.update_one(leased, {"$set": update})
+            reminder_dispatch_total.inc(outcome)
+            return
+
+        notification_id = f"{reminder['id']}:{reminder['next_run_at']}"
+        await db.notifications.update_one(
+            {"id": notification_id},
+            {
+                "$setOnInsert": {
+                    "id": notification_id,
+                    "user_id": reminder["user_id"],
+                    "reminder_id": reminder["id"],
+                    "activity_id": reminder.get("activity_id"),
+                    "channel": reminder.get("channel", "in_app"),
+                    "message": response.message,
+                    "model_used": response.model_used,
+                    "created_at": _iso(now),
+                }
+            },
+            upsert=True,
+        )
+
+        next_run_at = self._next_run(reminder, activity, now)
+        update = {
+            "last_sent_at": _iso(now),
+            "attempts": 0,
+            "lease_owner": None,
+            "lease_expires_at": None,
+        }
+        if next_run_at:
+            update["next_run_at"] = next_run_at
+            self.notify(next_run_at)
+        else:
+            update["status"] = "done"
+        await db.reminders.update_one(leased, {"$set": update})
+        reminder_dispatch_total.inc("rescheduled" if next_run_at else "sent")
+        reminder_dispatch_duration.observe(time.perf_counter() - started)
+
+    async def start(self, db: AsyncDatabase) -> None:
+        self._queue = asyncio.Queue(maxsize=settings.reminder_batch_size)
+        self._wakeup = asyncio.Event()
+        self._started_at = time.monotonic()
+        self._tasks = [asyncio.create_task(self._schedule_loop(db))] + [
+            asyncio.create_task(self._work_loop(db)) for _ in range(settings.reminder_workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        processed = {
+            outcome: int(reminder_dispatch_total.value(outcome))
+            for outcome in ("sent", "rescheduled", "retry", "failed")
+        }
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        throughput = sum(processed.values()) / uptime * 60 if uptime else 0.0
+        lags = sorted(self._lag_seconds)
+        return {
+            "running": bool(self._tasks),
+            "worker_id": self.worker_id,
+            "workers": settings.reminder_workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": self._in_flight,
+            "heap_size": len(self._heap),
+            "next_due_at": self._heap[0][0] if self._heap else None,
+            "processed": processed,
+            "throughput_per_minute": round(throughput, 2),
+            "lag_p50_seconds": round(lags[len(lags) // 2], 3) if lags else None,
+            "lag_max_seconds": round(lags[-1], 3) if lags else None,
+        }
+
+
+dispatcher = ReminderDispatcher()
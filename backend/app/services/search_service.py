@@ -0,0 +1,114 @@
+import asyncio
+import heapq
+from datetime import datetime, timezone
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.fields import ACTIVITY_FIELDS, SUBMISSION_FIELDS
+from app.pagination import PageParams, decode_cursor, encode_cursor
+
+# Which collection each result type comes from, what it returns and who "user" means there.
+SEARCH_TARGETS = {
+    "submission": {
+        "collection": "submissions",
+        "fields": SUBMISSION_FIELDS,
+        "user_field": "user_id",
+    },
+    "activity": {
+        "collection": "activities",
+        "fields": ACTIVITY_FIELDS,
+        "user_field": "assigned_to_user_id",
+    },
+}
+
+
+def _iso(moment: datetime) -> str:
+    # created_at is stored as a UTC ISO string, so bounds must compare as the same.
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat()
+
+
+def _pipeline(
+    query: str,
+    target: dict,
+    filters: dict,
+    after: list | None,
+    limit: int,
+) -> list[dict]:
+    project = {"_id": 0, "score": {"$meta": "textScore"}}
+    project.update({name: 1 for name in target["fields"]})
+    pipeline: list[dict] = [
+        {"$match": {"$text": {"$search": query}, **filters}},
+        {"$project": project},
+    ]
+    if after is not None:
+        last_score, last_id = after
+        pipeline.append(
+            {
+                "$match": {
+                    "$or": [
+                        {"score": {"$lt": last_score}},
+                        {"score": last_score, "id": {"$lt": last_id}},
+                    ]
+                }
+            }
+        )
+    pipeline += [{"$sort": {"score": -1, "id": -1}}, {"$limit": limit}]
+    return pipeline
+
+
+async def search(
+    db: AsyncDatabase,
+    query: str,
+    page: PageParams,
+    types: tuple[str, ...] = ("submission", "activity"),
+    status: str | None = None,
+    user_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> dict:
+    """
+    Ranked full-text search over submissions and activities through their text indexes.
+    Results are ordered by (text score, id) descending, and the cursor is the last pair, so
+    each collection is asked only for its next `limit + 1` rows and the merge stays exact
+    across pages. Scores come from per-collection field weights and are comparable only
+    roughly between types. A status filter only matches submissions.
+    """
+    created_at: dict = {}
+    if created_from is not None:
+        created_at["$gte"] = _iso(created_from)
+    if created_to is not None:
+        created_at["$lt"] = _iso(created_to)
+    after = decode_cursor(page.cursor) if page.cursor else None
+
+    async def run(kind: str, filters: dict) -> list[dict]:
+        target = SEARCH_TARGETS[kind]
+        cursor = await db[target["collection"]].aggregate(
+            _pipeline(query, target, filters, after, page.limit + 1)
+        )
+        return [{"type": kind, **row} async for row in cursor]
+
+    searches = []
+    for kind in types:
+        if status and kind != "submission":
+            continue
+        target = SEARCH_TARGETS[kind]
+        filters: dict = {}
+        if status:
+            filters["status"] = status
+        if user_id:
+            filters[target["user_field"]] = user_id
+        if created_at:
+            filters["created_at"] = created_at
+        searches.append(run(kind, filters))
+    batches = await asyncio.gather(*searches)
+
+    items = list(
+        heapq.merge(*batches, key=lambda row: (row["score"], row["id"]), reverse=True)
+    )[: page.limit + 1]
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[: page.limit]
+        next_cursor = encode_cursor([items[-1]["score"], items[-1]["id"]])
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,112 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+
+from app.cache import TTLCache
+from app.config import settings
+from app.services.progress_service import (
+    COUNTER_META_FIELDS,
+    NO_WRITES_IN_FLIGHT,
+    begin_write,
+    end_write,
+)
+
+STATS_ID = "dashboard"
+
+stats_cache = TTLCache(max_entries=1, ttl_seconds=settings.admin_stats_cache_ttl_seconds)
+
+
+async def count_dashboard_stats(db: AsyncDatabase) -> dict:
+    return {
+        "activities_count": await db.activities.count_documents({}),
+        "submissions_pending": await db.submissions.count_documents({"status": "pending"}),
+        "submissions_approved": await db.submissions.count_documents({"status": "approved"}),
+        "submissions_rejected": await db.submissions.count_documents({"status": "rejected"}),
+        "rewards_assigned": await db.rewards.count_documents({"status": "assigned"}),
+    }
+
+
+@asynccontextmanager
+async def stats_writes(db: AsyncDatabase) -> AsyncIterator[dict[str, int]]:
+    """
+    Fence the dashboard stats around a write they count, like progress_writes.
+
+    Yields a dict the caller fills with stat deltas as its writes land; they are
+    applied on exit, or the stats are marked stale if the block raises first.
+    """
+    await db.admin_stats.update_one({"_id": STATS_ID}, begin_write(), upsert=True)
+    deltas: dict[str, int] = {}
+    failed = True
+    try:
+        yield deltas
+        failed = False
+    finally:
+        landed = {key: value for key, value in deltas.items() if value}
+        await db.admin_stats.update_one(
+            {"_id": STATS_ID},
+            end_write(None if failed and not landed else landed),
+            upsert=True,
+        )
+        stats_cache.clear()
+
+
+def add_stats_deltas(stats: dict[str, int], deltas: dict[str, int]) -> None:
+    for key, value in deltas.items():
+        stats[key] = stats.get(key, 0) + value
+
+
+def status_change_deltas(old_status: str, new_status: str) -> dict:
+    if old_status == new_status:
+        return {}
+    return {f"submissions_{old_status}": -1, f"submissions_{new_status}": 1}
+
+
+async def get_dashboard_stats(db: AsyncDatabase) -> dict:
+    cached = stats_cache.get(STATS_ID)
+    if cached is not None:
+        return dict(cached)
+
+    stored = await db.admin_stats.find_one({"_id": STATS_ID}, {"_id": 0})
+    if stored is not None and not stored.get("stale"):
+        stats = {
+            key: value for key, value in stored.items() if key not in COUNTER_META_FIELDS
+        }
+    else:
+        writes = stored.get("writes") if stored else None
+        stats = await count_dashboard_stats(db)
+        try:
+            await db.admin_stats.update_one(
+                {
+                    "_id": STATS_ID,
+                    "writes": writes if writes is not None else {"$exists": False},
+                    "in_flight": NO_WRITES_IN_FLIGHT,
+                },
+                {"$set": {**stats, "stale": False}},
+                upsert=stored is None,
+            )
+        except DuplicateKeyError:
+            pass
+
+    stats_cache.set(STATS_ID, dict(stats))
+    return stats
+
+
+async def rebuild_admin_stats(db: AsyncDatabase, dry_run: bool = False) -> dict:
+    expected = await count_dashboard_stats(db)
+    stored = await db.admin_stats.find_one({"_id": STATS_ID}, {"_id": 0})
+    drift = {
+        key: {"stored": (stored or {}).get(key), "expected": value}
+        for key, value in expected.items()
+        if (stored or {}).get(key) != value
+    }
+    if (stored or {}).get("stale"):
+        drift["stale"] = {"stored": True, "expected": False}
+    if drift and not dry_run:
+        # $set rather than a replace, so the fence of a write in flight survives.
+        await db.admin_stats.update_one(
+            {"_id": STATS_ID}, {"$set": {**expected, "stale": False}}, upsert=True
+        )
+        stats_cache.clear()
+    return {"drift": drift, "dry_run": dry_run}
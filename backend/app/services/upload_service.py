@@ -0,0 +1,381 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator
+
+from bson import ObjectId
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from gridfs import AsyncGridFSBucket
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.config import settings
+from app.metrics import Counter, REGISTRY
+from app.process_pool import run_in_process
+from app.thumbnails import make_thumbnail
+
+# Room for the multipart boundaries and part headers around the file itself.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+THUMBNAIL_CONTENT_TYPE = "image/jpeg"
+UPLOAD_PROJECTION = {
+    "_id": 0,
+    "sha256": 1,
+    "size": 1,
+    "content_type": 1,
+    "storage": 1,
+    "location": 1,
+    "thumbnail_location": 1,
+}
+
+uploads_total = Counter(
+    "ownmerits_uploads_total",
+    "Proof image uploads by outcome (stored, deduplicated, rejected).",
+    ("outcome",),
+)
+REGISTRY.append(uploads_total)
+
+
+class UploadError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    """Content type from the file's magic bytes; the client's Content-Type is not trusted."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def upload_url(sha256: str) -> str:
+    return f"{settings.api_prefix}/uploads/{sha256}"
+
+
+def thumbnail_url(sha256: str) -> str:
+    return f"{upload_url(sha256)}/thumbnail"
+
+
+class _DiskWriter:
+    def __init__(self, root: Path):
+        tmp_dir = root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False)
+        self._root = root
+
+    async def write(self, data: bytes) -> None:
+        # A slow disk must not stall every other request on the event loop.
+        await asyncio.to_thread(self._file.write, data)
+
+    async def commit(self, name: str) -> str:
+        self._file.close()
+        location = f"{name[:2]}/{name}"
+        target = self._root / location
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._file.name, target)
+        return location
+
+    async def abort(self) -> None:
+        self._file.close()
+        Path(self._file.name).unlink(missing_ok=True)
+
+
+class DiskStorage:
+    """Files under UPLOAD_DIR, fanned out by the first two hex digits of their name."""
+
+    name = "disk"
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    async def open_writer(self) -> _DiskWriter:
+        return _DiskWriter(self.root)
+
+    async def put(self, name: str, data: bytes) -> str:
+        writer = await self.open_writer()
+        await writer.write(data)
+        return await writer.commit(name)
+
+    async def source(self, location: str) -> bytes | str:
+        # The thumbnail worker reads the file itself instead of receiving it pickled.
+        return str(self.root / location)
+
+    async def delete(self, location: str) -> None:
+        (self.root / location).unlink(missing_ok=True)
+
+    async def response(self, location: str, media_type: str, headers: dict) -> Response:
+        return FileResponse(self.root / location, media_type=media_type, headers=headers)
+
+
+class _GridFSWriter:
+    def __init__(self, bucket: AsyncGridFSBucket):
+        self._bucket = bucket
+        self._stream = bucket.open_upload_stream(
+            "pending", chunk_size_bytes=settings.upload_chunk_bytes
+        )
+
+    async def write(self, data: bytes) -> None:
+        await self._stream.write(data)
+
+    async def commit(self, name: str) -> str:
+        await self._stream.close()
+        await self._bucket.rename(self._stream._id, name)
+        return str(self._stream._id)
+
+    async def abort(self) -> None:
+        await self._stream.abort()
+
+
+class GridFSStorage:
+    """Files in the `uploads` GridFS bucket of the application database."""
+
+    name = "gridfs"
+
+    def __init__(self, db: AsyncDatabase):
+        self.bucket = AsyncGridFSBucket(db, bucket_name="uploads")
+
+    async def open_writer(self) -> _GridFSWriter:
+        return _GridFSWriter(self.bucket)
+
+    async def put(self, name: str, data: bytes) -> str:
+        return str(await self.bucket.upload_from_stream(name, data))
+
+    async def source(self, location: str) -> bytes | str:
+        stream = await self.bucket.open_download_stream(ObjectId(location))
+        return await stream.read()
+
+    async def delete(self, location: str) -> None:
+        await self.bucket.delete(ObjectId(location))
+
+    async def response(self, location: str, media_type: str, headers: dict) -> Response:
+        stream = await self.bucket.open_download_stream(ObjectId(location))
+
+        async def chunks() -> AsyncIterator[bytes]:
+            while chunk := await stream.readchunk():
+                yield chunk
+
+        headers = {**headers, "Content-Length": str(stream.length)}
+        return StreamingResponse(chunks(), media_type=media_type, headers=headers)
+
+
+def get_upload_storage(db: AsyncDatabase, name: str | None = None) -> DiskStorage | GridFSStorage:
+    # Each upload records its storage, so files stay readable after UPLOAD_STORAGE changes.
+    name = name or settings.upload_storage
+    if name == "disk":
+        return DiskStorage(settings.upload_dir)
+    if name == "gridfs":
+        return GridFSStorage(db)
+    raise RuntimeError(f"UPLOAD_STORAGE must be 'disk' or 'gridfs', not {name!r}")
+
+
+class _FilePart:
+    """Collects the bytes of the first file part as the multipart parser emits them."""
+
+    def __init__(self, boundary: bytes):
+        self.pending: list[bytes] = []
+        self.found = False
+        self.complete = False
+        self._in_file = False
+        self._headers: dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self.parser = MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": self._part_begin,
+                "on_header_field": self._header_field,
+                "on_header_value": self._header_value,
+                "on_header_end": self._header_end,
+                "on_headers_finished": self._headers_finished,
+                "on_part_data": self._part_data,
+                "on_part_end": self._part_end,
+            },
+        )
+
+    def _part_begin(self) -> None:
+        self._headers = {}
+
+    def _header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def _header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def _header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = self._value = b""
+
+    def _headers_finished(self) -> None:
+        _, params = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._in_file = not self.found and b"filename" in params
+        self.found = self.found or self._in_file
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.pending.append(bytes(data[start:end]))
+
+    def _part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self.complete = True
+
+
+async def _receive_file(request: Request, writer) -> tuple[str, int, str]:
+    """Stream the first file part of a multipart body into `writer`, hashing as it goes.
+    Only one network chunk is held in memory at a time."""
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+        raise UploadError(400, "Expected a multipart/form-data body")
+    body_limit = settings.upload_max_bytes + MULTIPART_OVERHEAD_BYTES
+    if int(request.headers.get("content-length") or 0) > body_limit:
+        raise UploadError(413, "File is too large")
+
+    part = _FilePart(params[b"boundary"])
+    digest = hashlib.sha256()
+    head = b""
+    received = size = 0
+    image_type: str | None = None
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > body_limit:
+            raise UploadError(413, "File is too large")
+        part.parser.write(chunk)
+        for data in part.pending:
+            size += len(data)
+            if size > settings.upload_max_bytes:
+                raise UploadError(413, "File is too large")
+            if image_type is None:
+                head += data[:12]
+                if len(head) >= 12:
+                    image_type = sniff_image_type(head)
+                    if image_type is None:
+                        raise UploadError(415, "Only JPEG, PNG, GIF and WebP images are accepted")
+            digest.update(data)
+            await writer.write(data)
+        part.pending.clear()
+    part.parser.finalize()
+    if not part.complete:
+        raise UploadError(400, "No file part in the upload")
+    image_type = image_type or sniff_image_type(head)
+    if image_type is None:
+        raise UploadError(415, "Only JPEG, PNG, GIF and WebP images are accepted")
+    return digest.hexdigest(), size, image_type
+
+
+async def _store_thumbnail(storage, sha256: str, location: str) -> str | None:
+    source = await storage.source(location)
+    thumbnail = await run_in_process(make_thumbnail, source, settings.thumbnail_max_edge)
+    if thumbnail is None:
+        return None
+    return await storage.put(f"{sha256}.thumb.jpg", thumbnail)
+
+
+def _public(upload: dict, deduplicated: bool) -> dict:
+    sha256 = upload["sha256"]
+    return {
+        "sha256": sha256,
+        "url": upload_url(sha256),
+        "thumbnail_url": thumbnail_url(sha256) if upload.get("thumbnail_location") else None,
+        "size": upload["size"],
+        "content_type": upload["content_type"],
+        "deduplicated": deduplicated,
+    }
+
+
+async def store_upload(db: AsyncDatabase, request: Request, user_id: str) -> dict:
+    """
+    Store the image in the request body once per distinct content. A second upload of the
+    same bytes is discarded after hashing and answered with the existing file, thumbnail
+    included; new files get their thumbnail from the process pool before responding.
+    """
+    storage = get_upload_storage(db)
+    writer = await storage.open_writer()
+    try:
+        sha256, size, content_type = await _receive_file(request, writer)
+    except UploadError:
+        await writer.abort()
+        uploads_total.inc("rejected")
+        raise
+    except BaseException:
+        await writer.abort()
+        raise
+
+    # Identical bytes are stored once, but each uploader is recorded: only owners (and
+    # admins) may read the file or attach it to a submission.
+    existing = await db.uploads.find_one_and_update(
+        {"sha256": sha256}, {"$addToSet": {"owners": user_id}}, UPLOAD_PROJECTION
+    )
+    if existing is not None:
+        await writer.abort()
+        uploads_total.inc("deduplicated")
+        return _public(existing, deduplicated=True)
+
+    location = await writer.commit(sha256)
+    thumbnail_location = await _store_thumbnail(storage, sha256, location)
+    upload = {
+        "sha256": sha256,
+        "size": size,
+        "content_type": content_type,
+        "storage": storage.name,
+        "location": location,
+        "thumbnail_location": thumbnail_location,
+        "owners": [user_id],
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        await db.uploads.insert_one(upload)
+    except DuplicateKeyError:
+        # A concurrent upload of the same bytes got there first; keep its copy.
+        winner = await db.uploads.find_one_and_update(
+            {"sha256": sha256}, {"$addToSet": {"owners": user_id}}, UPLOAD_PROJECTION
+        )
+        # On disk both copies landed on the same content-addressed path, which stays.
+        if location != winner["location"]:
+            await storage.delete(location)
+        if thumbnail_location and thumbnail_location != winner.get("thumbnail_location"):
+            await storage.delete(thumbnail_location)
+        uploads_total.inc("deduplicated")
+        return _public(winner, deduplicated=True)
+    uploads_total.inc("stored")
+    return _public(upload, deduplicated=False)
+
+
+async def get_upload(db: AsyncDatabase, sha256: str, user: dict) -> dict | None:
+    """The upload if `user` uploaded it or is an admin; None otherwise, as if it were missing."""
+    query: dict = {"sha256": sha256}
+    if user.get("role") != "admin":
+        query["owners"] = user["id"]
+    return await db.uploads.find_one(query, UPLOAD_PROJECTION)
+
+
+async def share_upload(db: AsyncDatabase, sha256: str, user_id: str) -> None:
+    # Lets the resident see a proof image an admin attached to their submission.
+    await db.uploads.update_one({"sha256": sha256}, {"$addToSet": {"owners": user_id}})
+
+
+async def upload_response(db: AsyncDatabase, upload: dict, thumbnail: bool) -> Response | None:
+    """The stored file (or its thumbnail) as an immutable, content-addressed response.
+    Only the browser may cache it, since reading it needs an owner's token."""
+    location = upload.get("thumbnail_location") if thumbnail else upload["location"]
+    if not location:
+        return None
+    storage = get_upload_storage(db, upload["storage"])
+    media_type = THUMBNAIL_CONTENT_TYPE if thumbnail else upload["content_type"]
+    headers = {
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "ETag": f'"{upload["sha256"]}{"-thumb" if thumbnail else ""}"',
+        "X-Content-Type-Options": "nosniff",
+    }
+    return await storage.response(location, media_type, headers)
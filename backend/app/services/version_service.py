@@ -0,0 +1,46 @@
+from typing import Iterable
+from uuid import uuid4
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+GLOBAL_SCOPE = "global"
+
+
+def user_scope(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+async def bump_versions(
+    db: AsyncDatabase, user_ids: Iterable[str] = (), global_scope: bool = False
+) -> None:
+    """Advance the data version of each affected scope.
+
+    Call this after the write itself: a reader that sees the new version must also see
+    the new data, otherwise a stale body would be cached under the new ETag.
+    """
+    scopes = {user_scope(user_id) for user_id in user_ids if user_id}
+    if global_scope:
+        scopes.add(GLOBAL_SCOPE)
+    if not scopes:
+        return
+    # The epoch is fixed when a scope is first created, so versions restarting from 1
+    # after the collection is dropped never reproduce an ETag handed out before.
+    await db.data_versions.bulk_write(
+        [
+            UpdateOne(
+                {"_id": scope},
+                {"$inc": {"version": 1}, "$setOnInsert": {"epoch": uuid4().hex}},
+                upsert=True,
+            )
+            for scope in sorted(scopes)
+        ],
+        ordered=False,
+    )
+
+
+async def get_versions(db: AsyncDatabase, user_id: str) -> list[str]:
+    scopes = [user_scope(user_id), GLOBAL_SCOPE]
+    docs = await db.data_versions.find({"_id": {"$in": scopes}}).to_list()
+    by_scope = {doc["_id"]: f"{doc.get('epoch', '')}.{doc.get('version', 0)}" for doc in docs}
+    return [by_scope.get(scope, "0") for scope in scopes]
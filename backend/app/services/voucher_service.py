@@ -1,9 +1,26 @@
+import asyncio
+import hashlib
+import random
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import httpx
 
-def assign_voucher(user_id: str, submission_id: str) -> dict:
-    # Stub service; replace with real eVoucher API integration.
+from app.config import settings
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class VoucherProviderError(Exception):
+    pass
+
+
+def idempotency_key(submission_id: str) -> str:
+    # One voucher per submission: every retry, from any worker, reuses the same key.
+    return "om-" + hashlib.sha256(submission_id.encode("utf-8")).hexdigest()
+
+
+def _stub_voucher(user_id: str, submission_id: str) -> dict:
     return {
         "reward_id": str(uuid4()),
         "user_id": user_id,
@@ -12,3 +29,131 @@ def assign_voucher(user_id: str, submission_id: str) -> dict:
         "status": "assigned",
         "assigned_at": datetime.now(timezone.utc).isoformat(),
     }
+
+
+class VoucherClient:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout_seconds: float,
+        max_retries: int,
+        max_connections: int,
+        retry_backoff_seconds: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+        # Queue excess callers here rather than in httpx, where they would hit the pool timeout.
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def issue_voucher(self, user_id: str, submission_id: str) -> dict:
+        headers = {"Idempotency-Key": idempotency_key(submission_id)}
+        body = {"recipient_id": user_id, "reference": submission_id}
+        last_error = ""
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # Full jitter keeps retries from many workers from arriving in lockstep.
+                await asyncio.sleep(random.uniform(0, self.retry_backoff_seconds * 2**attempt))
+            try:
+                async with self._slots:
+                    response = await self._client.post("/vouchers", json=body, headers=headers)
+            except httpx.TransportError as exc:
+                last_error = f"{type(exc).__name__}: {exc}"
+                continue
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                last_error = f"HTTP {response.status_code}"
+                continue
+            if response.is_error:
+                raise VoucherProviderError(
+                    f"Voucher provider rejected request: HTTP {response.status_code}"
+                )
+            return self._to_reward(response, user_id, submission_id)
+
+        raise VoucherProviderError(
+            f"Voucher provider unavailable after {self.max_retries + 1} attempts ({last_error})"
+        )
+
+    @staticmethod
+    def _to_reward(response: httpx.Response, user_id: str, submission_id: str) -> dict:
+        try:
+            voucher = response.json()
+        except ValueError as exc:
+            raise VoucherProviderError("Voucher provider returned invalid JSON") from exc
+        if not isinstance(voucher, dict) or not isinstance(voucher.get("code"), str):
+            raise VoucherProviderError("Voucher provider response has no voucher code")
+        reward = {
+            "reward_id": str(uuid4()),
+            "user_id": user_id,
+            "submission_id": submission_id,
+            "voucher_code": voucher["code"],
+            "provider_voucher_id": voucher.get("id"),
+            "status": "assigned",
+            "assigned_at": datetime.now(timezone.utc).isoformat(),
+        }
+        for key in ("value", "currency", "retailer", "expires_at"):
+            if key in voucher:
+                reward[key] = voucher[key]
+        return reward
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_client: VoucherClient | None = None
+
+
+def get_voucher_client() -> VoucherClient:
+    global _client
+    if _client is None:
+        _client = VoucherClient(
+            base_url=settings.evoucher_base_url,
+            api_key=settings.evoucher_api_key,
+            timeout_seconds=settings.evoucher_timeout_seconds,
+            max_retries=settings.evoucher_max_retries,
+            max_connections=settings.evoucher_max_connections,
+            retry_backoff_seconds=settings.evoucher_retry_backoff_seconds,
+        )
+    return _client
+
+
+async def close_voucher_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def assign_voucher(user_id: str, submission_id: str) -> dict:
+    if not settings.evoucher_api_key:
+        # No provider configured: issue a local stub code.
+        return _stub_voucher(user_id, submission_id)
+    return await get_voucher_client().issue_voucher(user_id, submission_id)
+
+
+async def assign_vouchers(requests: list[tuple[str, str]]) -> list[dict | None]:
+    # Batch variant for bulk review; takes (user_id, submission_id) pairs and returns
+    # rewards in the same order, with None where the provider failed.
+    results = await asyncio.gather(
+        *(assign_voucher(user_id, submission_id) for user_id, submission_id in requests),
+        return_exceptions=True,
+    )
+    rewards: list[dict | None] = []
+    for result in results:
+        if isinstance(result, VoucherProviderError):
+            rewards.append(None)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            rewards.append(result)
+    return rewards
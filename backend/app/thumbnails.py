@@ -0,0 +1,33 @@
+import io
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: without Pillow uploads are stored without thumbnails
+    Image = None
+
+
+def thumbnails_available() -> bool:
+    return Image is not None
+
+
+def make_thumbnail(source: bytes | str, max_edge: int) -> bytes | None:
+    """
+    Downscale an image (raw bytes or a file path) to a JPEG no larger than `max_edge` on
+    either side. Runs in the process pool, so it must stay importable without the app.
+    Returns None when Pillow is missing or the image cannot be decoded.
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as image:
+            # JPEG decoders can scale by 1/2..1/8 while decoding, far cheaper than a resize.
+            image.draft("RGB", (max_edge, max_edge))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_edge, max_edge))
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            output = io.BytesIO()
+            image.save(output, "JPEG", quality=80, optimize=True)
+            return output.getvalue()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
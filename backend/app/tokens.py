@@ -0,0 +1,137 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Signed tokens are "v1.<claims>.<signature>"; random database tokens never contain a dot.
+TOKEN_PREFIX = "v1."
+# Workers revoke with their own clocks, so each sync re-reads a small overlap window.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(key: str, signing_input: str) -> str:
+    digest = hmac.new(key.encode("utf-8"), signing_input.encode("ascii"), hashlib.sha256).digest()
+    return _b64encode(digest)
+
+
+def is_signed_token(token: str) -> bool:
+    return token.startswith(TOKEN_PREFIX)
+
+
+def sign_token(claims: dict, key: str) -> str:
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = TOKEN_PREFIX + payload
+    return f"{signing_input}.{_signature(key, signing_input)}"
+
+
+def verify_token(token: str, key: str) -> dict | None:
+    """Return the claims of an authentic, unexpired token, otherwise None."""
+    if not is_signed_token(token) or token.count(".") != 2:
+        return None
+    signing_input, signature = token.rsplit(".", 1)
+    if not hmac.compare_digest(signature, _signature(key, signing_input)):
+        return None
+    try:
+        claims = json.loads(_b64decode(signing_input.removeprefix(TOKEN_PREFIX)))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict) or claims.get("exp", 0) <= time.time():
+        return None
+    return claims
+
+
+class RevocationSet:
+    """Ids of revoked, not yet expired signed tokens, mirrored from `revoked_tokens`.
+
+    Logouts on this process apply immediately; logouts on other workers are picked up
+    by the periodic sync, so they take effect within one sync interval.
+    """
+
+    def __init__(self):
+        self._expiry_by_jti: dict[str, float] = {}
+        self._synced_until: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._expiry_by_jti
+
+    def __len__(self) -> int:
+        return len(self._expiry_by_jti)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._expiry_by_jti[jti] = expires_at
+
+    async def revoke(self, db: AsyncDatabase, jti: str, expires_at: float) -> None:
+        self.add(jti, expires_at)
+        now = datetime.now(timezone.utc)
+        try:
+            await db.revoked_tokens.insert_one(
+                {
+                    "jti": jti,
+                    "revoked_at": now,
+                    # TTL index: the row is dropped once the token would have expired anyway.
+                    "expires_at": datetime.fromtimestamp(expires_at, tz=timezone.utc),
+                }
+            )
+        except DuplicateKeyError:
+            pass
+
+    async def sync(self, db: AsyncDatabase) -> int:
+        now = datetime.now(timezone.utc)
+        query: dict = {"expires_at": {"$gt": now}}
+        if self._synced_until is not None:
+            query["revoked_at"] = {"$gte": self._synced_until - SYNC_OVERLAP}
+        rows = await db.revoked_tokens.find(query, {"_id": 0, "jti": 1, "expires_at": 1}).to_list()
+        for row in rows:
+            expires_at = row["expires_at"]
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            self.add(row["jti"], expires_at.timestamp())
+        self._synced_until = now
+
+        cutoff = time.time()
+        for jti in [jti for jti, expiry in self._expiry_by_jti.items() if expiry <= cutoff]:
+            del self._expiry_by_jti[jti]
+        return len(rows)
+
+    async def _sync_forever(self, db: AsyncDatabase, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.sync(db)
+            except PyMongoError:
+                logger.warning("Token revocation sync failed", exc_info=True)
+
+    async def start(self, db: AsyncDatabase, interval_seconds: float) -> None:
+        await self.sync(db)
+        self._task = asyncio.create_task(self._sync_forever(db, interval_seconds))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+revocations = RevocationSet()
@@ -0,0 +1 @@
+# Benchmark and load-test scripts (not imported by the app).
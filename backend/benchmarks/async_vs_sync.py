@@ -0,0 +1,155 @@
+"""
+Compare the blocking MongoClient path (sync `def` handler on the threadpool)
+with the AsyncMongoClient path (`async def` handler) under concurrent load.
+
+    cd backend
+    python -m benchmarks.async_vs_sync --requests 5000 --concurrency 200
+
+Requires a reachable MongoDB at MONGODB_URL. Each variant runs in its own
+uvicorn process so the load generator does not share its event loop.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import FastAPI
+
+from app.database import create_async_client, create_client, get_db
+from benchmarks.common import run_server, summarize
+
+BENCH_USER_ID = "bench_async_vs_sync_user"
+QUERY_LIMIT = 50
+
+
+@asynccontextmanager
+async def _sync_lifespan(app: FastAPI):
+    client = create_client()
+    app.state.db = get_db(client)
+    yield
+    client.close()
+
+
+@asynccontextmanager
+async def _async_lifespan(app: FastAPI):
+    client = create_async_client()
+    app.state.db = get_db(client)
+    yield
+    await client.close()
+
+
+sync_app = FastAPI(lifespan=_sync_lifespan)
+async_app = FastAPI(lifespan=_async_lifespan)
+
+
+@sync_app.get("/submissions")
+def sync_submissions() -> dict:
+    db = sync_app.state.db
+    items = list(
+        db.submissions.find({"user_id": BENCH_USER_ID}, {"_id": 0})
+        .sort("created_at", -1)
+        .limit(QUERY_LIMIT)
+    )
+    return {"items": items}
+
+
+@async_app.get("/submissions")
+async def async_submissions() -> dict:
+    db = async_app.state.db
+    items = (
+        await db.submissions.find({"user_id": BENCH_USER_ID}, {"_id": 0})
+        .sort("created_at", -1)
+        .limit(QUERY_LIMIT)
+        .to_list()
+    )
+    return {"items": items}
+
+
+def _prepare_data(rows: int) -> None:
+    client = create_client()
+    db = get_db(client)
+    db.submissions.delete_many({"user_id": BENCH_USER_ID})
+    db.submissions.insert_many(
+        [
+            {
+                "id": f"bench_submission_{idx}",
+                "activity_id": "bench_activity",
+                "user_id": BENCH_USER_ID,
+                "proof_text": "benchmark proof",
+                "status": "pending",
+                "created_at": f"2026-01-01T00:00:{idx % 60:02d}+00:00",
+            }
+            for idx in range(rows)
+        ]
+    )
+    client.close()
+
+
+def _cleanup_data() -> None:
+    client = create_client()
+    get_db(client).submissions.delete_many({"user_id": BENCH_USER_ID})
+    client.close()
+
+
+async def _drive(base_url: str, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/submissions")
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, elapsed, errors)
+
+
+def _run_variant(app_path: str, port: int, total: int, concurrency: int) -> dict:
+    with run_server(app_path, port) as base_url:
+        asyncio.run(_drive(base_url, min(total, 200), concurrency))  # warm-up
+        return asyncio.run(_drive(base_url, total, concurrency))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync vs async Mongo handler benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    _prepare_data(args.rows)
+    try:
+        results = {
+            variant: _run_variant(
+                f"benchmarks.async_vs_sync:{variant}_app",
+                args.port + offset,
+                args.requests,
+                args.concurrency,
+            )
+            for offset, variant in enumerate(("sync", "async"))
+        }
+    finally:
+        _cleanup_data()
+    print(json.dumps({"concurrency": args.concurrency, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Calendar sync cost for a first sync, an unchanged re-sync, a small edit and a day's roll.
+
+    cd backend
+    python -m benchmarks.calendar_sync --users 10000 --activities-per-user 3
+
+Seeds recurring activities into a throwaway database (default
+`<MONGODB_DB_NAME>_calendarbench`, dropped afterwards unless `--keep-data`) and syncs them
+to the in-memory FakeCalendarProvider. The unchanged re-sync should report zero provider
+calls; the edit pass changes `--edited` activities and should only touch their users.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+from app.database import create_async_client
+from app.indexes import ensure_indexes
+from app.services.calendar_service import FakeCalendarProvider
+from app.services.calendar_sync import sync_calendars
+
+RULES = (
+    "FREQ=DAILY;BYHOUR=7;BYMINUTE=0",
+    "FREQ=WEEKLY;BYDAY=MO,TH",
+    "FREQ=WEEKLY;INTERVAL=2;BYDAY=FR;BYHOUR=18;BYMINUTE=0",
+    "FREQ=MONTHLY;BYMONTHDAY=1",
+)
+PASS_KEYS = ("users", "users_changed", "created", "updated", "deleted", "provider_calls")
+
+
+async def _timed_sync(db, provider, now: datetime) -> dict:
+    started = time.perf_counter()
+    report = await sync_calendars(db, provider, now=now)
+    return {
+        **{key: report[key] for key in PASS_KEYS},
+        "errors": len(report["errors"]),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+async def _run(args) -> dict:
+    client = create_async_client()
+    db = client[args.db_name]
+    try:
+        await client.drop_database(args.db_name)
+        await ensure_indexes(db)
+        created_at = "2026-01-05T08:00:00+00:00"
+        activities = [
+            {
+                "id": f"bench_activity_{user}_{slot}",
+                "title": f"Activity {slot}",
+                "description": "Calendar sync benchmark",
+                "activity_type": "assigned",
+                "assigned_to_user_id": f"bench_user_{user}",
+                "recurrence_rule": RULES[(user + slot) % len(RULES)],
+                "created_at": created_at,
+            }
+            for user in range(args.users)
+            for slot in range(args.activities_per_user)
+        ]
+        for offset in range(0, len(activities), 10_000):
+            await db.activities.insert_many(activities[offset : offset + 10_000], ordered=False)
+
+        provider = FakeCalendarProvider()
+        now = datetime.now(timezone.utc)
+        passes = {"first": await _timed_sync(db, provider, now)}
+        passes["unchanged"] = await _timed_sync(db, provider, now + timedelta(minutes=5))
+        await db.activities.update_many(
+            {"id": {"$in": [activity["id"] for activity in activities[: args.edited]]}},
+            {"$set": {"title": "Renamed activity"}},
+        )
+        passes["edited"] = await _timed_sync(db, provider, now + timedelta(minutes=10))
+        passes["next_day"] = await _timed_sync(db, provider, now + timedelta(days=1))
+        return {"passes": passes, "provider": provider.stats()}
+    finally:
+        if not args.keep_data:
+            await client.drop_database(args.db_name)
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calendar sync benchmark")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--activities-per-user", type=int, default=3)
+    parser.add_argument("--edited", type=int, default=10)
+    parser.add_argument("--db-name", default=f"{settings.mongodb_db_name}_calendarbench")
+    parser.add_argument("--keep-data", action="store_true")
+    args = parser.parse_args()
+
+    if args.db_name == settings.mongodb_db_name:
+        parser.error("Refusing to benchmark against the application database")
+    report = asyncio.run(_run(args))
+    print(json.dumps({"users": args.users, **report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Signature and lookup cost of the near-duplicate index as it grows.
+
+    cd backend
+    python -m benchmarks.duplicate_index --submissions 200000 --checks 2000
+
+Fills a DuplicateIndex with synthetic proof texts, then times `check_duplicates` for
+lightly edited copies of indexed texts (which should be flagged) and for fresh texts
+(which should not). No MongoDB needed.
+"""
+
+import argparse
+import json
+import random
+import resource
+import time
+
+from app.services.duplicate_service import check_duplicates, duplicates, index_submission, minhash
+from benchmarks.common import percentile
+
+CREATED_AT = "2026-01-01T00:00:00+00:00"
+SYLLABLES = "ka ri to mu se la po ne vi da go hu be ly fi zo ta me ro su".split()
+
+
+def _vocabulary(rng: random.Random, size: int = 5000) -> tuple[list[str], list[float]]:
+    words = sorted({"".join(rng.choices(SYLLABLES, k=rng.randint(1, 4))) for _ in range(size)})
+    rng.shuffle(words)
+    # Zipf-like frequencies, so common words recur across texts as they do in real proofs.
+    return words, [1 / rank for rank in range(1, len(words) + 1)]
+
+
+def _text(rng: random.Random, vocabulary: tuple[list[str], list[float]]) -> str:
+    words, weights = vocabulary
+    return " ".join(rng.choices(words, weights, k=rng.randint(12, 60)))
+
+
+def _edit(text: str, rng: random.Random, vocabulary: tuple[list[str], list[float]]) -> str:
+    words = text.split()
+    words[rng.randrange(len(words))] = rng.choice(vocabulary[0])
+    return " ".join(words)
+
+
+def _timed(texts: list[str], prefix: str) -> tuple[list[float], int]:
+    latencies, flagged = [], 0
+    for idx, text in enumerate(texts):
+        started = time.perf_counter()
+        fields = check_duplicates(text)
+        index_submission({"id": f"{prefix}_{idx}", "created_at": CREATED_AT, **fields})
+        latencies.append(time.perf_counter() - started)
+        flagged += fields["possible_duplicate"]
+    return latencies, flagged
+
+
+def _summary(latencies: list[float], flagged: int) -> dict:
+    return {
+        "checks": len(latencies),
+        "flagged": flagged,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Near-duplicate index benchmark")
+    parser.add_argument("--submissions", type=int, default=200_000)
+    parser.add_argument("--checks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = _vocabulary(rng)
+    texts = [_text(rng, vocabulary) for _ in range(args.submissions)]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    for idx, text in enumerate(texts):
+        duplicates.add(f"bench_{idx}", minhash(text), CREATED_AT)
+    build_seconds = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    edited, edited_flagged = _timed(
+        [_edit(rng.choice(texts), rng, vocabulary) for _ in range(args.checks)], "edited"
+    )
+    fresh, fresh_flagged = _timed(
+        [_text(rng, vocabulary) for _ in range(args.checks)], "fresh"
+    )
+    report = {
+        "submissions": args.submissions,
+        "build_s": round(build_seconds, 2),
+        "index_rss_mb": round((rss_after - rss_before) / 1024, 1),
+        "index": duplicates.stats(),
+        "edited": _summary(edited, edited_flagged),
+        "fresh": _summary(fresh, fresh_flagged),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
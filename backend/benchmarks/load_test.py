@@ -0,0 +1,240 @@
+"""
+Endpoint load test against a synthetic dataset.
+
+    cd backend
+    python -m benchmarks.load_test --users 1000 --activities 200 --submissions 100000 \\
+        --duration 30 --concurrency 50 --output load_test.json
+
+Seeds a throwaway database (default `<MONGODB_DB_NAME>_loadtest`, dropped afterwards),
+starts the real app against it in a uvicorn child process, and drives a weighted mix of
+auth, activities, submissions, progress, rewards and admin requests concurrently.
+Per-endpoint throughput and p50/p95/p99 are written as JSON.
+
+For CI, pass `--baseline previous.json --max-regression 0.25` to exit non-zero when any
+endpoint's p99 is more than 25% slower than the baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.config import settings
+from app.database import create_async_client
+from app.seed_data import FIXTURE_ADMIN_EMAIL, FIXTURE_PASSWORD, fixture_email, generate_fixtures
+from benchmarks.common import run_server, summarize
+
+TOKEN_POOL_SIZE = 50
+
+RequestFactory = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+class Scenario:
+    def __init__(self, user_count: int, pending_ids: list[str], rng: random.Random):
+        self.user_count = user_count
+        self.pending_ids = pending_ids
+        self.rng = rng
+        self.user_tokens: list[str] = []
+        self.admin_token = ""
+
+    async def login(self, client: httpx.AsyncClient, email: str) -> httpx.Response:
+        return await client.post(
+            "/api/auth/login", json={"email": email, "password": FIXTURE_PASSWORD}
+        )
+
+    async def prepare(self, client: httpx.AsyncClient) -> None:
+        response = await self.login(client, FIXTURE_ADMIN_EMAIL)
+        response.raise_for_status()
+        self.admin_token = response.json()["access_token"]
+        for idx in self.rng.sample(range(self.user_count), min(TOKEN_POOL_SIZE, self.user_count)):
+            response = await self.login(client, fixture_email(idx))
+            response.raise_for_status()
+            self.user_tokens.append(response.json()["access_token"])
+
+    def _user(self) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.user_tokens)}"}
+
+    def _admin(self) -> dict:
+        return {"Authorization": f"Bearer {self.admin_token}"}
+
+    def _get(self, path: str, admin: bool = False, params: dict | None = None) -> RequestFactory:
+        async def send(client: httpx.AsyncClient) -> httpx.Response:
+            headers = self._admin() if admin else self._user()
+            return await client.get(path, params=params, headers=headers)
+
+        return send
+
+    async def _login_random_user(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await self.login(client, fixture_email(self.rng.randrange(self.user_count)))
+
+    async def _create_submission(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post(
+            "/api/submissions",
+            json={"activity_id": "fixture_activity_0", "proof_text": "Load test proof."},
+            headers=self._user(),
+        )
+
+    async def _approve_pending(self, client: httpx.AsyncClient) -> httpx.Response:
+        submission_id = self.pending_ids.pop() if self.pending_ids else "fixture_submission_0"
+        return await client.patch(
+            f"/api/admin/submissions/{submission_id}/approve",
+            json={"feedback": "Load test approval."},
+            headers=self._admin(),
+        )
+
+    def requests(self) -> list[tuple[str, int, RequestFactory]]:
+        # (endpoint name, relative weight, request factory)
+        return [
+            ("POST /auth/login", 1, self._login_random_user),
+            ("GET /auth/me", 10, self._get("/api/auth/me")),
+            ("GET /activities", 15, self._get("/api/activities")),
+            ("GET /submissions", 15, self._get("/api/submissions")),
+            ("POST /submissions", 5, self._create_submission),
+            ("GET /progress/me", 15, self._get("/api/progress/me")),
+            ("GET /rewards/me", 10, self._get("/api/rewards/me")),
+            ("GET /admin/dashboard", 5, self._get("/api/admin/dashboard", admin=True)),
+            (
+                "GET /admin/submissions",
+                5,
+                self._get("/api/admin/submissions", admin=True, params={"status": "pending"}),
+            ),
+            ("GET /admin/users", 2, self._get("/api/admin/users", admin=True)),
+            ("PATCH /admin/submissions/approve", 2, self._approve_pending),
+        ]
+
+
+async def _drive(base_url: str, scenario: Scenario, duration: float, concurrency: int) -> dict:
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await scenario.prepare(client)
+        mix = scenario.requests()
+        names = [name for name, _, _ in mix]
+        weights = [weight for _, weight, _ in mix]
+        factories = {name: factory for name, _, factory in mix}
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                name = scenario.rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    response = await factories[name](client)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                if failed:
+                    errors[name] = errors.get(name, 0) + 1
+                    continue
+                latencies.setdefault(name, []).append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {
+        name: summarize(latencies.get(name, []), elapsed, errors.get(name, 0)) for name in names
+    }
+    all_latencies = [value for samples in latencies.values() for value in samples]
+    total = summarize(all_latencies, elapsed, sum(errors.values()))
+    return {"endpoints": endpoints, "total": total}
+
+
+def _regressions(results: dict, baseline_path: str, max_regression: float) -> list[str]:
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)["results"]["endpoints"]
+    failures = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get(name)
+        if not previous or not previous["p99_ms"]:
+            continue
+        if current["p99_ms"] > previous["p99_ms"] * (1 + max_regression):
+            failures.append(f"{name}: p99 {previous['p99_ms']}ms -> {current['p99_ms']}ms")
+    return failures
+
+
+async def _seed(db_name: str, args) -> dict:
+    client = create_async_client()
+    try:
+        await client.drop_database(db_name)
+        dataset = await generate_fixtures(
+            client[db_name], args.users, args.activities, args.submissions
+        )
+    finally:
+        await client.close()
+    return dataset
+
+
+async def _drop(db_name: str) -> None:
+    client = create_async_client()
+    try:
+        await client.drop_database(db_name)
+    finally:
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Endpoint load test")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--activities", type=int, default=200)
+    parser.add_argument("--submissions", type=int, default=50_000)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-name", default=f"{settings.mongodb_db_name}_loadtest")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    parser.add_argument("--baseline", help="Previous JSON report to compare p99 against")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--keep-data", action="store_true")
+    args = parser.parse_args()
+
+    if args.db_name == settings.mongodb_db_name:
+        parser.error("Refusing to load-test against the application database")
+
+    seed_started = time.perf_counter()
+    dataset = asyncio.run(_seed(args.db_name, args))
+    seed_seconds = time.perf_counter() - seed_started
+
+    env = {"MONGODB_DB_NAME": args.db_name, "AUTO_SEED_DATA": "false"}
+    scenario = Scenario(args.users, dataset["pending_ids"], random.Random(7))
+    try:
+        with run_server("app.main:app", args.port, env) as base_url:
+            results = asyncio.run(_drive(base_url, scenario, args.duration, args.concurrency))
+    finally:
+        if not args.keep_data:
+            asyncio.run(_drop(args.db_name))
+
+    report = {
+        "config": {
+            "users": args.users,
+            "activities": args.activities,
+            "submissions": args.submissions,
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+        },
+        "dataset": {**dataset["inserted"], "seed_seconds": round(seed_seconds, 2)},
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output)
+
+    if args.baseline:
+        failures = _regressions(results, args.baseline, args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Login throughput with password hashing on the process pool, plus the latency of an
+unrelated endpoint (/health) measured during the login burst.
+
+    cd backend
+    python -m benchmarks.login_throughput --logins 500 --concurrency 50
+
+Requires a reachable MongoDB at MONGODB_URL; a throwaway user is registered and
+removed again. Pass --iterations to compare KDF costs.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import httpx
+
+from app.database import create_client, get_db
+from benchmarks.common import run_server, summarize
+
+BENCH_PASSWORD = "BenchPassword123!"
+
+
+async def _timed_get(client: httpx.AsyncClient, path: str, latencies: list[float]) -> bool:
+    started = time.perf_counter()
+    try:
+        response = await client.get(path)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return False
+    latencies.append(time.perf_counter() - started)
+    return True
+
+
+async def _drive(base_url: str, email: str, total: int, concurrency: int) -> dict:
+    login_latencies: list[float] = []
+    health_latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        register = await client.post(
+            "/api/auth/register",
+            json={"name": "Bench User", "email": email, "password": BENCH_PASSWORD},
+        )
+        register.raise_for_status()
+        done = asyncio.Event()
+
+        async def login_worker() -> None:
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        "/api/auth/login", json={"email": email, "password": BENCH_PASSWORD}
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                login_latencies.append(time.perf_counter() - started)
+
+        async def health_probe() -> None:
+            while not done.is_set():
+                await _timed_get(client, "/health", health_latencies)
+                await asyncio.sleep(0.01)
+
+        probe = asyncio.create_task(health_probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe
+
+    return {
+        "login": summarize(login_latencies, elapsed, errors),
+        "health_during_burst": summarize(health_latencies, elapsed),
+    }
+
+
+def _cleanup(email: str) -> None:
+    client = create_client()
+    db = get_db(client)
+    user = db.users.find_one_and_delete({"email": email})
+    if user:
+        db.sessions.delete_many({"user_id": user["id"]})
+    client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="PROCESS_POOL_WORKERS")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    env = {"AUTO_SEED_DATA": "false"}
+    if args.iterations:
+        env["PASSWORD_HASH_ITERATIONS"] = str(args.iterations)
+    if args.workers is not None:
+        env["PROCESS_POOL_WORKERS"] = str(args.workers)
+
+    email = f"bench-{uuid4().hex[:12]}@ownmerits.org"
+    try:
+        with run_server("app.main:app", args.port, env) as base_url:
+            results = asyncio.run(_drive(base_url, email, args.logins, args.concurrency))
+    finally:
+        _cleanup(email)
+    print(json.dumps({"concurrency": args.concurrency, **env, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
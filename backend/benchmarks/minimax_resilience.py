@@ -0,0 +1,119 @@
+"""
+Latency and fallback behaviour of MiniMaxClient while the local stub misbehaves.
+
+    cd backend
+    python -m benchmarks.minimax_resilience --calls 500 --distinct 100 --timeout 1
+
+Each phase sends `--waves` bursts of `--calls` chat completions (drawn from `--distinct`
+prompts, so identical prompts overlap in flight) through one client, after waiting
+`--reset` seconds so the breaker may probe again:
+
+    healthy    stub answers normally
+    outage     every call is a 503; the breaker opens and the next wave fails fast
+    slow       calls outlive `--timeout`; they fail at the deadline instead of hanging
+    malformed  200 responses with no choices
+    recovered  stub is healthy again; the probe succeeds and the breaker closes
+
+Per wave: p50/p95/max latency, outcomes, upstream requests the stub saw, and the
+breaker state afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from app.services.minimax_client import MiniMaxClient, MiniMaxUnavailable
+from benchmarks.common import percentile, run_server
+
+PHASES = {
+    "healthy": {"mode": "ok"},
+    "outage": {"mode": "error"},
+    "slow": {"mode": "ok", "slow": True},
+    "malformed": {"mode": "malformed"},
+    "recovered": {"mode": "ok"},
+}
+
+
+async def _burst(client: MiniMaxClient, prompts: list[str]) -> dict:
+    latencies: list[float] = []
+    outcomes = {"ok": 0, "unavailable": 0}
+
+    async def call(prompt: str) -> None:
+        started = time.perf_counter()
+        try:
+            await client.chat("Write a reminder.", prompt)
+            outcomes["ok"] += 1
+        except MiniMaxUnavailable:
+            outcomes["unavailable"] += 1
+        latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(call(prompt) for prompt in prompts))
+    return {
+        **outcomes,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1),
+    }
+
+
+async def _run(base_url: str, args: argparse.Namespace) -> dict:
+    client = MiniMaxClient(
+        base_url=base_url,
+        api_key="bench",
+        model="stub",
+        timeout_seconds=args.timeout,
+        connect_timeout_seconds=1.0,
+        max_connections=args.concurrency,
+        failure_threshold=args.failure_threshold,
+        reset_seconds=args.reset,
+        queue_timeout_seconds=args.queue_timeout,
+    )
+    control = httpx.AsyncClient(base_url=base_url)
+    report = {}
+    try:
+        for phase, faults in PHASES.items():
+            latency_ms = args.timeout * 3000 if faults.get("slow") else args.latency_ms
+            await control.post("/faults", json={"mode": faults["mode"], "latency_ms": latency_ms})
+            await asyncio.sleep(args.reset)
+            report[phase] = []
+            for _ in range(args.waves):
+                before = (await control.get("/stats")).json()["requests"]
+                prompts = [
+                    f"Activity {random.randrange(args.distinct)}" for _ in range(args.calls)
+                ]
+                result = await _burst(client, prompts)
+                after = (await control.get("/stats")).json()["requests"]
+                report[phase].append(
+                    {**result, "upstream_requests": after - before, **client.stats()}
+                )
+    finally:
+        await control.aclose()
+        await client.aclose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MiniMax client resilience benchmark")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=100)
+    parser.add_argument("--waves", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--queue-timeout", type=float, default=30.0)
+    parser.add_argument("--failure-threshold", type=int, default=5)
+    parser.add_argument("--reset", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=8791)
+    args = parser.parse_args()
+
+    with run_server("benchmarks.minimax_stub:app", args.port) as base_url:
+        report = asyncio.run(_run(base_url, args))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Local stand-in for the MiniMax chat completion API, for benchmarks and manual testing.
+
+    cd backend
+    MINIMAX_STUB_LATENCY_MS=300 MINIMAX_STUB_FAILURE_RATE=0.05 \
+        uvicorn benchmarks.minimax_stub:app --port 8791
+
+Then run the API with MINIMAX_BASE_URL=http://127.0.0.1:8791 and any MINIMAX_API_KEY.
+
+Faults can be changed while it runs with POST /faults: `{"mode": "error"}` (every call
+is a 503), `{"mode": "malformed"}` (200 with no choices), `{"latency_ms": 30000}` (calls
+outlive the client's timeout) and `{"mode": "ok", "latency_ms": 200}` to recover.
+GET /stats reports requests served, injected failures and the peak number of requests in
+flight at once, which shows whether the caller's concurrency limit holds.
+"""
+
+import asyncio
+import os
+import random
+
+from fastapi import FastAPI, HTTPException
+
+FAULT_MODES = ("ok", "error", "malformed")
+
+app = FastAPI(title="MiniMax stub")
+_faults = {
+    "mode": os.getenv("MINIMAX_STUB_MODE", "ok"),
+    "latency_ms": float(os.getenv("MINIMAX_STUB_LATENCY_MS", "200")),
+    "failure_rate": float(os.getenv("MINIMAX_STUB_FAILURE_RATE", "0")),
+}
+_counters = {"requests": 0, "failed": 0, "in_flight": 0, "peak_in_flight": 0}
+
+
+def _reply(messages: list[dict]) -> str:
+    system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+    user = next((m["content"] for m in messages if m.get("role") == "user"), "")
+    if "RRULE" in system:
+        return "NONE"
+    activity = user.splitlines()[0].removeprefix("Activity: ") if user else "your activity"
+    return f"You've got this: {activity} is next, and every step you take counts."
+
+
+@app.post("/v1/text/chatcompletion_v2")
+async def chat_completion(body: dict) -> dict:
+    _counters["requests"] += 1
+    _counters["in_flight"] += 1
+    _counters["peak_in_flight"] = max(_counters["peak_in_flight"], _counters["in_flight"])
+    try:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * _faults["latency_ms"] / 1000)
+        if _faults["mode"] == "error" or random.random() < _faults["failure_rate"]:
+            _counters["failed"] += 1
+            raise HTTPException(status_code=503, detail="Injected failure")
+    finally:
+        _counters["in_flight"] -= 1
+    if _faults["mode"] == "malformed":
+        _counters["failed"] += 1
+        return {"model": body.get("model"), "choices": []}
+    return {
+        "model": body.get("model"),
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": _reply(body["messages"])}}
+        ],
+    }
+
+
+@app.post("/faults")
+async def set_faults(body: dict) -> dict:
+    if body.get("mode", _faults["mode"]) not in FAULT_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {FAULT_MODES}")
+    _faults.update({key: body[key] for key in _faults if key in body})
+    return dict(_faults)
+
+
+@app.get("/stats")
+async def stats() -> dict:
+    return {**_counters, "faults": dict(_faults)}
@@ -0,0 +1,94 @@
+"""
+Reminders/sec through generate_reminder_batch against the local MiniMax stub.
+
+    cd backend
+    python -m benchmarks.reminder_batch --reminders 5000 --unique 500 --latency-ms 200
+
+A campaign of `--reminders` payloads drawn from `--unique` distinct inputs is generated
+in `--batch-size` chunks, once against an empty cache and once warm, for each
+`--concurrency` level (MINIMAX_MAX_CONCURRENCY). Model calls should equal the number of
+distinct inputs on the cold pass and zero on the warm one.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from app.config import settings
+from app.schemas import ReminderRequest
+from app.services.minimax_client import close_minimax_client
+from app.services.minimax_service import generate_reminder_batch, reminder_cache
+from benchmarks.common import run_server
+
+
+def _campaign(total: int, unique: int) -> list[ReminderRequest]:
+    inputs = [
+        (f"Activity {idx % 97}", f"Mon {idx % 28 + 1:02d} Nov, 09:00", idx % 14 or None)
+        for idx in range(unique)
+    ]
+    return [
+        ReminderRequest(
+            user_id=f"user_{idx}",
+            activity_title=title,
+            due_label=due_label,
+            last_completion_days_ago=days,
+        )
+        for idx, (title, due_label, days) in enumerate(random.choices(inputs, k=total))
+    ]
+
+
+async def _run_pass(payloads: list[ReminderRequest], batch_size: int) -> dict:
+    totals = {"generated": 0, "cache_hits": 0, "fallbacks": 0}
+    started = time.perf_counter()
+    for offset in range(0, len(payloads), batch_size):
+        summary = (await generate_reminder_batch(payloads[offset : offset + batch_size]))[
+            "summary"
+        ]
+        for key in totals:
+            totals[key] += summary[key]
+    elapsed = time.perf_counter() - started
+    # The pooled client belongs to this event loop; the next pass runs on a new one.
+    await close_minimax_client()
+    return {
+        **totals,
+        "elapsed_s": round(elapsed, 3),
+        "reminders_per_s": round(len(payloads) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batched reminder generation benchmark")
+    parser.add_argument("--reminders", type=int, default=5000)
+    parser.add_argument("--unique", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8791)
+    args = parser.parse_args()
+
+    env = {
+        "MINIMAX_STUB_LATENCY_MS": str(args.latency_ms),
+        "MINIMAX_STUB_FAILURE_RATE": str(args.failure_rate),
+    }
+    payloads = _campaign(args.reminders, args.unique)
+    results = {}
+    with run_server("benchmarks.minimax_stub:app", args.port, env) as base_url:
+        settings.minimax_base_url = base_url
+        settings.minimax_api_key = "bench"
+        for level in [int(value) for value in args.concurrency.split(",")]:
+            settings.minimax_max_concurrency = level
+            reminder_cache.clear()
+            cold = asyncio.run(_run_pass(payloads, args.batch_size))
+            warm = asyncio.run(_run_pass(payloads, args.batch_size))
+            results[level] = {"cold": cold, "warm": warm}
+        results["stub_stats"] = httpx.get(f"{base_url}/stats").json()
+    print(json.dumps({**env, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Serialization time and peak memory for a large list response, per JSON path.
+
+    cd backend
+    python -m benchmarks.serialization --items 10000 --repeat 20
+
+"encode" times only the step that turns the handler's dict into bytes. "endpoint"
+drives a `-> dict` list handler in-process (no network, no MongoDB), once per
+`JSON_RESPONSE_BACKEND`, so FastAPI's response validation is included. Backends
+whose library is not installed are skipped.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+import httpx
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.responses import JSON_RESPONSE_CLASSES, default_response_class, msgspec, orjson
+from benchmarks.common import percentile
+
+
+def _payload(count: int) -> dict:
+    items = [
+        {
+            "id": f"submission_{idx}",
+            "activity_id": f"activity_{idx % 50}",
+            "user_id": f"user_{idx % 1000}",
+            "status": ("pending", "approved", "rejected")[idx % 3],
+            "proof_text": "Completed the task and attached notes. " * 8,
+            "proof_image_url": None,
+            "created_at": "2026-01-01T12:00:00.000000+00:00",
+            "reviewed_at": None,
+            "review_feedback": None,
+        }
+        for idx in range(count)
+    ]
+    return {"items": items, "next_cursor": "WyIyMDI2LTAxLTAxIiwic3VibWlzc2lvbl8wIl0"}
+
+
+def _encoders() -> dict:
+    adapter = TypeAdapter(dict)
+    encoders = {
+        "jsonable_encoder+json": lambda content: json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "pydantic dump_json": lambda content: adapter.dump_json(adapter.validate_python(content)),
+    }
+    if orjson is not None:
+        encoders["orjson"] = orjson.dumps
+    if msgspec is not None:
+        encoders["msgspec"] = msgspec.json.Encoder().encode
+    return encoders
+
+
+def _measure(func, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "p50_ms": round(percentile(timings, 50) * 1000, 2),
+        "p95_ms": round(percentile(timings, 95) * 1000, 2),
+        "peak_mib": round(peak / (1024 * 1024), 2),
+    }
+
+
+def _endpoint_app(backend: str, payload: dict) -> FastAPI:
+    app = FastAPI(default_response_class=default_response_class(backend))
+
+    @app.get("/items")
+    async def list_items() -> dict:
+        return payload
+
+    return app
+
+
+def _measure_endpoint(backend: str, payload: dict, repeat: int) -> dict:
+    loop = asyncio.new_event_loop()
+    transport = httpx.ASGITransport(app=_endpoint_app(backend, payload))
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+    def request() -> None:
+        response = loop.run_until_complete(client.get("/items"))
+        response.raise_for_status()
+
+    try:
+        result = _measure(request, repeat)
+        result["bytes"] = len(loop.run_until_complete(client.get("/items")).content)
+        return result
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = _payload(args.items)
+    report = {"items": args.items, "encode": {}, "endpoint": {}}
+    for name, encode in _encoders().items():
+        report["encode"][name] = _measure(lambda: encode(payload), args.repeat)
+
+    backends = ["default"] + [
+        name for name, (_, module) in JSON_RESPONSE_CLASSES.items() if module is not None
+    ]
+    for backend in backends:
+        report["endpoint"][backend] = _measure_endpoint(backend, payload, args.repeat)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Local stand-in for the eVoucher provider, for benchmarks and manual testing.
+
+    cd backend
+    VOUCHER_STUB_LATENCY_MS=50 VOUCHER_STUB_FAILURE_RATE=0.1 \
+        uvicorn benchmarks.voucher_stub:app --port 8790
+
+Then run the API with EVOUCHER_BASE_URL=http://127.0.0.1:8790 and any EVOUCHER_API_KEY.
+Requests carrying an Idempotency-Key that was already served get the original voucher
+back, so `issued` in GET /stats counts distinct vouchers.
+"""
+
+import asyncio
+import os
+import random
+from uuid import uuid4
+
+from fastapi import FastAPI, Header, HTTPException
+
+LATENCY_MS = float(os.getenv("VOUCHER_STUB_LATENCY_MS", "20"))
+FAILURE_RATE = float(os.getenv("VOUCHER_STUB_FAILURE_RATE", "0"))
+
+app = FastAPI(title="eVoucher stub")
+_vouchers_by_key: dict[str, dict] = {}
+_counters = {"requests": 0, "replayed": 0, "failed": 0}
+
+
+@app.post("/vouchers")
+async def issue_voucher(
+    body: dict,
+    idempotency_key: str | None = Header(default=None),
+) -> dict:
+    _counters["requests"] += 1
+    await asyncio.sleep(random.uniform(0.5, 1.5) * LATENCY_MS / 1000)
+    if random.random() < FAILURE_RATE:
+        _counters["failed"] += 1
+        raise HTTPException(status_code=503, detail="Injected failure")
+    if not idempotency_key:
+        raise HTTPException(status_code=400, detail="Idempotency-Key header required")
+
+    existing = _vouchers_by_key.get(idempotency_key)
+    if existing:
+        _counters["replayed"] += 1
+        return existing
+    voucher = {
+        "id": str(uuid4()),
+        "code": f"STUB-{uuid4().hex[:10].upper()}",
+        "recipient_id": body.get("recipient_id"),
+        "reference": body.get("reference"),
+        "value": 10,
+        "currency": "GBP",
+        "retailer": "Stub Retailer",
+    }
+    _vouchers_by_key[idempotency_key] = voucher
+    return voucher
+
+
+@app.get("/stats")
+async def stats() -> dict:
+    return {**_counters, "issued": len(_vouchers_by_key)}
@@ -0,0 +1,91 @@
+"""
+Vouchers/sec through VoucherClient against the local stub at several concurrency levels.
+
+    cd backend
+    python -m benchmarks.voucher_throughput --vouchers 2000 --latency-ms 20 --failure-rate 0.05
+
+Each level issues vouchers for fresh submission ids, then replays a sample of them to
+check that retries never create a second voucher for the same submission.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import httpx
+
+from app.services.voucher_service import VoucherClient, VoucherProviderError
+from benchmarks.common import run_server, summarize
+
+
+async def _run_level(base_url: str, total: int, concurrency: int, max_retries: int) -> dict:
+    client = VoucherClient(
+        base_url=base_url,
+        api_key="bench",
+        timeout_seconds=5,
+        max_retries=max_retries,
+        max_connections=concurrency,
+        retry_backoff_seconds=0.05,
+    )
+    submission_ids = [f"bench-{uuid4().hex}" for _ in range(total)]
+    latencies: list[float] = []
+    codes: dict[str, str] = {}
+    errors = 0
+
+    async def issue(submission_id: str) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            reward = await client.issue_voucher("bench-user", submission_id)
+        except VoucherProviderError:
+            errors += 1
+            return
+        latencies.append(time.perf_counter() - started)
+        codes[submission_id] = reward["voucher_code"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(issue(submission_id) for submission_id in submission_ids))
+    elapsed = time.perf_counter() - started
+
+    replay_ids = list(codes)[: max(1, total // 10)]
+    replayed = await asyncio.gather(
+        *(client.issue_voucher("bench-user", submission_id) for submission_id in replay_ids),
+        return_exceptions=True,
+    )
+    duplicates = sum(
+        1
+        for submission_id, reward in zip(replay_ids, replayed)
+        if isinstance(reward, dict) and reward["voucher_code"] != codes[submission_id]
+    )
+    await client.aclose()
+    return {**summarize(latencies, elapsed, errors), "duplicate_vouchers_on_replay": duplicates}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Voucher client throughput benchmark")
+    parser.add_argument("--vouchers", type=int, default=2000)
+    parser.add_argument("--levels", default="1,10,50,100")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    env = {
+        "VOUCHER_STUB_LATENCY_MS": str(args.latency_ms),
+        "VOUCHER_STUB_FAILURE_RATE": str(args.failure_rate),
+    }
+    results = {}
+    with run_server("benchmarks.voucher_stub:app", args.port, env) as base_url:
+        for level in [int(value) for value in args.levels.split(",")]:
+            results[level] = asyncio.run(
+                _run_level(base_url, args.vouchers, level, args.max_retries)
+            )
+        results["stub_stats"] = httpx.get(f"{base_url}/stats").json()
+    print(json.dumps({**env, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
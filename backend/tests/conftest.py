@@ -0,0 +1,61 @@
+import mongomock
+import pytest
+from pymongo import UpdateOne
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self._documents = list(documents)
+
+    async def to_list(self, length=None):
+        return self._documents if length is None else self._documents[:length]
+
+    def __aiter__(self):
+        self._iterator = iter(self._documents)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class _Collection:
+    """The slice of AsyncCollection the services under test use, over mongomock."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return _Cursor(self._collection.find(*args, **kwargs))
+
+    async def aggregate(self, pipeline, **kwargs):
+        return _Cursor(self._collection.aggregate(pipeline))
+
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            assert isinstance(request, UpdateOne)
+            self._collection.update_one(request._filter, request._doc, upsert=request._upsert)
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+class _Database:
+    def __init__(self):
+        self._database = mongomock.MongoClient().db
+        self._database.user_progress.create_index("user_id", unique=True)
+
+    def __getattr__(self, name):
+        return _Collection(self._database[name])
+
+
+@pytest.fixture
+def db():
+    return _Database()
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.metrics import MetricsMiddleware, http_requests_total
+from app.routers.metrics import router as metrics_router
+
+
+def test_route_label_keeps_the_include_and_mount_prefixes():
+    router = APIRouter(prefix="/things")
+
+    @router.get("/{thing_id}")
+    async def read_thing(thing_id: str) -> dict:
+        return {"id": thing_id}
+
+    mounted = FastAPI()
+    mounted.include_router(router)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.mount("/v2", mounted)
+    app.add_middleware(MetricsMiddleware)
+
+    with TestClient(app) as client:
+        assert client.get("/api/things/1").status_code == 200
+        assert client.get("/v2/things/1").status_code == 200
+
+    assert http_requests_total.value("GET", "/api/things/{thing_id}", "200") == 1
+    assert http_requests_total.value("GET", "/v2/things/{thing_id}", "200") == 1
+
+
+def test_metrics_endpoint_requires_the_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    app = FastAPI()
+    app.include_router(metrics_router)
+
+    with TestClient(app) as client:
+        assert client.get("/metrics").status_code == 401
+        wrong = {"Authorization": "Bearer guess"}
+        assert client.get("/metrics", headers=wrong).status_code == 401
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+    assert response.status_code == 200
+    assert "ownmerits_http_requests_total" in response.text
+
+
+def test_metrics_endpoint_needs_a_session_without_a_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "")
+    app = FastAPI()
+    app.state.db = None
+    app.include_router(metrics_router)
+
+    with TestClient(app) as client:
+        assert client.get("/metrics").status_code == 401
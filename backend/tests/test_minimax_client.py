@@ -0,0 +1,173 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.minimax_client import MiniMaxClient, MiniMaxUnavailable
+
+
+def _client(
+    handler,
+    max_connections: int = 4,
+    timeout_seconds: float = 1.0,
+    queue_timeout_seconds: float = 1.0,
+    failure_threshold: int = 3,
+    reset_seconds: float = 30.0,
+) -> MiniMaxClient:
+    return MiniMaxClient(
+        base_url="http://minimax.test",
+        api_key="test-key",
+        model="test-model",
+        timeout_seconds=timeout_seconds,
+        connect_timeout_seconds=timeout_seconds,
+        max_connections=max_connections,
+        failure_threshold=failure_threshold,
+        reset_seconds=reset_seconds,
+        queue_timeout_seconds=queue_timeout_seconds,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def _reply(content: str = "Keep going!") -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+async def _outcomes(client: MiniMaxClient, texts: list[str]) -> list[str | Exception]:
+    async def call(text: str) -> str | Exception:
+        try:
+            return await client.chat("Write a reminder.", text)
+        except MiniMaxUnavailable as exc:
+            return exc
+
+    try:
+        return list(await asyncio.gather(*(call(text) for text in texts)))
+    finally:
+        await client.aclose()
+
+
+def test_breaker_opens_after_consecutive_provider_failures():
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        return httpx.Response(503)
+
+    client = _client(handler, failure_threshold=3)
+
+    async def run() -> None:
+        for text in ("a", "b", "c"):
+            with pytest.raises(MiniMaxUnavailable, match="HTTP 503"):
+                await client.chat("Write a reminder.", text)
+        assert client.breaker.state == "open"
+        with pytest.raises(MiniMaxUnavailable, match="circuit is open"):
+            await client.chat("Write a reminder.", "d")
+        await client.aclose()
+
+    asyncio.run(run())
+    assert attempts == 3
+
+
+def test_request_timeouts_count_as_failures():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+        return _reply()
+
+    client = _client(handler, timeout_seconds=0.05, failure_threshold=2)
+    results = asyncio.run(_outcomes(client, ["a", "b"]))
+
+    assert all(isinstance(result, MiniMaxUnavailable) for result in results)
+    assert client.breaker.state == "open"
+
+
+def test_deadline_starts_once_a_slot_is_held():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return _reply()
+
+    # Each request fits its own 0.15s deadline even though the last one queues for 0.2s.
+    client = _client(handler, max_connections=1, timeout_seconds=0.15)
+    results = asyncio.run(_outcomes(client, ["a", "b", "c", "d", "e"]))
+
+    assert results == ["Keep going!"] * 5
+    assert client.breaker.state == "closed"
+
+
+def test_queue_saturation_leaves_the_breaker_closed():
+    attempts = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.2)
+        return _reply()
+
+    client = _client(handler, max_connections=1, queue_timeout_seconds=0.05, failure_threshold=1)
+    results = asyncio.run(_outcomes(client, [str(i) for i in range(10)]))
+
+    assert results[0] == "Keep going!"
+    assert all(isinstance(result, MiniMaxUnavailable) for result in results[1:])
+    assert attempts == 1
+    assert client.breaker.state == "closed"
+    assert client.breaker.consecutive_failures == 0
+
+
+def test_half_open_probe_closes_the_breaker_again():
+    healthy = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return _reply() if healthy else httpx.Response(500)
+
+    client = _client(handler, failure_threshold=1, reset_seconds=0.05)
+
+    async def run() -> None:
+        nonlocal healthy
+        with pytest.raises(MiniMaxUnavailable):
+            await client.chat("Write a reminder.", "a")
+        assert client.breaker.state == "open"
+
+        healthy = True
+        with pytest.raises(MiniMaxUnavailable, match="circuit is open"):
+            await client.chat("Write a reminder.", "b")
+        await asyncio.sleep(0.06)
+        assert client.breaker.state == "half_open"
+
+        assert await client.chat("Write a reminder.", "c") == "Keep going!"
+        assert client.breaker.state == "closed"
+        await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_failed_probe_reopens_the_breaker():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500)
+
+    client = _client(handler, failure_threshold=1, reset_seconds=0.05)
+
+    async def run() -> None:
+        with pytest.raises(MiniMaxUnavailable):
+            await client.chat("Write a reminder.", "a")
+        await asyncio.sleep(0.06)
+        with pytest.raises(MiniMaxUnavailable, match="HTTP 500"):
+            await client.chat("Write a reminder.", "b")
+        assert client.breaker.state == "open"
+        await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_identical_prompts_in_flight_share_one_request():
+    attempts = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.05)
+        return _reply()
+
+    client = _client(handler)
+    results = asyncio.run(_outcomes(client, ["same"] * 20 + ["other"]))
+
+    assert results == ["Keep going!"] * 21
+    assert attempts == 2
@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+
+from app.config import settings
+from app.schemas import ReminderRequest
+from app.services import minimax_service
+from app.services.minimax_client import MiniMaxClient
+
+
+def test_large_healthy_batch_is_generated_without_fallbacks(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return httpx.Response(200, json={"choices": [{"message": {"content": "You got this!"}}]})
+
+    # 500 calls through 4 slots take far longer than the 50ms queue timeout, so every call
+    # beyond the first few would fall back if the batch started them all at once.
+    client = MiniMaxClient(
+        base_url="http://minimax.test",
+        api_key="test-key",
+        model="test-model",
+        timeout_seconds=1.0,
+        connect_timeout_seconds=1.0,
+        max_connections=4,
+        failure_threshold=3,
+        reset_seconds=30.0,
+        queue_timeout_seconds=0.05,
+        transport=httpx.MockTransport(handler),
+    )
+    monkeypatch.setattr(settings, "minimax_api_key", "test-key")
+    monkeypatch.setattr(settings, "minimax_max_concurrency", 4)
+    monkeypatch.setattr(minimax_service, "get_minimax_client", lambda: client)
+    minimax_service.reminder_cache.clear()
+    payloads = [
+        ReminderRequest(user_id=f"user_{i}", activity_title=f"Activity {i}", due_label="today")
+        for i in range(500)
+    ]
+
+    async def run() -> dict:
+        try:
+            return await minimax_service.generate_reminder_batch(payloads)
+        finally:
+            await client.aclose()
+
+    try:
+        generated = asyncio.run(run())
+    finally:
+        minimax_service.reminder_cache.clear()
+
+    assert generated["summary"]["generated"] == 500
+    assert generated["summary"]["fallbacks"] == 0
+    assert {result.model_used for result in generated["results"]} == {settings.minimax_model}
+    assert peak <= 4
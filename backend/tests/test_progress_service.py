@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app.services import progress_service
+from app.services.progress_service import (
+    get_progress_counts,
+    progress_writes,
+    record_status_change,
+    record_submission_created,
+)
+
+
+async def _create(db, submission_id: str, user_id: str = "user_1") -> None:
+    async with progress_writes(db, [user_id]) as progress:
+        await db.submissions.insert_one(
+            {"id": submission_id, "user_id": user_id, "status": "pending"}
+        )
+        record_submission_created(progress, user_id)
+
+
+def _counts(total: int, pending: int = 0, approved: int = 0, rejected: int = 0) -> dict:
+    return {"total": total, "pending": pending, "approved": approved, "rejected": rejected}
+
+
+def test_recount_between_insert_and_increment_is_not_stored(db):
+    async def run() -> dict:
+        await _create(db, "s1")
+        async with progress_writes(db, ["user_1"]) as progress:
+            await db.submissions.insert_one({"id": "s2", "user_id": "user_1", "status": "pending"})
+            # The stale document is recounted here, already seeing s2.
+            assert await get_progress_counts(db, "user_1") == _counts(2, pending=2)
+            record_submission_created(progress, "user_1")
+        return await get_progress_counts(db, "user_1")
+
+    assert asyncio.run(run()) == _counts(2, pending=2)
+
+
+def test_recount_started_before_the_write_is_not_stored(db, monkeypatch):
+    aggregate = progress_service.aggregate_progress_counts
+    writer = progress_writes(db, ["user_1"])
+    entered = {}
+
+    async def aggregate_during_write(db, user_id: str) -> dict:
+        # The reader has already read the stale document; the write begins and lands
+        # before it counts, and its increment only arrives after the recount is stored.
+        entered["progress"] = await writer.__aenter__()
+        await db.submissions.insert_one({"id": "s2", "user_id": "user_1", "status": "pending"})
+        return await aggregate(db, user_id)
+
+    async def run() -> dict:
+        await _create(db, "s1")
+        monkeypatch.setattr(progress_service, "aggregate_progress_counts", aggregate_during_write)
+        assert await get_progress_counts(db, "user_1") == _counts(2, pending=2)
+        monkeypatch.setattr(progress_service, "aggregate_progress_counts", aggregate)
+
+        record_submission_created(entered["progress"], "user_1")
+        await writer.__aexit__(None, None, None)
+        return await get_progress_counts(db, "user_1")
+
+    assert asyncio.run(run()) == _counts(2, pending=2)
+
+
+def test_status_changes_keep_stored_counts_exact(db):
+    async def run() -> dict:
+        await _create(db, "s1")
+        await _create(db, "s2")
+        await get_progress_counts(db, "user_1")
+        async with progress_writes(db, ["user_1"]) as progress:
+            await db.submissions.update_one({"id": "s1"}, {"$set": {"status": "approved"}})
+            record_status_change(progress, "user_1", "pending", "approved")
+        return await db.user_progress.find_one({"user_id": "user_1"}, {"_id": 0})
+
+    stored = asyncio.run(run())
+    assert not stored["stale"]
+    assert stored["in_flight"] == 0
+    assert {key: stored[key] for key in _counts(0)} == _counts(2, pending=1, approved=1)
+
+
+def test_failed_write_leaves_counters_stale_for_a_recount(db):
+    async def run() -> dict:
+        await _create(db, "s1")
+        await get_progress_counts(db, "user_1")
+        with pytest.raises(RuntimeError):
+            async with progress_writes(db, ["user_1"]):
+                await db.submissions.insert_one(
+                    {"id": "s2", "user_id": "user_1", "status": "pending"}
+                )
+                raise RuntimeError("connection lost before the increment")
+        assert (await db.user_progress.find_one({"user_id": "user_1"}))["stale"]
+        return await get_progress_counts(db, "user_1")
+
+    assert asyncio.run(run()) == _counts(2, pending=2)
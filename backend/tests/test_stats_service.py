@@ -0,0 +1,66 @@
+import asyncio
+
+from app.services import stats_service
+from app.services.stats_service import get_dashboard_stats, stats_cache, stats_writes
+
+
+async def _create(db, submission_id: str) -> None:
+    async with stats_writes(db) as stats:
+        await db.submissions.insert_one({"id": submission_id, "status": "pending"})
+        stats["submissions_pending"] = 1
+
+
+async def _fresh_stats(db) -> dict:
+    stats_cache.clear()
+    return await get_dashboard_stats(db)
+
+
+def test_recount_between_insert_and_increment_is_not_stored(db):
+    async def run() -> dict:
+        await _create(db, "s1")
+        async with stats_writes(db) as stats:
+            await db.submissions.insert_one({"id": "s2", "status": "pending"})
+            # The stale document is recounted here, already seeing s2.
+            assert (await _fresh_stats(db))["submissions_pending"] == 2
+            stats["submissions_pending"] = 1
+        return await _fresh_stats(db)
+
+    assert asyncio.run(run())["submissions_pending"] == 2
+
+
+def test_recount_started_before_the_write_is_not_stored(db, monkeypatch):
+    count = stats_service.count_dashboard_stats
+    writer = stats_writes(db)
+    entered = {}
+
+    async def count_during_write(db) -> dict:
+        # The reader has already read the stale document; the write begins and lands
+        # before it counts, and its increment only arrives after the recount is stored.
+        entered["stats"] = await writer.__aenter__()
+        await db.submissions.insert_one({"id": "s2", "status": "pending"})
+        return await count(db)
+
+    async def run() -> dict:
+        await _create(db, "s1")
+        monkeypatch.setattr(stats_service, "count_dashboard_stats", count_during_write)
+        assert (await _fresh_stats(db))["submissions_pending"] == 2
+        monkeypatch.setattr(stats_service, "count_dashboard_stats", count)
+
+        entered["stats"]["submissions_pending"] = 1
+        await writer.__aexit__(None, None, None)
+        return await _fresh_stats(db)
+
+    assert asyncio.run(run())["submissions_pending"] == 2
+
+
+def test_stored_stats_stay_exact_after_a_recount(db):
+    async def run() -> dict:
+        await _create(db, "s1")
+        await _fresh_stats(db)
+        await _create(db, "s2")
+        return await db.admin_stats.find_one({"_id": stats_service.STATS_ID})
+
+    stored = asyncio.run(run())
+    assert not stored["stale"]
+    assert stored["in_flight"] == 0
+    assert stored["submissions_pending"] == 2
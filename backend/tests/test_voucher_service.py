@@ -0,0 +1,95 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.voucher_service import VoucherClient, VoucherProviderError, idempotency_key
+from benchmarks import voucher_stub
+
+
+def _client(transport: httpx.AsyncBaseTransport, max_retries: int = 2) -> VoucherClient:
+    return VoucherClient(
+        base_url="http://vouchers.test",
+        api_key="test-key",
+        timeout_seconds=0.05,
+        max_retries=max_retries,
+        max_connections=4,
+        retry_backoff_seconds=0,
+        transport=transport,
+    )
+
+
+def _issue(client: VoucherClient, submission_id: str = "submission_1") -> dict:
+    async def run() -> dict:
+        try:
+            return await client.issue_voucher("user_1", submission_id)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_issues_voucher_from_stub_and_replays_idempotency_key():
+    transport = httpx.ASGITransport(app=voucher_stub.app)
+    first = _issue(_client(transport))
+    second = _issue(_client(transport))
+
+    assert first["voucher_code"] == second["voucher_code"]
+    assert first["user_id"] == "user_1"
+    assert first["submission_id"] == "submission_1"
+    assert first["status"] == "assigned"
+
+
+def test_retries_server_errors_with_the_same_key():
+    seen_keys = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_keys.append(request.headers["Idempotency-Key"])
+        if len(seen_keys) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"id": "v1", "code": "CODE-1"})
+
+    reward = _issue(_client(httpx.MockTransport(handler)))
+
+    assert reward["voucher_code"] == "CODE-1"
+    assert seen_keys == [idempotency_key("submission_1")] * 3
+
+
+def test_gives_up_after_repeated_timeouts():
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    with pytest.raises(VoucherProviderError, match="after 3 attempts"):
+        _issue(_client(httpx.MockTransport(handler)))
+    assert attempts == 3
+
+
+def test_client_errors_are_not_retried():
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        return httpx.Response(400, json={"detail": "bad"})
+
+    with pytest.raises(VoucherProviderError, match="HTTP 400"):
+        _issue(_client(httpx.MockTransport(handler)))
+    assert attempts == 1
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(200, text="<html>gateway</html>"),
+        httpx.Response(200, json=["CODE-1"]),
+        httpx.Response(200, json={"id": "v1"}),
+        httpx.Response(200, json={"id": "v1", "code": None}),
+    ],
+)
+def test_malformed_body_raises_provider_error(response: httpx.Response):
+    with pytest.raises(VoucherProviderError):
+        _issue(_client(httpx.MockTransport(lambda request: response)))
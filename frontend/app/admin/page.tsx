@@ -7,7 +7,9 @@ import { Card } from "@/components/ui/Card";
 import { Button } from "@/components/ui/Button";
 import { Input } from "@/components/ui/Input";
 import { clearAuthState, getApiBaseUrl, getAuthState } from "@/lib/auth";
+import { fetchAllPages } from "@/lib/pagination";
 import { useRequireAuth } from "@/hooks/useRequireAuth";
+import { fetchAuthedImage, useAuthedImage } from "@/hooks/useAuthedImage";
 import {
   LayoutDashboard,
   ListChecks,
@@ -39,6 +41,9 @@ interface Submission {
   user_id: string;
   proof_text: string;
   proof_image_url?: string | null;
+  proof_image_thumbnail_url?: string | null;
+  possible_duplicate?: boolean;
+  duplicate_of?: string[];
   status: "pending" | "approved" | "rejected";
   created_at: string;
 }
@@ -73,6 +78,33 @@ interface UserRow {
 
 const API_BASE = getApiBaseUrl();
 
+// Uploaded proof images are stored as API paths ("/api/uploads/..."); resolve them
+// against the API origin. Absolute URLs pass through unchanged.
+function assetUrl(path: string): string {
+  return new URL(path, API_BASE).toString();
+}
+
+function ProofThumbnail({ path }: { path: string }) {
+  const src = useAuthedImage(assetUrl(path));
+  if (!src) {
+    return <span>View image proof</span>;
+  }
+  return <img src={src} alt="Image proof" className="max-h-40 rounded-lg" />;
+}
+
+// Opens the tab first, as popup blockers only allow it during the click itself.
+async function openProofImage(path: string) {
+  const tab = window.open("", "_blank");
+  try {
+    const objectUrl = await fetchAuthedImage(assetUrl(path));
+    if (tab) {
+      tab.location.href = objectUrl;
+    }
+  } catch {
+    tab?.close();
+  }
+}
+
 async function apiRequest<T>(path: string, init?: RequestInit): Promise<T> {
   const auth = getAuthState();
   const token = auth?.access_token;
@@ -129,16 +161,19 @@ export default function AdminPage() {
       const [dashboardData, submissionsData, activitiesData, rewardsData, usersData] =
         await Promise.all([
           apiRequest<AdminDashboard>("/admin/dashboard"),
-          apiRequest<{ items: Submission[] }>("/admin/submissions"),
-          apiRequest<{ items: Activity[] }>("/admin/activities"),
-          apiRequest<{ items: Reward[] }>("/admin/rewards"),
-          apiRequest<{ items: UserRow[] }>("/admin/users"),
+          fetchAllPages<Submission>(
+            apiRequest,
+            "/admin/submissions?fields=id,activity_id,user_id,status,proof_text,proof_image_url,proof_image_thumbnail_url,possible_duplicate,duplicate_of,created_at",
+          ),
+          fetchAllPages<Activity>(apiRequest, "/admin/activities"),
+          fetchAllPages<Reward>(apiRequest, "/admin/rewards"),
+          fetchAllPages<UserRow>(apiRequest, "/admin/users"),
         ]);
       setDashboard(dashboardData);
-      setSubmissions(submissionsData.items);
-      setActivities(activitiesData.items);
-      setRewards(rewardsData.items);
-      setUsers(usersData.items);
+      setSubmissions(submissionsData);
+      setActivities(activitiesData);
+      setRewards(rewardsData);
+      setUsers(usersData);
     } catch (requestError) {
       const message =
         requestError instanceof Error ? requestError.message : "Unknown error";
@@ -414,18 +449,27 @@ export default function AdminPage() {
                       <p className="text-xs text-text-muted mt-1">
                         User: {submission.user_id} | Activity: {submission.activity_id}
                       </p>
+                      {submission.possible_duplicate && (
+                        <p className="text-xs text-red-700 mt-1">
+                          Possible duplicate of{" "}
+                          {(submission.duplicate_of || []).map((id) => id.slice(0, 8)).join(", ")}
+                        </p>
+                      )}
                       <p className="text-sm text-text-secondary mt-2">
                         {submission.proof_text || "No text proof provided."}
                       </p>
                       {submission.proof_image_url && (
-                        <a
-                          href={submission.proof_image_url}
-                          target="_blank"
-                          rel="noreferrer"
+                        <button
+                          type="button"
+                          onClick={() => void openProofImage(submission.proof_image_url!)}
                           className="inline-block mt-2 text-sm text-primary underline"
                         >
-                          View image proof
-                        </a>
+                          {submission.proof_image_thumbnail_url ? (
+                            <ProofThumbnail path={submission.proof_image_thumbnail_url} />
+                          ) : (
+                            "View image proof"
+                          )}
+                        </button>
                       )}
                       {submission.status === "pending" && (
                         <div className="flex gap-2 mt-3">
@@ -66,7 +66,8 @@ export default function HomePage() {
     }
     const load = async () => {
       try {
-        const response = await fetch(`${getApiBaseUrl()}/submissions`, {
+        // The progress counters hold the pending total; /submissions is paginated.
+        const response = await fetch(`${getApiBaseUrl()}/progress/me`, {
           headers: {
             "Content-Type": "application/json",
             ...getAuthHeader(),
@@ -75,11 +76,8 @@ export default function HomePage() {
         if (!response.ok) {
           return;
         }
-        const data = (await response.json()) as {
-          items: Array<{ status: "pending" | "approved" | "rejected" }>;
-        };
-        const pending = data.items.filter((item) => item.status === "pending").length;
-        setPendingTasksCount(pending);
+        const data = (await response.json()) as { pending_submissions: number };
+        setPendingTasksCount(data.pending_submissions);
       } catch {
         // Keep mock fallback values when API is unavailable.
       }
@@ -12,6 +12,7 @@ import type { Task } from "@/lib/types";
 import { CheckCircle2, Clock } from "lucide-react";
 import { Card } from "@/components/ui/Card";
 import { getApiBaseUrl, getAuthHeader } from "@/lib/auth";
+import { fetchAllPages, type Page } from "@/lib/pagination";
 import { useRequireAuth } from "@/hooks/useRequireAuth";
 
 interface ActivityRow {
@@ -26,6 +27,13 @@ interface SubmissionRow {
   activity_id: string;
   status: "pending" | "approved" | "rejected";
   proof_image_url?: string | null;
+  proof_image_thumbnail_url?: string | null;
+}
+
+// Prefer the thumbnail; uploaded images are API paths resolved against the API origin.
+function proofImageUrl(submission: SubmissionRow | undefined, apiBase: string) {
+  const path = submission?.proof_image_thumbnail_url || submission?.proof_image_url;
+  return path ? new URL(path, apiBase).toString() : undefined;
 }
 
 export default function ProofPage() {
@@ -45,40 +53,31 @@ export default function ProofPage() {
       setLoading(true);
       setError("");
       try {
-        const [activitiesResponse, submissionsResponse] = await Promise.all([
-          fetch(`${apiBase}/activities`, {
+        const fetchPage = async <T,>(path: string): Promise<Page<T>> => {
+          const response = await fetch(`${apiBase}${path}`, {
             headers: {
               "Content-Type": "application/json",
               ...getAuthHeader(),
             },
-          }),
-          fetch(`${apiBase}/submissions`, {
-            headers: {
-              "Content-Type": "application/json",
-              ...getAuthHeader(),
-            },
-          }),
-        ]);
-
-        if (!activitiesResponse.ok || !submissionsResponse.ok) {
-          throw new Error("Unable to load activities");
-        }
-
-        const activitiesData = (await activitiesResponse.json()) as {
-          items: ActivityRow[];
-        };
-        const submissionsData = (await submissionsResponse.json()) as {
-          items: SubmissionRow[];
+          });
+          if (!response.ok) {
+            throw new Error("Unable to load activities");
+          }
+          return (await response.json()) as Page<T>;
         };
+        const [activities, submissions] = await Promise.all([
+          fetchAllPages<ActivityRow>(fetchPage, "/activities"),
+          fetchAllPages<SubmissionRow>(fetchPage, "/submissions"),
+        ]);
 
         const latestByActivity = new Map<string, SubmissionRow>();
-        for (const submission of submissionsData.items) {
+        for (const submission of submissions) {
           if (!latestByActivity.has(submission.activity_id)) {
             latestByActivity.set(submission.activity_id, submission);
           }
         }
 
-        const mapped: Task[] = activitiesData.items.map((activity) => {
+        const mapped: Task[] = activities.map((activity) => {
           const submission = latestByActivity.get(activity.id);
           return {
             id: activity.id,
@@ -89,7 +88,7 @@ export default function ProofPage() {
             meritPoints: 10,
             dueDate: new Date().toISOString().slice(0, 10),
             requiresProof: true,
-            proofUrl: submission?.proof_image_url || undefined,
+            proofUrl: proofImageUrl(submission, apiBase),
           };
         });
         setTasks(mapped);
@@ -111,7 +110,7 @@ export default function ProofPage() {
     void loadTasks();
   }, [checking, loadTasks]);
 
-  const handleComplete = async (taskId: string, proofUrl: string) => {
+  const handleComplete = async (taskId: string, proofImageId: string) => {
     try {
       const response = await fetch(`${apiBase}/submissions`, {
         method: "POST",
@@ -122,7 +121,7 @@ export default function ProofPage() {
         body: JSON.stringify({
           activity_id: taskId,
           proof_text: "Submitted from proof screen",
-          proof_image_url: proofUrl || null,
+          proof_image_id: proofImageId,
         }),
       });
       if (!response.ok) {
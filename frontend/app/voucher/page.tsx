@@ -13,6 +13,18 @@ import type { Voucher } from "@/lib/types";
 import { Gift, History } from "lucide-react";
 import { useRequireAuth } from "@/hooks/useRequireAuth";
 import { getApiBaseUrl, getAuthHeader } from "@/lib/auth";
+import { fetchAllPages, type Page } from "@/lib/pagination";
+
+interface RewardRow {
+  reward_id: string;
+  voucher_code: string;
+  status: string;
+  assigned_at: string;
+  expires_at?: string;
+  value?: number;
+  currency?: string;
+  retailer?: string;
+}
 
 export default function VoucherPage() {
   const [currentPoints] = useState(MOCK_MERIT_PROGRESS.currentPoints);
@@ -46,51 +58,43 @@ export default function VoucherPage() {
         };
         setPoints(data.approved_submissions * 10 + data.pending_submissions * 2);
 
-        const rewardsResponse = await fetch(`${getApiBaseUrl()}/rewards/me`, {
-          headers: {
-            "Content-Type": "application/json",
-            ...getAuthHeader(),
-          },
-        });
-        if (rewardsResponse.ok) {
-          const rewardsData = (await rewardsResponse.json()) as {
-            items: Array<{
-              reward_id: string;
-              voucher_code: string;
-              status: string;
-              assigned_at: string;
-              expires_at?: string;
-              value?: number;
-              currency?: string;
-              retailer?: string;
-            }>;
-          };
-
-          const mapped = rewardsData.items.map<Voucher>((reward) => {
-            const status =
-              reward.status === "assigned"
-                ? "available"
-                : reward.status === "redeemed"
-                ? "redeemed"
-                : "expired";
-            return {
-              id: reward.reward_id,
-              code: reward.voucher_code,
-              value: reward.value ?? 10,
-              currency: reward.currency ?? "GBP",
-              expiresAt:
-                reward.expires_at ||
-                new Date(Date.now() + 1000 * 60 * 60 * 24 * 30).toISOString(),
-              status,
-              retailer: reward.retailer ?? "Tesco",
-            };
+        const rewards = await fetchAllPages<RewardRow>(async (path) => {
+          const rewardsResponse = await fetch(`${getApiBaseUrl()}${path}`, {
+            headers: {
+              "Content-Type": "application/json",
+              ...getAuthHeader(),
+            },
           });
+          if (!rewardsResponse.ok) {
+            throw new Error("Unable to load rewards");
+          }
+          return (await rewardsResponse.json()) as Page<RewardRow>;
+        }, "/rewards/me");
 
-          const available = mapped.find((voucher) => voucher.status === "available") || null;
-          const past = mapped.filter((voucher) => voucher.status !== "available");
-          setActiveVoucher(available);
-          setPastVouchers(past);
-        }
+        const mapped = rewards.map<Voucher>((reward) => {
+          const status =
+            reward.status === "assigned"
+              ? "available"
+              : reward.status === "redeemed"
+              ? "redeemed"
+              : "expired";
+          return {
+            id: reward.reward_id,
+            code: reward.voucher_code,
+            value: reward.value ?? 10,
+            currency: reward.currency ?? "GBP",
+            expiresAt:
+              reward.expires_at ||
+              new Date(Date.now() + 1000 * 60 * 60 * 24 * 30).toISOString(),
+            status,
+            retailer: reward.retailer ?? "Tesco",
+          };
+        });
+
+        const available = mapped.find((voucher) => voucher.status === "available") || null;
+        const past = mapped.filter((voucher) => voucher.status !== "available");
+        setActiveVoucher(available);
+        setPastVouchers(past);
       } catch {
         // Keep mock points fallback.
       }
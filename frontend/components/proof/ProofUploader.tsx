@@ -5,10 +5,12 @@
 // Click task → camera/file upload → success state
 // ============================================================
 
-import { useState, useRef, useCallback } from "react";
+import { useState, useRef, useCallback, useEffect } from "react";
 import { Card } from "@/components/ui/Card";
 import { Button } from "@/components/ui/Button";
 import type { Task } from "@/lib/types";
+import { getApiBaseUrl, getAuthHeader } from "@/lib/auth";
+import { useAuthedImage } from "@/hooks/useAuthedImage";
 import { CATEGORY_CONFIG } from "@/lib/constants";
 import {
   Camera,
@@ -25,44 +27,75 @@ type ProofStage = "idle" | "capturing" | "uploading" | "success";
 
 interface ProofUploaderProps {
   task: Task;
-  onComplete?: (taskId: string, proofUrl: string) => void;
+  onComplete?: (taskId: string, proofImageId: string) => void;
 }
 
 export function ProofUploader({ task, onComplete }: ProofUploaderProps) {
   const [stage, setStage] = useState<ProofStage>(
     task.status === "completed" ? "success" : "idle"
   );
-  const [previewUrl, setPreviewUrl] = useState<string | null>(
-    task.proofUrl || null
-  );
+  const [previewUrl, setPreviewUrl] = useState<string | null>(null);
+  const storedProofUrl = useAuthedImage(task.proofUrl);
   const [uploadProgress, setUploadProgress] = useState(0);
+  const [uploadError, setUploadError] = useState("");
   const fileInputRef = useRef<HTMLInputElement>(null);
   const cameraInputRef = useRef<HTMLInputElement>(null);
 
   const category = CATEGORY_CONFIG[task.category];
 
-  const simulateUpload = useCallback(
+  // The stored proof loads with the session token; show it once it arrives.
+  useEffect(() => {
+    if (storedProofUrl) {
+      setPreviewUrl(storedProofUrl);
+    }
+  }, [storedProofUrl]);
+
+  const uploadFile = useCallback(
     (file: File) => {
       // Create preview
       const url = URL.createObjectURL(file);
       setPreviewUrl(url);
       setStage("uploading");
       setUploadProgress(0);
+      setUploadError("");
 
-      // Simulate upload progress
-      let progress = 0;
-      const interval = setInterval(() => {
-        progress += Math.random() * 30 + 10;
-        if (progress >= 100) {
-          progress = 100;
-          clearInterval(interval);
-          setTimeout(() => {
-            setStage("success");
-            onComplete?.(task.id, url);
-          }, 300);
+      // XHR rather than fetch: it reports upload progress.
+      const form = new FormData();
+      form.append("file", file);
+      const request = new XMLHttpRequest();
+      request.open("POST", `${getApiBaseUrl()}/uploads`);
+      Object.entries(getAuthHeader()).forEach(([name, value]) =>
+        request.setRequestHeader(name, value)
+      );
+      request.upload.onprogress = (event) => {
+        if (event.lengthComputable) {
+          setUploadProgress((event.loaded / event.total) * 100);
+        }
+      };
+      request.onload = () => {
+        if (request.status === 200) {
+          const upload = JSON.parse(request.responseText) as { sha256: string };
+          setUploadProgress(100);
+          setStage("success");
+          onComplete?.(task.id, upload.sha256);
+          return;
+        }
+        let message = "Upload failed";
+        try {
+          message = JSON.parse(request.responseText).detail || message;
+        } catch {
+          // keep the generic message
         }
-        setUploadProgress(Math.min(progress, 100));
-      }, 200);
+        setUploadError(message);
+        setPreviewUrl(null);
+        setStage("idle");
+      };
+      request.onerror = () => {
+        setUploadError("Upload failed");
+        setPreviewUrl(null);
+        setStage("idle");
+      };
+      request.send(form);
     },
     [task.id, onComplete]
   );
@@ -71,10 +104,10 @@ export function ProofUploader({ task, onComplete }: ProofUploaderProps) {
     (e: React.ChangeEvent<HTMLInputElement>) => {
       const file = e.target.files?.[0];
       if (file) {
-        simulateUpload(file);
+        uploadFile(file);
       }
     },
-    [simulateUpload]
+    [uploadFile]
   );
 
   const handleCameraCapture = () => {
@@ -157,6 +190,11 @@ export function ProofUploader({ task, onComplete }: ProofUploaderProps) {
                   Upload
                 </Button>
               </div>
+              {uploadError && (
+                <p className="text-sm text-red-700 mt-2" role="alert">
+                  {uploadError}
+                </p>
+              )}
               {/* Hidden file inputs */}
               <input
                 ref={cameraInputRef}
@@ -170,7 +208,7 @@ export function ProofUploader({ task, onComplete }: ProofUploaderProps) {
               <input
                 ref={fileInputRef}
                 type="file"
-                accept="image/*,.pdf"
+                accept="image/jpeg,image/png,image/gif,image/webp"
                 className="hidden"
                 onChange={handleFileSelect}
                 aria-hidden="true"
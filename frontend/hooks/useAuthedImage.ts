@@ -0,0 +1,52 @@
+"use client";
+
+import { useEffect, useState } from "react";
+
+import { getApiBaseUrl, getAuthHeader } from "@/lib/auth";
+
+// Uploaded images need the session token, which a plain <img src> cannot send, so they
+// are fetched with it and shown through an object URL. Image links on other origins are
+// returned as they are: the token is never sent there.
+export async function fetchAuthedImage(url: string): Promise<string> {
+  if (new URL(url).origin !== new URL(getApiBaseUrl()).origin) {
+    return url;
+  }
+  const response = await fetch(url, { headers: getAuthHeader() });
+  if (!response.ok) {
+    throw new Error(`Image request failed: ${response.status}`);
+  }
+  return URL.createObjectURL(await response.blob());
+}
+
+export function useAuthedImage(url?: string | null): string | null {
+  const [objectUrl, setObjectUrl] = useState<string | null>(null);
+
+  useEffect(() => {
+    if (!url) {
+      setObjectUrl(null);
+      return;
+    }
+    let cancelled = false;
+    let created: string | null = null;
+    fetchAuthedImage(url)
+      .then((result) => {
+        created = result.startsWith("blob:") ? result : null;
+        if (cancelled) {
+          if (created) {
+            URL.revokeObjectURL(created);
+          }
+        } else {
+          setObjectUrl(result);
+        }
+      })
+      .catch(() => setObjectUrl(null));
+    return () => {
+      cancelled = true;
+      if (created) {
+        URL.revokeObjectURL(created);
+      }
+    };
+  }, [url]);
+
+  return objectUrl;
+}
@@ -0,0 +1,29 @@
+// List endpoints return one page at a time as {items, next_cursor}; see API_CONTRACT.md.
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+// The API's maximum page size, so full lists take as few round trips as possible.
+export const PAGE_LIMIT = 200;
+
+export function pageUrl(path: string, cursor: string | null): string {
+  const separator = path.includes("?") ? "&" : "?";
+  const query = `limit=${PAGE_LIMIT}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ""}`;
+  return `${path}${separator}${query}`;
+}
+
+// Follows next_cursor until the last page and returns every item in order.
+export async function fetchAllPages<T>(
+  fetchPage: (path: string) => Promise<Page<T>>,
+  path: string
+): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await fetchPage(pageUrl(path, cursor));
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+}